@@ -4,14 +4,18 @@ import argparse
 import json
 import os
 import statistics
-from typing import Dict, List
+from typing import Dict
 
+from src.core.annealing import SimulatedAnnealing
+from src.core.decomposition import Decomposition
 from src.core.ga import GeneticAlgorithm
-from src.core.heuristics import nearest_neighbor_order
+from src.core.heuristics import seed_orders
+from src.core.islands import IslandModel
 from src.core.vrp import Node
 from src.io.config import ConfigLoader
+from src.io.distance_cache import DEFAULT_CACHE_DIR, load_distance_matrix
 from src.io.load_data import load_nodes, validate_nodes
-from src.io.output_saver import save_convergence, save_json, save_log_records, save_md
+from src.io.output_saver import JsonlWriter, save_convergence, save_json, save_md
 from src.viz.charts import plot_convergence
 from src.viz.map import render_map
 from src.llm.render import LLMClient, executive_report, generate_all_instructions
@@ -56,6 +60,12 @@ def run():
     parser = argparse.ArgumentParser(description="GA VRP optimizer")
     parser.add_argument("--config", required=True, help="Path to YAML config")
     parser.add_argument("--data", required=True, help="Path to CSV dataset")
+    parser.add_argument(
+        "--solver", choices=["ga", "sa"], default="ga", help="ga (genetic algorithm) or sa (simulated annealing)"
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="Continue the GA from ga.checkpoint_path, if it exists"
+    )
     args = parser.parse_args()
 
     cfg = ConfigLoader.load(args.config)
@@ -66,35 +76,98 @@ def run():
 
     # Garantir que o dicionário de nós contenha o depósito para uso em heurísticas e mapas
     nodes_with_depot = {cfg.depot.node_id: cfg.depot, **nodes}
-
-    base_orders = [
-        nearest_neighbor_order(
-            [n for n in nodes_with_depot if n != cfg.depot.node_id], nodes_with_depot, cfg.depot
+    decompose = cfg.decomposition.enabled
+    if decompose and args.solver != "ga":
+        raise SystemExit("decomposition.enabled requer --solver ga")
+    if decompose and args.resume:
+        raise SystemExit("--resume não é suportado com decomposition.enabled")
+    # Matriz de distâncias calculada uma única vez (ou lida do cache em disco) e compartilhada
+    # por AG, heurísticas, mapa e LLM. Na decomposição cada cluster monta a sua: a matriz
+    # completa (n x n) é justamente o que não cabe em instâncias muito grandes
+    distances = None
+    base_orders = []
+    annealer = None
+    if not decompose:
+        distances = load_distance_matrix(
+            nodes_with_depot, cfg.cache.get("distance_dir", DEFAULT_CACHE_DIR)
         )
-    ]
-    ga = GeneticAlgorithm(nodes_with_depot, cfg.depot, cfg.ga, cfg.vrp, cfg.weights)
-    best_indiv, best_fit, convergence, decoded = ga.run(base_orders)
-
-    # Recompute best routes for final individual
-    from src.core.fitness import evaluate_individual
-
-    fitness_val, routes = evaluate_individual(
-        best_indiv, nodes_with_depot, cfg.depot, cfg.vrp, cfg.weights
+        # Sementes da população inicial: mistura configurável de heurísticas construtivas
+        base_orders = seed_orders(
+            cfg.ga.seeding, nodes_with_depot, cfg.depot, cfg.vrp, distances,
+            cfg.ga.seed, cfg.ga.seed_regret_k, cfg.ga.seed_noise,
+        )
+        annealer = SimulatedAnnealing(nodes_with_depot, cfg.depot, cfg.sa, cfg.vrp, cfg.weights, distances)
+    # Telemetria gravada à medida que cada geração termina (escrita com buffer). Ao retomar
+    # de um checkpoint o log anterior é mantido e as novas gerações são acrescentadas
+    resuming = bool(args.resume and cfg.ga.checkpoint_path and os.path.exists(cfg.ga.checkpoint_path))
+    run_log = (
+        JsonlWriter(cfg.logging["jsonl_path"], int(cfg.logging.get("flush_every", 10)), append=resuming)
+        if cfg.logging.get("jsonl_path")
+        else None
     )
+    streamed = False
+    try:
+        if args.solver == "sa":
+            # Solver rápido: recozimento simulado a partir da heurística do vizinho mais próximo
+            result = annealer.run(base_orders)
+        elif decompose:
+            # Cluster-first, route-second: um AG por cluster em paralelo e reparo nas fronteiras
+            solver = Decomposition(
+                nodes_with_depot, cfg.depot, cfg.ga, cfg.vrp, cfg.weights, cfg.decomposition
+            )
+            result = solver.run()
+            print(f"[*] Decomposicao: {solver.cluster_count} clusters, {solver.repair_moves} paradas realocadas")
+            print(f"[*] Criterio de parada: {result.stop_reason}")
+        else:
+            if cfg.islands.count > 1:
+                # Modelo de ilhas: subpopulações em processos separados com migração periódica
+                ga = IslandModel(nodes_with_depot, cfg.depot, cfg.ga, cfg.vrp, cfg.weights, cfg.islands, distances)
+            else:
+                ga = GeneticAlgorithm(nodes_with_depot, cfg.depot, cfg.ga, cfg.vrp, cfg.weights, distances)
+            if args.resume and not isinstance(ga, GeneticAlgorithm):
+                raise SystemExit("--resume requer o AG único (islands.count = 1)")
+            if args.resume and not resuming:
+                print("[*] Nenhum checkpoint encontrado; iniciando do zero")
+            if isinstance(ga, GeneticAlgorithm):
+                for snapshot in ga.iterate(base_orders, resume=args.resume):
+                    if run_log is not None:
+                        run_log.write(snapshot.record())
+                result = ga.result()
+                streamed = True
+            else:
+                result = ga.run(base_orders)
+            print(f"[*] Cache de fitness: {result.cache_hits} acertos, {result.cache_misses} avaliacoes")
+            print(f"[*] Criterio de parada: {result.stop_reason}")
+            if cfg.sa.post_optimize:
+                # Pós-otimização do melhor indivíduo do AG com recozimento simulado
+                refined = annealer.anneal(result.best_individual)
+                print(f"[*] Pos-otimizacao SA: {result.best_fitness:.2f} -> {refined.best_fitness:.2f}")
+                if refined.best_fitness < result.best_fitness:
+                    result.best_individual = refined.best_individual
+                    result.best_fitness = refined.best_fitness
+                    result.best_routes = refined.best_routes
+        if run_log is not None and not streamed:
+            # Ilhas e SA só expõem a curva de convergência ao final
+            for i, v in enumerate(result.convergence):
+                run_log.write({"generation": i + 1, "best_fitness": v})
+    finally:
+        # Fecha mesmo se a execução falhar, para não perder os registros ainda no buffer
+        if run_log is not None:
+            run_log.close()
+    convergence = result.convergence
+
+    # Rotas completas só são decodificadas para o melhor indivíduo final
+    fitness_val, routes = result.best_fitness, result.best_routes
 
     solution_json = build_solution_json(routes, convergence, cfg.depot, nodes_with_depot, fitness_val)
+    solution_json["stop_reason"] = result.stop_reason
 
     if cfg.output.get("solution_json"):
         save_json(solution_json, cfg.output["solution_json"])
     if cfg.output.get("convergence_png"):
         plot_convergence(convergence, cfg.output["convergence_png"])
     if cfg.output.get("map_html"):
-        render_map(cfg.depot, nodes_with_depot, routes, cfg.output["map_html"])
-    if cfg.logging.get("jsonl_path"):
-        logs = [
-            {"generation": i + 1, "best_fitness": v} for i, v in enumerate(convergence)
-        ]
-        save_log_records(logs, cfg.logging["jsonl_path"])
+        render_map(cfg.depot, nodes_with_depot, routes, cfg.output["map_html"], distances)
 
     # =========================================================================
     # GERAÇÃO DE CONTEÚDO VIA LLM
@@ -126,6 +199,7 @@ def run():
                 depot=cfg.depot,
                 departure_time=departure_time,
                 vehicle_speed_kmh=vehicle_speed,
+                distances=distances,
             )
             
             # Salvar instruções em arquivo separado
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from .delta import DecodedState, DeltaEvaluator
+from .distance import DistanceMatrix
+from .fitness import evaluate_individual
+from .ga import GAResult, Individual
+from .instance import ProblemInstance
+from .mutation import Span
+from .vrp import Node, SAParams, VRPParams, WeightParams
+
+MOVES = ("swap", "inversion", "relocate")
+COOLING = ("geometric", "linear")
+# Convergence trace points recorded over a run
+TRACE_POINTS = 200
+# Random moves sampled to calibrate the initial temperature
+CALIBRATION_MOVES = 200
+
+
+def _swap(perm: Individual, i: int, j: int) -> Individual:
+    child = perm[:]
+    child[i], child[j] = child[j], child[i]
+    return child
+
+
+def _inversion(perm: Individual, i: int, j: int) -> Individual:
+    return perm[:i] + perm[i : j + 1][::-1] + perm[j + 1 :]
+
+
+def _relocate_forward(perm: Individual, i: int, j: int) -> Individual:
+    # Stop at i moves to position j
+    return perm[:i] + perm[i + 1 : j + 1] + [perm[i]] + perm[j + 1 :]
+
+
+def _relocate_backward(perm: Individual, i: int, j: int) -> Individual:
+    # Stop at j moves to position i
+    return perm[:i] + [perm[j]] + perm[i:j] + perm[j + 1 :]
+
+
+class SimulatedAnnealing:
+    """Simulated annealing on the GA's permutation encoding and fitness weights.
+
+    Each iteration applies a swap, inversion or relocate move between two positions and
+    re-scores only the routes from the first affected one (``DeltaEvaluator``; the
+    optimal split falls back to full scoring). Temperature follows a geometric or linear
+    schedule from ``initial_temperature`` (calibrated from random moves when unset) down
+    to ``initial_temperature * final_temperature_ratio``, driven by whichever of the
+    iteration and time budgets runs out first.
+    """
+
+    def __init__(
+        self,
+        nodes_map: Dict[int, Node],
+        depot: Node,
+        sa_params: SAParams,
+        vrp_params: VRPParams,
+        weights: WeightParams,
+        distances: DistanceMatrix | None = None,
+    ) -> None:
+        self.nodes_map = nodes_map
+        self.depot = depot
+        self.sa = sa_params
+        self.vrp = vrp_params
+        self.weights = weights
+        self.distances = distances if distances is not None else DistanceMatrix.from_nodes(nodes_map)
+        self.instance = ProblemInstance(nodes_map, depot, vrp_params, self.distances)
+        self.moves = [m.lower() for m in self.sa.moves]
+        if self.sa.cooling not in COOLING:
+            raise ValueError(f"Unsupported cooling schedule {self.sa.cooling}")
+        unknown = [m for m in self.moves if m not in MOVES]
+        if unknown or not self.moves:
+            raise ValueError(f"Unsupported annealing moves {unknown or self.moves}")
+        self.delta = DeltaEvaluator(self.instance, weights) if self.vrp.split != "optimal" else None
+        self.rng = random.Random(self.sa.seed)
+
+    def run(self, base_orders: List[Sequence[int]]) -> GAResult:
+        """Standalone solve, starting from the best of ``base_orders`` (or a shuffle)."""
+        if base_orders:
+            start = min(base_orders, key=lambda order: self.instance.fitness(order, self.weights))
+        else:
+            start = list(self.instance.customer_ids)
+            self.rng.shuffle(start)
+        return self.anneal(start)
+
+    def _score(self, perm: Individual) -> Tuple[float, DecodedState | None]:
+        if self.delta is not None:
+            state = self.delta.full(perm)
+            return state.fitness, state
+        return self.instance.fitness(perm, self.weights), None
+
+    def _rescore(self, state: DecodedState | None, child: Individual, span: Span) -> Tuple[float, DecodedState | None]:
+        if self.delta is not None and state is not None:
+            new_state = self.delta.apply(state, child, *span)
+            return new_state.fitness, new_state
+        return self.instance.fitness(child, self.weights), None
+
+    def _neighbor(self, perm: Individual) -> Tuple[Individual, Span]:
+        i, j = sorted(self.rng.sample(range(len(perm)), 2))
+        name = self.rng.choice(self.moves)
+        move: Callable[[Individual, int, int], Individual]
+        if name == "swap":
+            move = _swap
+        elif name == "inversion":
+            move = _inversion
+        else:
+            move = _relocate_forward if self.rng.random() < 0.5 else _relocate_backward
+        return move(perm, i, j), (i, j)
+
+    def _initial_temperature(self, perm: Individual, fitness: float, state: DecodedState | None) -> float:
+        if self.sa.initial_temperature is not None:
+            return self.sa.initial_temperature
+        uphill = []
+        for _ in range(CALIBRATION_MOVES):
+            child, span = self._neighbor(perm)
+            value, _ = self._rescore(state, child, span)
+            if value > fitness:
+                uphill.append(value - fitness)
+        if not uphill:
+            return 1.0
+        # Accept an average uphill move with probability 0.5 at the start
+        return (sum(uphill) / len(uphill)) / math.log(2)
+
+    def anneal(self, start: Sequence[int]) -> GAResult:
+        """Anneal from ``start``; used standalone and to post-optimize a GA result."""
+        current = list(start)
+        fitness, state = self._score(current)
+        best, best_fitness = current, fitness
+        convergence = [best_fitness]
+        stop_reason = "max_iterations"
+        if len(current) >= 2:
+            t0 = self._initial_temperature(current, fitness, state)
+            t_end = t0 * self.sa.final_temperature_ratio
+            max_iter = max(self.sa.max_iterations, 1)
+            trace_every = max(max_iter // TRACE_POINTS, 1)
+            started = time.perf_counter()
+            time_limit = self.sa.time_limit_s
+            progress = 0.0
+            for iteration in range(max_iter):
+                if time_limit and iteration % 64 == 0:
+                    elapsed = time.perf_counter() - started
+                    if elapsed >= time_limit:
+                        stop_reason = "time_limit"
+                        break
+                    progress = max(iteration / max_iter, elapsed / time_limit)
+                else:
+                    progress = max(progress, iteration / max_iter)
+                if self.sa.cooling == "geometric":
+                    temperature = t0 * (t_end / t0) ** progress if t0 > 0 else 0.0
+                else:
+                    temperature = t0 + (t_end - t0) * progress
+
+                child, span = self._neighbor(current)
+                value, child_state = self._rescore(state, child, span)
+                diff = value - fitness
+                if diff <= 0 or (temperature > 0 and self.rng.random() < math.exp(-diff / temperature)):
+                    current, fitness, state = child, value, child_state
+                    if fitness < best_fitness:
+                        best, best_fitness = current, fitness
+                if (iteration + 1) % trace_every == 0:
+                    convergence.append(best_fitness)
+
+        # Full re-evaluation of the final best: callers such as sa.post_optimize compare it
+        # against other solutions, so it must not rely on incrementally tracked scores
+        best_fitness, routes = evaluate_individual(
+            best, self.nodes_map, self.depot, self.vrp, self.weights, self.distances, self.instance
+        )
+        return GAResult(
+            best_individual=best,
+            best_fitness=best_fitness,
+            convergence=convergence,
+            decoded_history=[],
+            best_routes=routes,
+            stop_reason=stop_reason,
+        )
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .instance import ProblemInstance
+from .vrp import WeightParams
+
+
+class BatchEvaluator:
+    """Scores a whole population at once with NumPy.
+
+    Reproduces ``evaluate_individual`` (greedy ``split_routes`` + ``compute_route_metrics``)
+    for every row of a ``(population, customers)`` array of node ids, returning only the
+    scalar fitness of each row.
+    """
+
+    def __init__(self, instance: ProblemInstance, weights: WeightParams) -> None:
+        self.instance = instance
+        self.vrp = instance.vrp
+        self.weights = weights
+        self.depot_idx = instance.depot_idx
+        self.km = instance.km
+        self.demand = instance.demand
+        self.priority_coef = instance.priority_coef
+        self.service = instance.service
+        self.window_start = instance.window_start
+        self.window_end = instance.window_end
+        self.depot_minutes = instance.depot_minutes
+
+    def evaluate(self, population: np.ndarray) -> np.ndarray:
+        """Fitness for each row of a 2D int array of customer node ids."""
+        genes = self.instance.to_index(population)
+        pop_size, n = genes.shape
+        vehicles = self.vrp.vehicles
+        if n == 0:
+            return np.zeros(pop_size)
+
+        route_of, pos_in_route = self._split(genes)
+        served = route_of >= 0
+        rows = np.arange(pop_size)[:, None]
+        flat_route = np.where(served, rows * vehicles + route_of, pop_size * vehicles)
+        n_slots = pop_size * vehicles + 1  # last slot collects dropped customers
+
+        # Distance: leg into every stop plus the return leg after the last stop of a route
+        prev = np.empty_like(genes)
+        prev[:, 0] = self.depot_idx
+        prev[:, 1:] = genes[:, :-1]
+        prev = np.where(pos_in_route == 0, self.depot_idx, prev)
+        legs = self.km[prev, genes].astype(np.float64)
+        is_last = np.ones_like(served)
+        is_last[:, :-1] = route_of[:, 1:] != route_of[:, :-1]
+        is_last &= served
+        legs = legs + np.where(is_last, self.km[genes, self.depot_idx], 0.0)
+        route_km = np.bincount(
+            flat_route.ravel(), weights=np.where(served, legs, 0.0).ravel(), minlength=n_slots
+        )
+        route_load = np.bincount(
+            flat_route.ravel(), weights=np.where(served, self.demand[genes], 0.0).ravel(), minlength=n_slots
+        )
+        route_km = route_km[:-1].reshape(pop_size, vehicles)
+        route_load = route_load[:-1].reshape(pop_size, vehicles)
+
+        capacity = np.maximum(route_load - self.vrp.vehicle_capacity, 0.0).sum(axis=1)
+        range_pen = np.maximum(route_km - self.vrp.vehicle_range_km, 0.0).sum(axis=1)
+        priority = np.where(served, self.priority_coef[genes] * pos_in_route, 0.0).sum(axis=1)
+        time_pen = self._time_penalty(genes, served, pos_in_route, is_last)
+
+        w = self.weights
+        return (
+            w.w_distance * route_km.sum(axis=1)
+            + w.w_capacity * capacity
+            + w.w_range * range_pen
+            + w.w_priority * priority
+            + w.w_time * time_pen
+        )
+
+    def _split(self, genes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Greedy capacity split, one position at a time across all rows."""
+        pop_size, n = genes.shape
+        demand = self.demand[genes]
+        capacity = self.vrp.vehicle_capacity
+        vehicle = np.zeros(pop_size, dtype=np.int64)
+        load = np.zeros(pop_size)
+        count = np.zeros(pop_size, dtype=np.int64)
+        route_of = np.empty((pop_size, n), dtype=np.int64)
+        pos_in_route = np.empty((pop_size, n), dtype=np.int64)
+        for j in range(n):
+            d = demand[:, j]
+            cut = (load + d > capacity) & (count > 0)
+            vehicle += cut
+            load[cut] = 0.0
+            count[cut] = 0
+            active = vehicle < self.vrp.vehicles
+            route_of[:, j] = np.where(active, vehicle, -1)
+            pos_in_route[:, j] = count
+            load += np.where(active, d, 0.0)
+            count += active
+        return route_of, pos_in_route
+
+    def _time_penalty(
+        self,
+        genes: np.ndarray,
+        served: np.ndarray,
+        pos_in_route: np.ndarray,
+        is_last: np.ndarray,
+    ) -> np.ndarray:
+        pop_size, n = genes.shape
+        if self.instance.work_window is None:
+            return np.zeros(pop_size)
+        work_start, work_end = self.instance.work_window
+
+        travel = self.depot_minutes[genes]
+        w_start = self.window_start[genes]
+        w_end = self.window_end[genes]
+        service = self.service[genes]
+        penalty = np.zeros(pop_size)
+
+        if not self.instance.has_window_starts:
+            # No waiting possible: clock at each stop is a segmented cumulative sum per route
+            step = np.where(served, travel + service, 0.0)
+            incl = np.cumsum(step, axis=1)
+            excl = incl - step
+            starts = np.where(pos_in_route == 0, np.arange(n), 0)
+            starts = np.maximum.accumulate(starts, axis=1)
+            base = np.take_along_axis(excl, starts, axis=1)
+            arrive = work_start + excl - base + travel
+            finish = work_start + incl - base
+        else:
+            arrive = np.empty((pop_size, n))
+            finish = np.empty((pop_size, n))
+            clock = np.full(pop_size, work_start)
+            for j in range(n):
+                clock = np.where(pos_in_route[:, j] == 0, work_start, clock)
+                t = clock + travel[:, j]
+                t = np.where(t < w_start[:, j], w_start[:, j], t)
+                arrive[:, j] = t
+                clock = t + service[:, j]
+                finish[:, j] = clock
+
+        late = np.where(served & (arrive > w_end), arrive - w_end, 0.0)
+        penalty += late.sum(axis=1)
+        overtime = np.where(is_last & (finish > work_end), finish - work_end, 0.0)
+        penalty += overtime.sum(axis=1)
+        # Empty vehicles still "finish" at work_start, as in compute_route_metrics
+        empty_routes = self.vrp.vehicles - is_last.sum(axis=1)
+        penalty += empty_routes * max(work_start - work_end, 0.0)
+        return penalty
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 2
+
+
+@dataclass
+class Checkpoint:
+    """State of a ``GeneticAlgorithm`` run after ``generation`` completed generations.
+
+    Fitness cache entries and local optima are listed in LRU order (oldest first). Route
+    pool entries keep their insertion order: ``route_pool_stops`` concatenates the routes,
+    ``route_pool_lengths`` splits it back and ``route_pool_costs`` holds each route's cost.
+    """
+
+    generation: int
+    backend: str
+    population: np.ndarray
+    cache_keys: np.ndarray
+    cache_values: np.ndarray
+    local_optima: np.ndarray
+    convergence: List[float]
+    best_individual: List[int] | None
+    best_fitness: float
+    stagnant: int
+    cache_hits: int
+    cache_misses: int
+    evaluations: int
+    elapsed: float
+    random_state: Tuple[Any, ...]
+    np_rng_state: Dict[str, Any]
+    evolutions: int
+    route_pool_stops: np.ndarray
+    route_pool_lengths: np.ndarray
+    route_pool_costs: np.ndarray
+
+
+def write_checkpoint(path: str | Path, checkpoint: Checkpoint) -> None:
+    """Write ``checkpoint`` as an uncompressed ``.npz``; readers only ever see a complete file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    version, internal, gauss_next = checkpoint.random_state
+    meta = {
+        "format": FORMAT_VERSION,
+        "generation": checkpoint.generation,
+        "backend": checkpoint.backend,
+        "best_fitness": checkpoint.best_fitness,
+        "stagnant": checkpoint.stagnant,
+        "cache_hits": checkpoint.cache_hits,
+        "cache_misses": checkpoint.cache_misses,
+        "evaluations": checkpoint.evaluations,
+        "elapsed": checkpoint.elapsed,
+        "random_version": version,
+        "random_gauss_next": gauss_next,
+        "np_rng_state": checkpoint.np_rng_state,
+        "evolutions": checkpoint.evolutions,
+    }
+    best = checkpoint.best_individual if checkpoint.best_individual is not None else []
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.savez(
+            f,
+            meta=np.array(json.dumps(meta)),
+            population=checkpoint.population,
+            cache_keys=checkpoint.cache_keys,
+            cache_values=checkpoint.cache_values,
+            local_optima=checkpoint.local_optima,
+            convergence=np.asarray(checkpoint.convergence, dtype=np.float64),
+            best_individual=np.asarray(best, dtype=np.int64),
+            random_internal=np.asarray(internal, dtype=np.uint64),
+            route_pool_stops=checkpoint.route_pool_stops,
+            route_pool_lengths=checkpoint.route_pool_lengths,
+            route_pool_costs=checkpoint.route_pool_costs,
+        )
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_checkpoint(path: str | Path) -> Checkpoint:
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        if meta.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported checkpoint format {meta.get('format')} in {path}")
+        best = [int(v) for v in data["best_individual"]]
+        return Checkpoint(
+            generation=meta["generation"],
+            backend=meta["backend"],
+            population=data["population"],
+            cache_keys=data["cache_keys"],
+            cache_values=data["cache_values"],
+            local_optima=data["local_optima"],
+            convergence=data["convergence"].tolist(),
+            best_individual=best if best else None,
+            best_fitness=meta["best_fitness"],
+            stagnant=meta["stagnant"],
+            cache_hits=meta["cache_hits"],
+            cache_misses=meta["cache_misses"],
+            evaluations=meta["evaluations"],
+            elapsed=meta["elapsed"],
+            random_state=(
+                meta["random_version"],
+                tuple(int(v) for v in data["random_internal"]),
+                meta["random_gauss_next"],
+            ),
+            np_rng_state=meta["np_rng_state"],
+            evolutions=meta["evolutions"],
+            route_pool_stops=data["route_pool_stops"],
+            route_pool_lengths=data["route_pool_lengths"],
+            route_pool_costs=data["route_pool_costs"],
+        )
+
+
+class CheckpointWriter:
+    """Writes checkpoints on a background thread so the generation loop never waits on disk.
+
+    While a write is running, newer checkpoints replace each other and only the latest
+    is kept; ``close`` writes it and re-raises any error from the background thread.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._running: Future | None = None
+        self._waiting: Checkpoint | None = None
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        if self._running is not None:
+            if not self._running.done():
+                self._waiting = checkpoint
+                return
+            self._running.result()
+        self._waiting = None
+        self._running = self._pool.submit(write_checkpoint, self.path, checkpoint)
+
+    def close(self) -> None:
+        try:
+            if self._running is not None:
+                self._running.result()
+            if self._waiting is not None:
+                write_checkpoint(self.path, self._waiting)
+        finally:
+            self._running = self._waiting = None
+            self._pool.shutdown(wait=True)
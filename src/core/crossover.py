@@ -3,55 +3,130 @@ from __future__ import annotations
 import random
 from typing import List, Sequence, Tuple
 
+import numpy as np
+
 Individual = List[int]
 
 
 def pmx(parent1: Sequence[int], parent2: Sequence[int]) -> Tuple[Individual, Individual]:
-    size = len(parent1)
-    p1, p2 = [None] * size, [None] * size
-    idx1, idx2 = sorted(random.sample(range(size), 2))
-
-    p1[idx1:idx2] = parent1[idx1:idx2]
-    p2[idx1:idx2] = parent2[idx1:idx2]
-
-    def fill_child(child, parent_a, parent_b):
-        for i in range(idx1, idx2):
-            if parent_b[i] not in child:
-                pos = i
-                val = parent_a[i]
-                while True:
-                    try:
-                        pos = parent_b.index(val)
-                    except ValueError:
-                        break
-                    if child[pos] is None:
-                        break
-                    val = parent_a[pos]
-                child[pos] = parent_b[i]
-        for i in range(size):
-            if child[i] is None:
-                child[i] = parent_b[i]
-        return child
-
-    c1 = fill_child(p1, parent1, parent2)
-    c2 = fill_child(p2, parent2, parent1)
-    return c1, c2
+    idx1, idx2 = sorted(random.sample(range(len(parent1)), 2))
+    return pmx_with_cuts(parent1, parent2, idx1, idx2)
+
+
+def pmx_with_cuts(
+    parent1: Sequence[int], parent2: Sequence[int], idx1: int, idx2: int
+) -> Tuple[Individual, Individual]:
+    """PMX exchanging the segment ``idx1:idx2`` (cut points drawn by the caller).
+
+    Position lookups make each child O(n): every segment position is visited by at most
+    one mapping chain.
+    """
+    return _pmx_child(parent1, parent2, idx1, idx2), _pmx_child(parent2, parent1, idx1, idx2)
+
+
+def _pmx_child(parent_a: Sequence[int], parent_b: Sequence[int], idx1: int, idx2: int) -> Individual:
+    child = list(parent_b)
+    child[idx1:idx2] = parent_a[idx1:idx2]
+    in_segment = set(parent_a[idx1:idx2])
+    pos_b = {gene: i for i, gene in enumerate(parent_b)}
+    for i in range(idx1, idx2):
+        gene = parent_b[i]
+        if gene in in_segment:
+            continue
+        # Follow a -> b mapping until it leaves the segment
+        pos = pos_b[parent_a[i]]
+        while idx1 <= pos < idx2:
+            pos = pos_b[parent_a[pos]]
+        child[pos] = gene
+    return child
 
 
 def ox(parent1: Sequence[int], parent2: Sequence[int]) -> Tuple[Individual, Individual]:
-    size = len(parent1)
-    idx1, idx2 = sorted(random.sample(range(size), 2))
-
-    def make_child(p_a, p_b):
-        child = [None] * size
-        child[idx1:idx2] = p_a[idx1:idx2]
-        pos = idx2
-        for gene in p_b[idx2:] + p_b[:idx2]:
-            if gene not in child:
-                if pos >= size:
-                    pos = 0
-                child[pos] = gene
-                pos += 1
-        return child
-
-    return make_child(parent1, parent2), make_child(parent2, parent1)
+    idx1, idx2 = sorted(random.sample(range(len(parent1)), 2))
+    return ox_with_cuts(parent1, parent2, idx1, idx2)
+
+
+def ox_with_cuts(
+    parent1: Sequence[int], parent2: Sequence[int], idx1: int, idx2: int
+) -> Tuple[Individual, Individual]:
+    """OX keeping the segment ``idx1:idx2`` (cut points drawn by the caller), O(n) per child."""
+    return _ox_child(parent1, parent2, idx1, idx2), _ox_child(parent2, parent1, idx1, idx2)
+
+
+def _ox_child(parent_a: Sequence[int], parent_b: Sequence[int], idx1: int, idx2: int) -> Individual:
+    size = len(parent_a)
+    segment = list(parent_a[idx1:idx2])
+    in_segment = set(segment)
+    rest = [gene for gene in list(parent_b[idx2:]) + list(parent_b[:idx2]) if gene not in in_segment]
+    # Remaining genes fill positions idx2.. and wrap around to 0..idx1
+    tail = size - idx2
+    return rest[tail:] + segment + rest[:tail]
+
+
+def _dense(parents1: np.ndarray, parents2: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Map gene values to 0..n-1 (all rows are permutations of the same genes)."""
+    genes = np.sort(parents1[0])
+    return genes, np.searchsorted(genes, parents1), np.searchsorted(genes, parents2)
+
+
+def _segment_masks(lo: np.ndarray, hi: np.ndarray, n: int) -> np.ndarray:
+    cols = np.arange(n)
+    return (cols >= lo[:, None]) & (cols < hi[:, None])
+
+
+def _pmx_batch_child(a: np.ndarray, b: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    rows_n, n = a.shape
+    rows = np.arange(rows_n)[:, None]
+    segment = _segment_masks(lo, hi, n)
+    pos_b = np.empty_like(b)
+    pos_b[rows, b] = np.arange(n)
+    in_segment_a = np.zeros((rows_n, n), dtype=bool)
+    in_segment_a[np.nonzero(segment)[0], a[segment]] = True
+
+    child = np.where(segment, a, b)
+    # One mapping chain per segment gene of b that a's segment does not already hold
+    r, i = np.nonzero(segment & ~in_segment_a[rows, b])
+    genes = b[r, i]
+    pos = pos_b[r, a[r, i]]
+    pending = np.flatnonzero((pos >= lo[r]) & (pos < hi[r]))
+    while pending.size:
+        rp = r[pending]
+        pos[pending] = pos_b[rp, a[rp, pos[pending]]]
+        pending = pending[(pos[pending] >= lo[rp]) & (pos[pending] < hi[rp])]
+    child[r, pos] = genes
+    return child
+
+
+def pmx_batch(
+    parents1: np.ndarray, parents2: np.ndarray, lo: np.ndarray, hi: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """``pmx_with_cuts`` for many pairs at once: row ``k`` of each 2D array is one pair."""
+    genes, a, b = _dense(parents1, parents2)
+    return genes[_pmx_batch_child(a, b, lo, hi)], genes[_pmx_batch_child(b, a, lo, hi)]
+
+
+def _ox_batch_child(a: np.ndarray, b: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    rows_n, n = a.shape
+    rows = np.arange(rows_n)[:, None]
+    cols = np.arange(n)
+    segment = _segment_masks(lo, hi, n)
+    in_segment_a = np.zeros((rows_n, n), dtype=bool)
+    in_segment_a[np.nonzero(segment)[0], a[segment]] = True
+
+    # b read from hi onwards (wrapping), with a's segment genes moved to the end
+    rotated = b[rows, (hi[:, None] + cols) % n]
+    order = np.argsort(in_segment_a[rows, rotated], axis=1, kind="stable")
+    rest = rotated[rows, order]
+    child = a.copy()
+    fill = cols < (n - (hi - lo))[:, None]
+    target = (hi[:, None] + cols) % n
+    child[np.nonzero(fill)[0], target[fill]] = rest[fill]
+    return child
+
+
+def ox_batch(
+    parents1: np.ndarray, parents2: np.ndarray, lo: np.ndarray, hi: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """``ox_with_cuts`` for many pairs at once: row ``k`` of each 2D array is one pair."""
+    genes, a, b = _dense(parents1, parents2)
+    return genes[_ox_batch_child(a, b, lo, hi)], genes[_ox_batch_child(b, a, lo, hi)]
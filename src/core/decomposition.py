@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .distance import DistanceMatrix
+from .ga import GAResult, GeneticAlgorithm
+from .heuristics import _angles, seed_orders
+from .spatial import KDTree, SpatialIndex, unit_vectors
+from .vrp import DecompositionParams, GAParams, Node, RouteMetrics, VRPParams, WeightParams, compute_route_metrics
+
+METHODS = ("kmeans", "sweep")
+
+# (cluster index, customer ids, nodes incl. depot, depot, GA params, VRP params, weights, deadline)
+ClusterTask = Tuple[int, List[int], Dict[int, Node], Node, GAParams, VRPParams, WeightParams, float | None]
+
+
+def sweep_clusters(
+    node_ids: Sequence[int], nodes: Dict[int, Node], depot: Node, demand_limit: float
+) -> List[List[int]]:
+    """Angular sectors around the depot, each closed before its demand would exceed ``demand_limit``."""
+    ids = list(node_ids)
+    order = [ids[pos] for pos in np.argsort(_angles(ids, nodes, depot), kind="stable").tolist()]
+    return _capacity_cuts(order, nodes, demand_limit)
+
+
+def _capacity_cuts(order: Sequence[int], nodes: Dict[int, Node], capacity: float) -> List[List[int]]:
+    """Consecutive runs of ``order``, each closed before its demand would exceed ``capacity``."""
+    routes: List[List[int]] = []
+    load = 0.0
+    for nid in order:
+        if not routes or (load + nodes[nid].demand > capacity and routes[-1]):
+            routes.append([])
+            load = 0.0
+        routes[-1].append(nid)
+        load += nodes[nid].demand
+    return routes
+
+
+def _bisection(points: np.ndarray, demand: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """``k`` parts of similar demand from recursive weighted-median cuts on the widest axis:
+    (centroid per part, part of each point)."""
+    centroids = np.zeros((k, 3))
+    labels = np.zeros(len(points), dtype=np.int64)
+    pending = [(np.arange(len(points)), 0, k)]
+    while pending:
+        idx, first, parts = pending.pop()
+        if parts == 1 or len(idx) <= 1:
+            centroids[first : first + parts] = points[idx].mean(axis=0)
+            labels[idx] = first
+            continue
+        spread = points[idx].max(axis=0) - points[idx].min(axis=0)
+        idx = idx[np.argsort(points[idx, int(np.argmax(spread))], kind="stable")]
+        left = parts // 2
+        weight = np.cumsum(demand[idx] + 1e-9)
+        cut = int(np.searchsorted(weight, weight[-1] * left / parts))
+        cut = min(max(cut, 1), len(idx) - 1)
+        pending.extend([(idx[:cut], first, left), (idx[cut:], first + left, parts - left)])
+    return centroids, labels
+
+
+def _candidate_distances(points: np.ndarray, centroids: np.ndarray, labels: np.ndarray, m: int):
+    """Distances from each point to its own centroid and that centroid's ``m - 1`` nearest."""
+    near = KDTree(centroids).knn(m - 1)[1] if len(centroids) > 1 else np.zeros((1, 0), dtype=np.int64)
+    candidates = np.hstack([labels[:, None], near[labels]])
+    diff = points[:, None, :] - centroids[candidates]
+    return candidates, np.einsum("ncd,ncd->nc", diff, diff)
+
+
+def kmeans_clusters(
+    node_ids: Sequence[int],
+    nodes: Dict[int, Node],
+    demand_limit: float,
+    fill: float = 1.0,
+    iterations: int = 10,
+    candidates: int = 8,
+) -> List[List[int]]:
+    """Capacity-aware k-means on the unit sphere.
+
+    ``k`` is the total demand over ``demand_limit * fill``. Clusters start from recursive
+    demand-weighted bisection and each Lloyd step only compares a stop with its current
+    centroid's ``candidates - 1`` nearest centroids (a KD-tree over the centroids), so a
+    step is O(n * candidates). The final assignment visits stops by regret (second-best
+    minus best distance) and gives each one the nearest candidate cluster whose demand
+    stays within ``demand_limit``, or its nearest cluster when none has room.
+    """
+    ids = list(node_ids)
+    if not ids:
+        return []
+    demand = np.array([nodes[nid].demand for nid in ids], dtype=np.float64)
+    k = min(max(1, math.ceil(demand.sum() / max(demand_limit * fill, 1e-9))), len(ids))
+    points = unit_vectors([nodes[nid].lat for nid in ids], [nodes[nid].lon for nid in ids])
+    centroids, labels = _bisection(points, demand, k)
+    m = min(max(candidates, 1), k)
+    for _ in range(iterations):
+        cand, dist = _candidate_distances(points, centroids, labels, m)
+        new_labels = cand[np.arange(len(ids)), np.argmin(dist, axis=1)]
+        counts = np.bincount(new_labels, minlength=k)
+        for axis in range(3):
+            sums = np.bincount(new_labels, weights=points[:, axis], minlength=k)
+            centroids[counts > 0, axis] = sums[counts > 0] / counts[counts > 0]
+        if (new_labels == labels).all():
+            break
+        labels = new_labels
+
+    cand, dist = _candidate_distances(points, centroids, labels, m)
+    ranked = np.argsort(dist, axis=1, kind="stable")
+    cand = np.take_along_axis(cand, ranked, axis=1).tolist()
+    dist = np.take_along_axis(dist, ranked, axis=1)
+    regret = dist[:, 1] - dist[:, 0] if m > 1 else np.zeros(len(ids))
+    load = [0.0] * k
+    clusters: List[List[int]] = [[] for _ in range(k)]
+    for i in np.argsort(-regret, kind="stable").tolist():
+        options = cand[i]
+        target = next((c for c in options if load[c] + demand[i] <= demand_limit), options[0])
+        load[target] += demand[i]
+        clusters[target].append(ids[i])
+    return [c for c in clusters if c]
+
+
+def solve_cluster(task: ClusterTask) -> GAResult:
+    """Solve one cluster as an independent VRP with its own matrix, seeds and GA."""
+    index, customers, nodes, depot, ga_params, vrp, weights, deadline = task
+    demand = sum(nodes[nid].demand for nid in customers)
+    # Fleet sized by the cluster's demand, plus one spare vehicle for the greedy split
+    vrp = replace(vrp, vehicles=max(1, math.ceil(demand / max(vrp.vehicle_capacity, 1e-9))) + 1)
+    limit = ga_params.time_limit_s
+    if deadline is not None:
+        limit = max(deadline - time.time(), 0.0)
+    seed = ga_params.seed + index if ga_params.seed is not None else None
+    params = replace(ga_params, seed=seed, executor="serial", checkpoint_path=None, time_limit_s=limit)
+    distances = DistanceMatrix.from_nodes(nodes)
+    base_orders = seed_orders(
+        params.seeding, nodes, depot, vrp, distances, seed, params.seed_regret_k, params.seed_noise
+    )
+    ga = GeneticAlgorithm(nodes, depot, params, vrp, weights, distances)
+    try:
+        result = ga.run(base_orders)
+    finally:
+        ga.close()
+    routed = {nid for r in result.best_routes for nid in r.sequence[1:-1]}
+    leftover = [nid for nid in result.best_individual if nid not in routed]
+    if leftover:
+        # Stops the fleet-limited split could not place get capacity-cut routes of their own
+        for route in _capacity_cuts(leftover, nodes, vrp.vehicle_capacity):
+            result.best_routes.append(compute_route_metrics(route, nodes, depot, vrp, weights, distances))
+    return result
+
+
+def route_cost(metrics: RouteMetrics, weights: WeightParams) -> float:
+    """Weighted fitness contribution of one decoded route."""
+    p = metrics.penalties
+    return (
+        weights.w_distance * metrics.distance_km
+        + weights.w_capacity * p["capacity"]
+        + weights.w_range * p["range"]
+        + weights.w_priority * p["priority"]
+        + weights.w_time * p["time"]
+    )
+
+
+def repair_boundaries(
+    routes: List[List[int]],
+    route_cluster: List[int],
+    nodes: Dict[int, Node],
+    depot: Node,
+    vrp: VRPParams,
+    weights: WeightParams,
+    spatial: SpatialIndex,
+    neighbors: int = 8,
+    rounds: int = 2,
+) -> int:
+    """Move stops next to a nearby stop of another cluster when that lowers the cost of
+    both routes; ``routes`` and ``route_cluster`` are updated in place.
+
+    Only stops with one of their ``neighbors`` nearest stops in a different cluster are
+    tried, before or after that stop. Returns the number of moves made.
+    """
+
+    def cost(route: List[int]) -> float:
+        return route_cost(compute_route_metrics(route, nodes, depot, vrp, weights), weights)
+
+    costs = [cost(r) for r in routes]
+    route_of = {nid: r for r, route in enumerate(routes) for nid in route}
+    near = spatial.neighbors(neighbors).tolist()
+    ids = spatial.node_ids
+    moves = 0
+    for _ in range(rounds):
+        moved = 0
+        for pos, stop in enumerate(ids):
+            src = route_of[stop]
+            others = [ids[j] for j in near[pos] if route_cluster[route_of[ids[j]]] != route_cluster[src]]
+            if not others:
+                continue
+            shrunk = [nid for nid in routes[src] if nid != stop]
+            shrunk_cost = cost(shrunk)
+            best_gain, best = 1e-9, None
+            for other in others:
+                tgt = route_of[other]
+                at = routes[tgt].index(other)
+                for insert in (at, at + 1):
+                    grown = routes[tgt][:insert] + [stop] + routes[tgt][insert:]
+                    gain = costs[src] + costs[tgt] - shrunk_cost - cost(grown)
+                    if gain > best_gain:
+                        best_gain, best = gain, (tgt, grown)
+            if best is None:
+                continue
+            tgt, grown = best
+            routes[src], routes[tgt] = shrunk, grown
+            costs[src], costs[tgt] = shrunk_cost, cost(grown)
+            route_of[stop] = tgt
+            moved += 1
+        moves += moved
+        if not moved:
+            break
+    return moves
+
+
+class Decomposition:
+    """Cluster-first, route-second solver for instances too large for one GA.
+
+    Customers are partitioned into clusters of at most ``vehicles_per_cluster`` vehicle
+    loads (``kmeans`` or ``sweep``), every cluster is solved by its own
+    ``GeneticAlgorithm`` in a process pool, and a boundary repair pass then moves stops
+    between routes of neighbouring clusters. No instance-wide distance matrix is built:
+    work grows with the number of clusters, i.e. near-linearly with the number of stops.
+
+    ``run`` returns a ``GAResult`` whose ``best_routes`` are the assembled routes (one
+    vehicle per route, the fleet sized by demand) and whose convergence trace is the sum
+    of the clusters' best fitness per generation.
+    """
+
+    def __init__(
+        self,
+        nodes_map: Dict[int, Node],
+        depot: Node,
+        ga_params: GAParams,
+        vrp_params: VRPParams,
+        weights: WeightParams,
+        params: DecompositionParams,
+    ) -> None:
+        if params.method not in METHODS:
+            raise ValueError(f"Unsupported decomposition method {params.method}")
+        self.nodes_map = nodes_map
+        self.depot = depot
+        self.ga = ga_params
+        self.vrp = vrp_params
+        self.weights = weights
+        self.params = params
+        self.customers = [nid for nid in nodes_map if nid != depot.node_id]
+        self.cluster_count = 0
+        self.repair_moves = 0
+
+    def clusters(self) -> List[List[int]]:
+        """Customer ids of each cluster; at most ``vehicles_per_cluster`` vehicle loads each,
+        sized for ``fill`` of that."""
+        limit = self.params.vehicles_per_cluster * self.vrp.vehicle_capacity
+        fill = min(max(self.params.fill, 1e-3), 1.0)
+        if self.params.method == "sweep":
+            return sweep_clusters(self.customers, self.nodes_map, self.depot, limit * fill)
+        return kmeans_clusters(
+            self.customers, self.nodes_map, limit, fill, self.params.iterations, self.params.candidates
+        )
+
+    def _tasks(self, clusters: List[List[int]], deadline: float | None) -> List[ClusterTask]:
+        depot_id = self.depot.node_id
+        return [
+            (
+                i, cluster, {depot_id: self.depot, **{nid: self.nodes_map[nid] for nid in cluster}},
+                self.depot, self.ga, self.vrp, self.weights, deadline,
+            )
+            for i, cluster in enumerate(clusters)
+        ]
+
+    def run(self) -> GAResult:
+        clusters = self.clusters()
+        self.cluster_count = len(clusters)
+        deadline = time.time() + self.ga.time_limit_s if self.ga.time_limit_s is not None else None
+        tasks = self._tasks(clusters, deadline)
+        if self.params.processes and len(tasks) > 1:
+            workers = min(self.params.workers or os.cpu_count() or 1, len(tasks))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(solve_cluster, tasks))
+        else:
+            results = [solve_cluster(task) for task in tasks]
+
+        routes: List[List[int]] = []
+        route_cluster: List[int] = []
+        for i, result in enumerate(results):
+            for metrics in result.best_routes:
+                if len(metrics.sequence) > 2:
+                    routes.append(metrics.sequence[1:-1])
+                    route_cluster.append(i)
+        if len(results) > 1 and self.params.repair_rounds > 0:
+            spatial = SpatialIndex.from_nodes(self.nodes_map, self.customers)
+            self.repair_moves = repair_boundaries(
+                routes, route_cluster, self.nodes_map, self.depot, self.vrp, self.weights, spatial,
+                self.params.repair_neighbors, self.params.repair_rounds,
+            )
+        routes = [r for r in routes if r]
+        best_routes = [compute_route_metrics(r, self.nodes_map, self.depot, self.vrp, self.weights) for r in routes]
+
+        longest = max((len(r.convergence) for r in results), default=0)
+        convergence = [
+            sum(r.convergence[min(g, len(r.convergence) - 1)] for r in results if r.convergence)
+            for g in range(longest)
+        ]
+        reasons = Counter(r.stop_reason for r in results)
+        return GAResult(
+            best_individual=[nid for r in routes for nid in r],
+            best_fitness=sum(route_cost(m, self.weights) for m in best_routes),
+            convergence=convergence,
+            decoded_history=[],
+            cache_hits=sum(r.cache_hits for r in results),
+            cache_misses=sum(r.cache_misses for r in results),
+            best_routes=best_routes,
+            stop_reason=reasons.most_common(1)[0][0] if reasons else "generations",
+        )
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from .instance import ProblemInstance
+from .vrp import WeightParams
+
+
+@dataclass
+class DecodedState:
+    """Greedy split of one permutation, kept so children can be re-scored incrementally.
+
+    Route ``k`` covers permutation positions ``starts[k]`` up to the next start (or
+    ``served`` for the last one); positions from ``served`` on were dropped because the
+    fleet ran out. Only non-empty routes are listed.
+    """
+
+    starts: List[int]
+    loads: List[float]
+    costs: List[float]
+    served: int
+    fitness: float
+
+
+class DeltaEvaluator:
+    """Full and incremental fitness for the greedy ``split_routes`` decoder.
+
+    ``apply`` re-splits a child from the first route touched by a mutation and stops as
+    soon as a cut point lines up again with the parent's (same position, same vehicle);
+    routes beyond that point keep the parent's cost.
+    """
+
+    def __init__(self, instance: ProblemInstance, weights: WeightParams) -> None:
+        self.instance = instance
+        self.vrp = instance.vrp
+        self.weights = weights
+        self._demand = instance.demand.tolist()
+        self.empty_cost = self.route_cost([])
+
+    def route_cost(self, route: Sequence[int]) -> float:
+        return self.instance.route_cost(route, self.weights)
+
+    def full(self, permutation: Sequence[int]) -> DecodedState:
+        return self._resplit(permutation, 0, [], [], [], None, -1)
+
+    def apply(self, parent: DecodedState, child: Sequence[int], lo: int, hi: int) -> DecodedState:
+        """Score ``child``, which equals the parent's permutation outside positions ``lo..hi``."""
+        if lo > parent.served or not parent.starts:
+            # Only dropped customers moved: same routes, same cost. A change at position
+            # ``served`` itself can let that customer fit in the last route, so it is re-split
+            return parent
+        # Start from the route holding lo - 1: its cut depends on the demand at position lo
+        k = bisect_right(parent.starts, max(lo - 1, 0)) - 1
+        return self._resplit(
+            child, parent.starts[k], parent.starts[:k], parent.loads[:k], parent.costs[:k], parent, hi
+        )
+
+    def _resplit(
+        self,
+        perm: Sequence[int],
+        pos: int,
+        starts: List[int],
+        loads: List[float],
+        costs: List[float],
+        parent: DecodedState | None,
+        hi: int,
+    ) -> DecodedState:
+        starts, loads, costs = list(starts), list(loads), list(costs)
+        parent_route_at = {s: i for i, s in enumerate(parent.starts)} if parent is not None else {}
+        n = len(perm)
+        capacity = self.vrp.vehicle_capacity
+        index = self.instance.index
+        demand_of = self._demand
+        served = pos
+        while pos < n and len(starts) < self.vrp.vehicles:
+            load = 0.0
+            end = pos
+            while end < n:
+                demand = demand_of[index[perm[end]]]
+                if end > pos and load + demand > capacity:
+                    break
+                load += demand
+                end += 1
+            starts.append(pos)
+            loads.append(load)
+            costs.append(self.route_cost(perm[pos:end]))
+            pos = served = end
+            if parent is not None and pos > hi and parent_route_at.get(pos) == len(starts):
+                # Cut points realigned with the parent: the remaining routes are unchanged
+                m = len(starts)
+                starts.extend(parent.starts[m:])
+                loads.extend(parent.loads[m:])
+                costs.extend(parent.costs[m:])
+                served = parent.served
+                break
+        fitness = sum(costs) + (self.vrp.vehicles - len(starts)) * self.empty_cost
+        return DecodedState(starts=starts, loads=loads, costs=costs, served=served, fitness=fitness)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import math
-from typing import Tuple
+from typing import Dict, Mapping, Sequence, Tuple
+
+import numpy as np
 
 EARTH_RADIUS_KM = 6371.0
 
@@ -30,3 +32,61 @@ def route_distance(coords: list[Tuple[float, float]]) -> float:
     for i in range(len(coords) - 1):
         total += haversine(coords[i], coords[i + 1])
     return total
+
+
+def haversine_pairwise(
+    lats_a: Sequence[float], lons_a: Sequence[float], lats_b: Sequence[float], lons_b: Sequence[float]
+) -> np.ndarray:
+    """Great-circle distances (km) from every point in ``a`` to every point in ``b``."""
+    lat1 = np.radians(np.asarray(lats_a, dtype=np.float64))[:, None]
+    lon1 = np.radians(np.asarray(lons_a, dtype=np.float64))[:, None]
+    lat2 = np.radians(np.asarray(lats_b, dtype=np.float64))[None, :]
+    lon2 = np.radians(np.asarray(lons_b, dtype=np.float64))[None, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    a = np.clip(a, 0.0, 1.0)
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def haversine_matrix(lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+    """Pairwise great-circle distances (km) between all points, as an (n, n) array."""
+    return haversine_pairwise(lats, lons, lats, lons)
+
+
+class DistanceMatrix:
+    """Dense haversine distances for one problem instance.
+
+    Rows/columns follow ``node_ids``; ``index`` maps a node id to its row so callers can
+    query either by node id (``between``) or directly by index (``km[i, j]``).
+    """
+
+    def __init__(self, node_ids: Sequence[int], km: np.ndarray) -> None:
+        self.node_ids = [int(nid) for nid in node_ids]
+        self.index: Dict[int, int] = {nid: i for i, nid in enumerate(self.node_ids)}
+        self.km = km
+
+    @classmethod
+    def from_nodes(cls, nodes: Mapping[int, object]) -> "DistanceMatrix":
+        node_ids = list(nodes)
+        lats = [nodes[nid].lat for nid in node_ids]
+        lons = [nodes[nid].lon for nid in node_ids]
+        return cls(node_ids, haversine_matrix(lats, lons))
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self.index
+
+    def indices(self, node_ids: Sequence[int]) -> np.ndarray:
+        return np.fromiter((self.index[nid] for nid in node_ids), dtype=np.int64, count=len(node_ids))
+
+    def between(self, a: int, b: int) -> float:
+        """Distance in km between two node ids."""
+        return float(self.km[self.index[a], self.index[b]])
+
+    def route_distance(self, sequence: Sequence[int]) -> float:
+        """Total distance of consecutive legs along a sequence of node ids."""
+        if len(sequence) < 2:
+            return 0.0
+        idx = self.indices(sequence)
+        return float(self.km[idx[:-1], idx[1:]].sum())
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+
+
+def edge_diversity(population: np.ndarray | Sequence[Sequence[int]]) -> float:
+    """Distinct undirected edges (consecutive stops) over the most the population could hold.
+
+    The most is ``min(population size * (n - 1), n * (n - 1) / 2)`` for ``n`` genes, so
+    1.0 means no two individuals share an edge (or every possible edge appears) and a
+    population of clones scores ``max(1 / population size, 2 / n)``.
+    """
+    rows = np.asarray(population, dtype=np.int64)
+    if rows.ndim != 2 or rows.shape[0] == 0 or rows.shape[1] < 2:
+        return 0.0
+    n_pop, n_genes = rows.shape
+    a, b = rows[:, :-1], rows[:, 1:]
+    lo, hi = np.minimum(a, b), np.maximum(a, b)
+    codes = lo * (int(rows.max()) + 1) + hi
+    distinct = len(np.unique(codes))
+    possible = min(n_pop * (n_genes - 1), n_genes * (n_genes - 1) // 2)
+    return distinct / possible
+
+
+def duplicate_positions(keys: Sequence[int], skip: int = 0) -> List[int]:
+    """Positions whose key already appeared earlier; the first ``skip`` are never reported."""
+    seen = set(keys[:skip])
+    duplicates: List[int] = []
+    for i in range(skip, len(keys)):
+        if keys[i] in seen:
+            duplicates.append(i)
+        else:
+            seen.add(keys[i])
+    return duplicates
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Dict, List, Sequence
 
+from .distance import DistanceMatrix
+from .instance import ProblemInstance
 from .vrp import RouteMetrics, VRPParams, WeightParams, split_routes, compute_route_metrics, Node
 
 
@@ -11,13 +13,25 @@ def evaluate_individual(
     depot: Node,
     vrp: VRPParams,
     weights: WeightParams,
+    distances: DistanceMatrix | None = None,
+    instance: ProblemInstance | None = None,
 ) -> tuple[float, List[RouteMetrics]]:
-    routes = split_routes(permutation, nodes_map, depot, vrp)
+    """Decode and score a permutation. With a compiled ``instance`` the split and route
+    metrics run on its arrays instead of ``Node`` lookups."""
+    if instance is None and vrp.split == "optimal":
+        instance = ProblemInstance(nodes_map, depot, vrp, distances)
+    if instance is not None:
+        routes = instance.split(permutation, weights)
+    else:
+        routes = split_routes(permutation, nodes_map, depot, vrp)
     route_metrics: List[RouteMetrics] = []
     total_distance = 0.0
     total_penalty = {"capacity": 0.0, "range": 0.0, "priority": 0.0, "time": 0.0}
     for route in routes:
-        metrics = compute_route_metrics(route, nodes_map, depot, vrp, weights)
+        if instance is not None:
+            metrics = instance.route_metrics(route)
+        else:
+            metrics = compute_route_metrics(route, nodes_map, depot, vrp, weights, distances)
         route_metrics.append(metrics)
         total_distance += metrics.distance_km
         for key, val in metrics.penalties.items():
@@ -31,3 +45,19 @@ def evaluate_individual(
         + weights.w_time * total_penalty["time"]
     )
     return fitness, route_metrics
+
+
+def evaluate_fitness(
+    permutation: Sequence[int],
+    nodes_map: Dict[int, Node],
+    depot: Node,
+    vrp: VRPParams,
+    weights: WeightParams,
+    distances: DistanceMatrix | None = None,
+    instance: ProblemInstance | None = None,
+) -> float:
+    """Scalar-only counterpart of ``evaluate_individual``: same fitness, but no
+    ``RouteMetrics`` or penalty dicts are built. Pass a compiled ``instance`` in loops."""
+    if instance is None:
+        instance = ProblemInstance(nodes_map, depot, vrp, distances)
+    return instance.fitness(permutation, weights)
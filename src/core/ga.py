@@ -1,15 +1,102 @@
 from __future__ import annotations
 
+import os
 import random
-from typing import Dict, List, Sequence, Tuple
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Sequence, Tuple
 
-from .crossover import ox, pmx
+import numpy as np
+
+from .batch_fitness import BatchEvaluator
+from .checkpoint import Checkpoint, CheckpointWriter, read_checkpoint
+from .crossover import ox, ox_batch, pmx, pmx_batch
+from .delta import DecodedState, DeltaEvaluator
+from .distance import DistanceMatrix
+from .diversity import duplicate_positions, edge_diversity
 from .fitness import evaluate_individual
-from .mutation import mutate
-from .selection import select_pair
-from .vrp import GAParams, Node, VRPParams, WeightParams
+from .instance import ProblemInstance
+from .local_search import LocalSearch
+from .mutation import Span, mutate_rows, mutate_with_span, random_spans
+from .parallel import EXECUTORS, ParallelEvaluator
+from .resequence import RouteResequencer
+from .route_pool import RoutePool
+from .spatial import SpatialIndex
+from .selection import ParentSampler, elite_indices, elite_positions, select_indices
+from .vrp import GAParams, Node, RouteMetrics, VRPParams, WeightParams
 
 Individual = List[int]
+# List of permutations, or an int32 (population, customers) matrix with the array backend
+Population = List[Individual] | np.ndarray
+# (parent permutation hash, mutated span or None if unchanged) for a child copied from a parent
+Origin = Tuple[int, Span | None]
+# Phases of evolve() timed in GeneticAlgorithm.stats
+PHASES = (
+    "evaluation", "elitism", "selection", "crossover", "mutation", "local_search", "diversity", "route_pool",
+)
+
+
+@dataclass
+class GAResult:
+    best_individual: Individual
+    best_fitness: float
+    convergence: List[float]
+    decoded_history: List[List]
+    cache_hits: int = 0
+    cache_misses: int = 0
+    best_routes: List[RouteMetrics] = field(default_factory=list)
+    # generations | stagnation | time_limit | max_evaluations | target_fitness | interrupted
+    # (SA: max_iterations)
+    stop_reason: str = "generations"
+
+
+@dataclass
+class GenerationSnapshot:
+    """Progress after one generation, as yielded by ``GeneticAlgorithm.iterate``.
+
+    ``best_individual`` is the run's best-so-far list itself, not a copy.
+    """
+
+    generation: int
+    best_fitness: float
+    generation_best: float
+    mean_fitness: float
+    best_individual: Individual
+    elapsed: float
+    # Set on the last snapshot of a run, None before
+    stop_reason: str | None = None
+    # Worst fitness, evaluation/cache counts, diversity and per-phase timings (s)
+    stats: Dict[str, float] = field(default_factory=dict)
+
+    def record(self) -> Dict[str, float | int | str | None]:
+        """Flat, JSON-serializable telemetry record (no individual)."""
+        return {
+            "generation": self.generation,
+            "best_fitness": self.best_fitness,
+            "generation_best": self.generation_best,
+            "mean_fitness": self.mean_fitness,
+            "elapsed": self.elapsed,
+            **self.stats,
+            "stop_reason": self.stop_reason,
+        }
+
+
+def stop_criterion(
+    params: GAParams, best_fitness: float, evaluations: int, elapsed: float, last_step: float
+) -> str | None:
+    """Which of the anytime limits in ``params`` is hit after a step, if any.
+
+    The time limit also stops when another step of the last one's length would overrun
+    it, so the returned best-so-far arrives within ``time_limit_s``.
+    """
+    if params.target_fitness is not None and best_fitness <= params.target_fitness:
+        return "target_fitness"
+    if params.max_evaluations is not None and evaluations >= params.max_evaluations:
+        return "max_evaluations"
+    if params.time_limit_s is not None and elapsed + last_step > params.time_limit_s:
+        return "time_limit"
+    return None
 
 
 class GeneticAlgorithm:
@@ -20,15 +107,104 @@ class GeneticAlgorithm:
         ga_params: GAParams,
         vrp_params: VRPParams,
         weights: WeightParams,
+        distances: DistanceMatrix | None = None,
     ) -> None:
         self.nodes_map = nodes_map
         self.depot = depot
         self.ga = ga_params
         self.vrp = vrp_params
         self.weights = weights
+        self.distances = distances if distances is not None else DistanceMatrix.from_nodes(nodes_map)
+        self.instance = ProblemInstance(nodes_map, depot, vrp_params, self.distances)
+        engine = self.ga.fitness_engine.lower()
+        if engine not in ("individual", "batch", "delta"):
+            raise ValueError(f"Unsupported fitness engine {self.ga.fitness_engine}")
+        if self.vrp.split == "optimal":
+            # Batch and delta engines replay the greedy split; the optimal split decodes one by one
+            engine = "individual"
+        elif self.vrp.split != "greedy":
+            raise ValueError(f"Unsupported split {self.vrp.split}")
+        self.batch: BatchEvaluator | None = None
+        self.delta: DeltaEvaluator | None = None
+        if engine == "batch":
+            self.batch = BatchEvaluator(self.instance, weights)
+        elif engine == "delta":
+            self.delta = DeltaEvaluator(self.instance, weights)
+        self.engine = engine
+        self.executor = self.ga.executor.lower()
+        if self.executor not in EXECUTORS:
+            raise ValueError(f"Unsupported executor {self.ga.executor}")
+        # Worker pool, started on first use; the delta engine keeps its parent states
+        # in this process and therefore always evaluates serially
+        self.parallel: ParallelEvaluator | None = None
+        self.backend = self.ga.population_backend.lower()
+        if self.backend not in ("list", "array"):
+            raise ValueError(f"Unsupported population backend {self.ga.population_backend}")
+        # Array backend: every random draw of a generation comes from this generator
+        self.np_rng = np.random.default_rng(self.ga.seed)
+        # Great-circle neighbours of the stops, built on first use
+        self._spatial: SpatialIndex | None = None
+        # Neighbour-guided mutation: candidate lists (list backend) or table (array backend)
+        self.mutation_lists: Dict[int, List[int]] | None = None
+        self.mutation_table: np.ndarray | None = None
+        if self.ga.mutation.lower() == "neighbor":
+            k = self.ga.mutation_neighbors
+            if self.backend == "array":
+                self.mutation_table = self.spatial().candidate_table(k)
+            else:
+                self.mutation_lists = self.spatial().candidate_lists(k)
+        self.local_search: LocalSearch | None = None
+        self.ls_mode = self.ga.local_search.lower()
+        if self.ls_mode not in ("none", "elites", "offspring"):
+            raise ValueError(f"Unsupported local search mode {self.ga.local_search}")
+        if self.ls_mode != "none":
+            k = self.ga.local_search_neighbors
+            self.local_search = LocalSearch(self.instance, weights, k, self.spatial().candidate_lists(k))
+        # Feasible routes of the best individuals, recombined every route_pool_every generations
+        self.route_pool = (
+            RoutePool(self.instance, weights, self.ga.route_pool_size) if self.ga.route_pool_every > 0 else None
+        )
+        self._evolutions = 0
+        # Exact re-ordering of short routes: the final best, and the elites if resequence_elites
+        self.resequencer = (
+            RouteResequencer(self.instance, weights, self.ga.resequence_max_stops)
+            if self.ga.resequence_max_stops > 0
+            else None
+        )
+        self._pool_stats: Dict[str, float] = {}
+        # Permutations local search could not improve (by cache key), so they are not retried
+        self._local_optima: OrderedDict[int, None] = OrderedDict()
+        # Delta engine: decoded split of the last evaluated generation, by permutation hash,
+        # and the origin of each child produced by the last evolve() call
+        self._states: Dict[int, DecodedState] = {}
+        self._origins: List[Origin | None] = []
+        self._origins_for: List[Individual] | None = None
+        # LRU fitness cache: permutation hash -> fitness
+        self.fitness_cache: OrderedDict[int, float] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Every full fitness evaluation, counted against max_evaluations: cache misses plus
+        # those made by local search, resequencing and route-pool recombination
+        self.evaluations = 0
+        self._distinct = 0
+        self._diversity_stats: Dict[str, float] = {}
+        # Timings and counts of the last evolve() call
+        self.stats: Dict[str, float] = {}
+        # State of the current (or last) iterate() call
+        self.best_fitness = float("inf")
+        self.best_individual: Individual | None = None
+        self.convergence: List[float] = []
+        self.decoded_history: List[List] = []
+        self.stop_reason = "generations"
         if self.ga.seed is not None:
             random.seed(self.ga.seed)
 
+    def spatial(self) -> SpatialIndex:
+        """KD-tree index over the customers (great-circle k-nearest candidate lists)."""
+        if self._spatial is None:
+            self._spatial = SpatialIndex.from_nodes(self.nodes_map, self.instance.customer_ids)
+        return self._spatial
+
     def initial_population(self, base_orders: List[Sequence[int]]) -> List[Individual]:
         population: List[Individual] = []
         node_ids = [nid for nid in self.nodes_map if nid != self.depot.node_id]
@@ -39,64 +215,594 @@ class GeneticAlgorithm:
         population.extend([list(order) for order in base_orders])
         return population[: self.ga.population_size]
 
+    def initial_array_population(self, base_orders: List[Sequence[int]]) -> np.ndarray:
+        node_ids = np.array([nid for nid in self.nodes_map if nid != self.depot.node_id], dtype=np.int32)
+        n_random = max(self.ga.population_size - len(base_orders), 0)
+        shuffled = self.np_rng.permuted(np.tile(node_ids, (n_random, 1)), axis=1)
+        seeded = np.array(base_orders, dtype=np.int32).reshape(len(base_orders), len(node_ids))
+        return np.concatenate([shuffled, seeded])[: self.ga.population_size]
+
+    def new_population(self, base_orders: List[Sequence[int]]) -> Population:
+        """Initial population in the configured backend."""
+        if self.backend == "array":
+            return self.initial_array_population(base_orders)
+        return self.initial_population(base_orders)
+
     def crossover(self, parent1: Individual, parent2: Individual) -> Tuple[Individual, Individual]:
+        child1, child2, _ = self._crossover(parent1, parent2)
+        return child1, child2
+
+    def _crossover(self, parent1: Individual, parent2: Individual) -> Tuple[Individual, Individual, bool]:
         if random.random() > self.ga.crossover_rate:
-            return parent1[:], parent2[:]
+            return parent1[:], parent2[:], False
         if self.ga.crossover.upper() == "PMX":
-            return pmx(parent1, parent2)
+            return (*pmx(parent1, parent2), True)
         if self.ga.crossover.upper() == "OX":
-            return ox(parent1, parent2)
+            return (*ox(parent1, parent2), True)
         raise ValueError(f"Unsupported crossover {self.ga.crossover}")
 
-    def evolve(self, population: List[Individual]) -> Tuple[List[Individual], List[float], List[List]]:
-        fitness_values: List[float] = []
-        decoded_routes: List[List] = []
-        for indiv in population:
-            fit, routes = evaluate_individual(indiv, self.nodes_map, self.depot, self.vrp, self.weights)
-            fitness_values.append(fit)
-            decoded_routes.append(routes)
+    def decode(self, individual: Sequence[int]) -> Tuple[float, List[RouteMetrics]]:
+        """Full route decoding (RouteMetrics per vehicle) for one individual, on demand."""
+        return evaluate_individual(
+            individual, self.nodes_map, self.depot, self.vrp, self.weights, self.distances, self.instance
+        )
+
+    def evaluate_population(self, population: Population) -> List[float]:
+        """Scalar fitness of every individual, served from the LRU cache when the same
+        permutation was scored before. Misses go to the configured engine; no routes are
+        decoded here (see ``decode``)."""
+        cache_size = self.ga.fitness_cache_size
+        origins = self._origins if self._origins_for is population else [None] * len(population)
+        results: List[float] = [0.0] * len(population)
+        if isinstance(population, np.ndarray):
+            keys = [hash(tuple(row)) for row in population.tolist()]
+        else:
+            keys = [self._key(indiv) for indiv in population]
+        pending: Dict[int, List[int]] = {}
+        for i, key in enumerate(keys):
+            cached = self.fitness_cache.get(key) if cache_size > 0 else None
+            if cached is not None:
+                self.fitness_cache.move_to_end(key)
+                results[i] = cached
+                self.cache_hits += 1
+            elif key in pending:
+                pending[key].append(i)
+                self.cache_hits += 1
+            else:
+                pending[key] = [i]
+                self.cache_misses += 1
+                self.evaluations += 1
+
+        first = [positions[0] for positions in pending.values()]
+        if isinstance(population, np.ndarray):
+            misses: Population = population[first]
+        else:
+            misses = [population[i] for i in first]
+        evaluated = self._evaluate_uncached(list(pending), misses, [origins[i] for i in first])
+        for key, value in zip(pending, evaluated):
+            for i in pending[key]:
+                results[i] = value
+            self._store(key, value)
+        if self.delta is not None:
+            self._states = {key: self._states[key] for key in keys if key in self._states}
+        self._distinct = len(set(keys))
+        return results
+
+    def _key(self, individual: Sequence[int]) -> int:
+        """Fitness cache key of one permutation; stable across processes, so it can be checkpointed."""
+        if isinstance(individual, np.ndarray):
+            return hash(tuple(individual.tolist()))
+        return hash(tuple(individual))
+
+    def _store(self, key: int, value: float) -> None:
+        cache_size = self.ga.fitness_cache_size
+        if cache_size > 0:
+            self.fitness_cache[key] = value
+            if len(self.fitness_cache) > cache_size:
+                self.fitness_cache.popitem(last=False)
+
+    def _improve(self, individual: Sequence[int]) -> Individual | None:
+        """Local search on one permutation: the improved one (fitness cached), or None."""
+        assert self.local_search is not None
+        key = self._key(individual)
+        if key in self._local_optima:
+            return None
+        done = self.local_search.evaluations
+        improved, fitness = self.local_search.improve(individual)
+        self.evaluations += self.local_search.evaluations - done
+        new_key = self._key(improved)
+        for known in (key, new_key):
+            self._local_optima[known] = None
+        while len(self._local_optima) > max(self.ga.fitness_cache_size, 1000):
+            self._local_optima.popitem(last=False)
+        if new_key == key:
+            return None
+        self._store(new_key, fitness)
+        return improved
+
+    def _resequence(self, individual: Sequence[int]) -> Individual | None:
+        """Short routes of one permutation re-ordered exactly: the improved one (fitness
+        cached), or None."""
+        assert self.resequencer is not None
+        done = self.resequencer.evaluations
+        improved, fitness = self.resequencer.improve(individual)
+        self.evaluations += self.resequencer.evaluations - done
+        if improved == list(individual):
+            return None
+        self._store(self._key(improved), fitness)
+        return improved
+
+    def _local_search_targets(self, n_elite: int, draws: Sequence[float]) -> List[int]:
+        """Positions of the new population to improve: the elites, or offspring whose
+        draw falls under ``local_search_rate``."""
+        if self.ls_mode == "elites":
+            return list(range(n_elite))
+        return [n_elite + i for i, draw in enumerate(draws) if draw < self.ga.local_search_rate]
+
+    def _evaluate_uncached(
+        self, keys: List[int], individuals: Population, origins: List[Origin | None]
+    ) -> List[float]:
+        if len(individuals) == 0:
+            return []
+        if isinstance(individuals, np.ndarray) and self.batch is None and self._pool() is None:
+            individuals = individuals.tolist()
+        if self.delta is not None:
+            states: Dict[int, DecodedState] = {}
+            for key, indiv, origin in zip(keys, individuals, origins):
+                parent = self._states.get(origin[0]) if origin is not None else None
+                if parent is not None and origin[1] is None:
+                    states[key] = parent
+                elif parent is not None:
+                    lo, hi = origin[1]
+                    states[key] = self.delta.apply(parent, indiv, lo, hi)
+                else:
+                    states[key] = self.delta.full(indiv)
+            self._states.update(states)
+            return [states[key].fitness for key in keys]
+        pool = self._pool()
+        if pool is not None:
+            return pool.evaluate(individuals)
+        if self.batch is not None:
+            return self.batch.evaluate(np.asarray(individuals)).tolist()
+        return [self.instance.fitness(indiv, self.weights) for indiv in individuals]
+
+    def _pool(self) -> ParallelEvaluator | None:
+        if self.executor == "serial" or self.delta is not None:
+            return None
+        if self.parallel is None:
+            self.parallel = ParallelEvaluator(
+                self.instance, self.weights, self.engine, self.executor, self.ga.workers
+            )
+        return self.parallel
+
+    def close(self) -> None:
+        """Shut down the worker pool and release shared memory, if any."""
+        if self.parallel is not None:
+            self.parallel.close()
+            self.parallel = None
+
+    def evolve(self, population: Population) -> Tuple[Population, List[float], List[List]]:
+        """Score ``population`` and breed the next one; per-phase timings and counts of the
+        call are left in ``self.stats``."""
+        if isinstance(population, np.ndarray):
+            return self._evolve_array(population)
+        clock = time.perf_counter
+        timings = dict.fromkeys(PHASES, 0.0)
+        hits, misses = self.cache_hits, self.cache_misses
+        started = clock()
+        fitness_values = self.evaluate_population(population)
+        # Per-individual routes are only materialized when explicitly requested
+        decoded_routes = [self.decode(indiv)[1] for indiv in population] if self.ga.keep_decoded else []
+        timings["evaluation"] = clock() - started
 
         new_population: List[Individual] = []
+        origins: List[Origin | None] = []
+        track_origins = self.delta is not None
         # Elitism
-        elite_indices = sorted(range(len(population)), key=lambda i: fitness_values[i])[: self.ga.elitism]
-        for idx in elite_indices:
+        started = clock()
+        elite_idx = elite_positions(fitness_values, self.ga.elitism)
+        for idx in elite_idx:
             new_population.append(population[idx])
+            origins.append(None)
+        timings["elitism"] = clock() - started
+        started = clock()
+        n_children = max(self.ga.population_size - len(elite_idx), 0)
+        sampler = ParentSampler(
+            fitness_values, self.ga.selection, self.ga.tournament_k, 2 * ((n_children + 1) // 2)
+        )
+        timings["selection"] = clock() - started
 
         while len(new_population) < self.ga.population_size:
-            parent1, parent2 = select_pair(
-                population, fitness_values, self.ga.selection, self.ga.tournament_k
-            )
-            child1, child2 = self.crossover(parent1, parent2)
+            started = clock()
+            i1, i2 = sampler.pair()
+            parent1, parent2 = population[i1], population[i2]
+            selected = clock()
+            child1, child2, crossed = self._crossover(parent1, parent2)
+            crossed_at = clock()
+            span1 = span2 = None
             if random.random() < self.ga.mutation_rate:
-                child1 = mutate(child1, self.ga.mutation)
+                child1, span1 = mutate_with_span(child1, self.ga.mutation, self.mutation_lists)
             if random.random() < self.ga.mutation_rate:
-                child2 = mutate(child2, self.ga.mutation)
+                child2, span2 = mutate_with_span(child2, self.ga.mutation, self.mutation_lists)
+            timings["selection"] += selected - started
+            timings["crossover"] += crossed_at - selected
+            timings["mutation"] += clock() - crossed_at
             new_population.append(child1)
+            origins.append(self._origin(parent1, span1) if track_origins and not crossed else None)
             if len(new_population) < self.ga.population_size:
                 new_population.append(child2)
+                origins.append(self._origin(parent2, span2) if track_origins and not crossed else None)
+        if self.local_search is not None:
+            started = clock()
+            n_elite = len(elite_idx)
+            n_offspring = len(new_population) - n_elite
+            draws = [random.random() for _ in range(n_offspring)] if self.ls_mode == "offspring" else []
+            for i in self._local_search_targets(n_elite, draws):
+                improved = self._improve(new_population[i])
+                if improved is not None:
+                    new_population[i] = improved
+                    origins[i] = None
+            timings["local_search"] = clock() - started
+        if self.resequencer is not None and self.ga.resequence_elites:
+            started = clock()
+            for i in range(len(elite_idx)):
+                improved = self._resequence(new_population[i])
+                if improved is not None:
+                    new_population[i] = improved
+                    origins[i] = None
+            timings["local_search"] += clock() - started
+        started = clock()
+        new_population, replaced = self._diversify(new_population, len(elite_idx))
+        for i in replaced:
+            origins[i] = None
+        timings["diversity"] = clock() - started
+        started = clock()
+        if self._recombine(population, fitness_values, new_population):
+            origins[-1] = None
+        timings["route_pool"] = clock() - started
+        self._origins, self._origins_for = origins, new_population
+        self._record_stats(timings, hits, misses, len(population))
+        return new_population, fitness_values, decoded_routes
+
+    def _evolve_array(self, population: np.ndarray) -> Tuple[np.ndarray, List[float], List[List]]:
+        """``evolve`` for the array backend: the same GA steps, applied to whole row sets."""
+        clock = time.perf_counter
+        timings = dict.fromkeys(PHASES, 0.0)
+        hits, misses = self.cache_hits, self.cache_misses
+        started = clock()
+        fitness_values = self.evaluate_population(population)
+        decoded_routes = [self.decode(row)[1] for row in population.tolist()] if self.ga.keep_decoded else []
+        fitness = np.asarray(fitness_values)
+        n_genes = population.shape[1]
+        rng = self.np_rng
+        timings["evaluation"] = clock() - started
+
+        started = clock()
+        elites = elite_indices(fitness, self.ga.elitism)
+        timings["elitism"] = clock() - started
+        n_children = max(self.ga.population_size - len(elites), 0)
+        pairs = (n_children + 1) // 2
+        # All random draws of the generation, up front
+        started = clock()
+        parents = select_indices(fitness, self.ga.selection, self.ga.tournament_k, 2 * pairs, rng)
+        selected = clock()
+        crossed = rng.random(pairs) <= self.ga.crossover_rate
+        mutated = rng.random(2 * pairs) < self.ga.mutation_rate
+        children = population[parents]
+        if n_genes >= 2 and crossed.any():
+            lo, hi = random_spans(n_genes, pairs, rng)
+            crossover = {"PMX": pmx_batch, "OX": ox_batch}.get(self.ga.crossover.upper())
+            if crossover is None:
+                raise ValueError(f"Unsupported crossover {self.ga.crossover}")
+            pair = np.flatnonzero(crossed)
+            first, second = 2 * pair, 2 * pair + 1
+            children[first], children[second] = crossover(
+                children[first], children[second], lo[pair], hi[pair]
+            )
+        crossed_at = clock()
+        mutate_rows(children, np.flatnonzero(mutated), self.ga.mutation, rng, self.mutation_table)
+        new_population = np.concatenate([population[elites], children[:n_children]])
+        timings["selection"] = selected - started
+        timings["crossover"] = crossed_at - selected
+        timings["mutation"] = clock() - crossed_at
+        if self.local_search is not None:
+            started = clock()
+            draws = rng.random(n_children) if self.ls_mode == "offspring" else []
+            for i in self._local_search_targets(len(elites), draws):
+                improved = self._improve(new_population[i].tolist())
+                if improved is not None:
+                    new_population[i] = improved
+            timings["local_search"] = clock() - started
+        if self.resequencer is not None and self.ga.resequence_elites:
+            started = clock()
+            for i in range(len(elites)):
+                improved = self._resequence(new_population[i].tolist())
+                if improved is not None:
+                    new_population[i] = improved
+            timings["local_search"] += clock() - started
+        started = clock()
+        new_population, _ = self._diversify(new_population, len(elites))
+        timings["diversity"] = clock() - started
+        started = clock()
+        self._recombine(population, fitness_values, new_population)
+        timings["route_pool"] = clock() - started
+        self._record_stats(timings, hits, misses, len(population))
         return new_population, fitness_values, decoded_routes
 
-    def run(self, base_orders: List[Sequence[int]]) -> Tuple[Individual, float, List[float], List[List]]:
-        population = self.initial_population(base_orders)
-        best_fitness = float("inf")
-        best_individual: Individual | None = None
-        convergence: List[float] = []
-        decoded_history: List[List] = []
+    def _diversify(self, population: Population, n_elite: int) -> Tuple[Population, List[int]]:
+        """Replace clones of earlier individuals (elites excepted) with heavily mutated
+        copies; when edge diversity falls under ``restart_diversity``, also replace the last
+        ``restart_fraction`` of the offspring with fresh random permutations.
+
+        Returns the population and the replaced positions.
+        """
+        self._diversity_stats: Dict[str, float] = {}
+        replaced: List[int] = []
+        if self.ga.deduplicate:
+            clones = duplicate_positions([self._key(indiv) for indiv in population], n_elite)
+            for _ in range(self.ga.dedup_mutations if clones else 0):
+                if isinstance(population, np.ndarray):
+                    mutate_rows(
+                        population, np.asarray(clones, dtype=np.int64), self.ga.mutation, self.np_rng,
+                        self.mutation_table,
+                    )
+                else:
+                    for i in clones:
+                        population[i] = mutate_with_span(population[i], self.ga.mutation, self.mutation_lists)[0]
+            # Mutation can land on another copy: those get a fresh permutation
+            still = set(duplicate_positions([self._key(indiv) for indiv in population], n_elite))
+            self._shuffle(population, [i for i in clones if i in still])
+            replaced.extend(clones)
+            self._diversity_stats["duplicates"] = len(clones)
+        if self.ga.restart_diversity > 0:
+            diversity = edge_diversity(population)
+            self._diversity_stats["edge_diversity"] = diversity
+            restart: List[int] = []
+            if diversity < self.ga.restart_diversity:
+                count = int(round(self.ga.restart_fraction * (len(population) - n_elite)))
+                restart = list(range(len(population) - count, len(population)))
+                self._shuffle(population, restart)
+                replaced.extend(restart)
+            self._diversity_stats["restarted"] = len(restart)
+        return population, sorted(set(replaced))
+
+    def _recombine(self, scored: Population, fitness: List[float], population: Population) -> bool:
+        """Pool the feasible routes of the best quarter of ``scored`` and, every
+        ``route_pool_every`` generations, set-partition the pool against the best one's
+        routes; a cheaper combination that also scores better as a permutation replaces
+        the last individual of the next ``population``.
+
+        The routes are laid out fullest first, so the greedy split tends to cut the
+        permutation at the same places; the optimal split can only do better.
+        """
+        self._pool_stats = {}
+        if self.route_pool is None or not len(scored):
+            return False
+        self._evolutions += 1
+        best = elite_positions(fitness, max(len(scored) // 4, 1))
+        rows = [scored[i].tolist() if isinstance(scored, np.ndarray) else scored[i] for i in best]
+        decoded = [self.instance.split(indiv, self.weights) for indiv in rows]
+        for routes in decoded:
+            for route in routes:
+                self.route_pool.add(route)
+        self._pool_stats = {"route_pool": len(self.route_pool), "recombined": 0}
+        if self._evolutions % self.ga.route_pool_every or not len(population):
+            return False
+        found = self.route_pool.recombine(decoded[0], self.vrp.vehicles, self.ga.route_pool_nodes)
+        if found is None:
+            return False
+        demand, index = self.instance.demand, self.instance.index
+        routes = sorted(found[0], key=lambda r: -sum(demand[index[nid]] for nid in r))
+        combined = [nid for route in routes for nid in route]
+        value = self.instance.fitness(combined, self.weights)
+        self.evaluations += 1
+        if value >= fitness[best[0]]:
+            return False
+        self._store(self._key(combined), value)
+        population[-1] = combined
+        self._pool_stats["recombined"] = 1
+        return True
+
+    def _shuffle(self, population: Population, positions: List[int]) -> None:
+        """Fresh random permutations at ``positions``, in place."""
+        if not positions:
+            return
+        if isinstance(population, np.ndarray):
+            population[positions] = self.np_rng.permuted(population[positions], axis=1)
+            return
+        for i in positions:
+            indiv = list(population[i])
+            random.shuffle(indiv)
+            population[i] = indiv
+
+    def _record_stats(self, timings: Dict[str, float], hits: int, misses: int, size: int) -> None:
+        self.stats = {f"time_{phase}": value for phase, value in timings.items()}
+        self.stats.update(self._diversity_stats)
+        self.stats.update(self._pool_stats)
+        self.stats["evaluations"] = self.cache_misses - misses
+        self.stats["cache_hits"] = self.cache_hits - hits
+        # Share of distinct permutations in the scored generation
+        self.stats["diversity"] = self._distinct / size if size else 0.0
+
+    @staticmethod
+    def _origin(parent: Individual, span: Span | None) -> Origin:
+        return hash(tuple(parent)), span
+
+    def checkpoint(
+        self,
+        generation: int,
+        population: Population,
+        convergence: List[float],
+        best_individual: Individual | None,
+        best_fitness: float,
+        stagnant: int,
+        elapsed: float,
+    ) -> Checkpoint:
+        """Copy of the run state after ``generation`` generations, safe to write in the background."""
+        if isinstance(population, np.ndarray):
+            rows = population.copy()
+        else:
+            rows = np.asarray(population, dtype=np.int64)
+        pooled = list(self.route_pool.routes.values()) if self.route_pool is not None else []
+        return Checkpoint(
+            generation=generation,
+            backend=self.backend,
+            population=rows,
+            cache_keys=np.fromiter(self.fitness_cache.keys(), dtype=np.int64, count=len(self.fitness_cache)),
+            cache_values=np.fromiter(self.fitness_cache.values(), dtype=np.float64, count=len(self.fitness_cache)),
+            local_optima=np.fromiter(self._local_optima.keys(), dtype=np.int64, count=len(self._local_optima)),
+            convergence=list(convergence),
+            best_individual=list(best_individual) if best_individual is not None else None,
+            best_fitness=best_fitness,
+            stagnant=stagnant,
+            cache_hits=self.cache_hits,
+            cache_misses=self.cache_misses,
+            evaluations=self.evaluations,
+            elapsed=elapsed,
+            random_state=random.getstate(),
+            np_rng_state=self.np_rng.bit_generator.state,
+            evolutions=self._evolutions,
+            route_pool_stops=np.asarray([nid for _, route in pooled for nid in route], dtype=np.int64),
+            route_pool_lengths=np.asarray([len(route) for _, route in pooled], dtype=np.int64),
+            route_pool_costs=np.asarray([cost for cost, _ in pooled], dtype=np.float64),
+        )
+
+    def restore(self, checkpoint: Checkpoint) -> Population:
+        """Load caches, counters and RNG states from ``checkpoint``; returns its population."""
+        if checkpoint.backend != self.backend:
+            raise ValueError(f"Checkpoint uses the {checkpoint.backend} backend, not {self.backend}")
+        customers = sorted(nid for nid in self.nodes_map if nid != self.depot.node_id)
+        rows = checkpoint.population
+        if rows.ndim != 2 or rows.shape[1] != len(customers) or sorted(rows[0].tolist()) != customers:
+            raise ValueError("Checkpoint does not match this problem instance")
+        self.fitness_cache = OrderedDict(
+            zip(checkpoint.cache_keys.tolist(), checkpoint.cache_values.tolist())
+        )
+        self._local_optima = OrderedDict.fromkeys(checkpoint.local_optima.tolist())
+        self.cache_hits = checkpoint.cache_hits
+        self.cache_misses = checkpoint.cache_misses
+        self.evaluations = checkpoint.evaluations
+        random.setstate(checkpoint.random_state)
+        self.np_rng.bit_generator.state = checkpoint.np_rng_state
+        self._evolutions = checkpoint.evolutions
+        if self.route_pool is not None:
+            stops = checkpoint.route_pool_stops.tolist()
+            ends = np.cumsum(checkpoint.route_pool_lengths).tolist()
+            self.route_pool.routes = {}
+            for start, end, cost in zip([0] + ends[:-1], ends, checkpoint.route_pool_costs.tolist()):
+                route = stops[start:end]
+                self.route_pool.routes[frozenset(route)] = (cost, route)
+        if self.backend == "array":
+            return rows.astype(np.int32)
+        return rows.tolist()
+
+    def iterate(self, base_orders: List[Sequence[int]], resume: bool = False) -> Iterator[GenerationSnapshot]:
+        """Evolve generation by generation, yielding a ``GenerationSnapshot`` after each.
+
+        Breaking out of the loop stops the run (``stop_reason`` "interrupted"); ``result``
+        then returns the best individual found so far. With ``checkpoint_path`` set, the
+        run state is written every ``checkpoint_every`` generations and when the run ends;
+        ``resume=True`` continues from that file (if it exists) exactly as the interrupted
+        run would have.
+        """
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.evaluations = 0
+        self.best_fitness = float("inf")
+        self.best_individual = None
+        self.convergence = []
+        self.decoded_history = []
+        self.stop_reason = "generations"
         stagnant = 0
+        first_gen = 0
+        elapsed = 0.0
+        path = self.ga.checkpoint_path
+        if resume and path and os.path.exists(path):
+            saved = read_checkpoint(path)
+            population = self.restore(saved)
+            first_gen, elapsed = saved.generation, saved.elapsed
+            self.best_individual, self.best_fitness = saved.best_individual, saved.best_fitness
+            self.convergence, stagnant = saved.convergence, saved.stagnant
+        else:
+            population = self.new_population(base_orders)
+        writer = CheckpointWriter(path) if path else None
+        every = max(self.ga.checkpoint_every, 1)
+        started = time.perf_counter() - elapsed
 
-        for gen in range(self.ga.generations):
-            population, fitness_vals, decoded = self.evolve(population)
-            decoded_history = decoded
-            gen_best_idx = min(range(len(fitness_vals)), key=lambda i: fitness_vals[i])
-            gen_best_fit = fitness_vals[gen_best_idx]
-            if gen_best_fit < best_fitness:
-                best_fitness = gen_best_fit
-                best_individual = population[gen_best_idx]
-                stagnant = 0
-            else:
-                stagnant += 1
-            convergence.append(gen_best_fit)
-            if stagnant >= self.ga.stagnation_patience:
-                break
-        assert best_individual is not None
-        return best_individual, best_fitness, convergence, decoded_history
+        try:
+            for gen in range(first_gen, self.ga.generations):
+                step_started = time.perf_counter()
+                evaluated = population
+                population, fitness_vals, decoded = self.evolve(population)
+                self.decoded_history = decoded
+                gen_best_idx = min(range(len(fitness_vals)), key=lambda i: fitness_vals[i])
+                gen_best_fit = fitness_vals[gen_best_idx]
+                if gen_best_fit < self.best_fitness:
+                    self.best_fitness = gen_best_fit
+                    # fitness_vals scores the generation that was just evaluated, not the offspring
+                    self.best_individual = list(map(int, evaluated[gen_best_idx]))
+                    stagnant = 0
+                else:
+                    stagnant += 1
+                self.convergence.append(gen_best_fit)
+                now = time.perf_counter()
+                stop = None
+                if stagnant >= self.ga.stagnation_patience:
+                    stop = "stagnation"
+                elif gen + 1 < self.ga.generations:
+                    stop = stop_criterion(
+                        self.ga, self.best_fitness, self.evaluations, now - started, now - step_started
+                    )
+                if writer is not None and (stop or (gen + 1) % every == 0 or gen + 1 == self.ga.generations):
+                    writer.save(
+                        self.checkpoint(
+                            gen + 1, population, self.convergence, self.best_individual,
+                            self.best_fitness, stagnant, now - started,
+                        )
+                    )
+                last = stop is not None or gen + 1 == self.ga.generations
+                if last and self.resequencer is not None:
+                    assert self.best_individual is not None
+                    improved, value = self.resequencer.improve(self.best_individual)
+                    if value < self.best_fitness:
+                        self.best_individual, self.best_fitness = improved, value
+                # Stays "interrupted" if the caller leaves the loop at this yield
+                self.stop_reason = (stop or "generations") if last else "interrupted"
+                assert self.best_individual is not None
+                scores = np.asarray(fitness_vals)
+                yield GenerationSnapshot(
+                    generation=gen + 1,
+                    best_fitness=self.best_fitness,
+                    generation_best=gen_best_fit,
+                    mean_fitness=float(scores.mean()),
+                    best_individual=self.best_individual,
+                    elapsed=now - started,
+                    stop_reason=self.stop_reason if last else None,
+                    stats={"worst_fitness": float(scores.max()), **self.stats},
+                )
+                if stop is not None:
+                    break
+        finally:
+            self.close()
+            if writer is not None:
+                writer.close()
+
+    def result(self) -> GAResult:
+        """``GAResult`` of the last ``iterate``/``run`` call, decoding the best individual's routes."""
+        assert self.best_individual is not None
+        return GAResult(
+            best_individual=self.best_individual,
+            best_fitness=self.best_fitness,
+            convergence=self.convergence,
+            decoded_history=self.decoded_history,
+            cache_hits=self.cache_hits,
+            cache_misses=self.cache_misses,
+            best_routes=self.decode(self.best_individual)[1],
+            stop_reason=self.stop_reason,
+        )
+
+    def run(self, base_orders: List[Sequence[int]], resume: bool = False) -> GAResult:
+        """Evolve until a stopping criterion fires and return the best individual found."""
+        for _ in self.iterate(base_orders, resume):
+            pass
+        return self.result()
@@ -3,22 +3,301 @@ from __future__ import annotations
 import math
 from typing import Dict, List, Sequence
 
-from .distance import haversine
-from .vrp import Node
+import numpy as np
 
+from .distance import DistanceMatrix
+from .spatial import SpatialIndex
+from .vrp import Node, VRPParams
 
-def nearest_neighbor_order(node_ids: Sequence[int], nodes: Dict[int, Node], depot: Node) -> List[int]:
-    remaining = set(node_ids)
+CONSTRUCTORS = ("nearest_neighbor", "savings", "sweep", "regret")
+
+
+def nearest_neighbor_order(
+    node_ids: Sequence[int],
+    nodes: Dict[int, Node],
+    depot: Node,
+    distances: DistanceMatrix | None = None,
+) -> List[int]:
+    """Greedy tour from the depot, always moving to the closest unvisited stop.
+
+    Uses the distance matrix when given; otherwise a ``SpatialIndex`` over the stops,
+    which never builds an (n, n) matrix.
+    """
+    if distances is not None:
+        return _nearest_neighbor_matrix(node_ids, depot, distances)
+    if not node_ids:
+        return []
+    return _nearest_neighbor_spatial(SpatialIndex.from_nodes(nodes, node_ids), depot)
+
+
+def _nearest_neighbor_spatial(index: SpatialIndex, depot: Node, k: int = 16) -> List[int]:
+    """Nearest-neighbour tour over ``index``: the first unvisited entry of the current stop's
+    k-nearest list is the true nearest; only when all k are visited do we scan the rest."""
+    n = len(index)
+    candidates = index.neighbors(k).tolist()
+    vectors = index.vectors
+    visited = np.zeros(n, dtype=bool)
+    current = index.nearest_to(depot.lat, depot.lon)
+    order: List[int] = []
+    for _ in range(n):
+        visited[current] = True
+        order.append(index.node_ids[current])
+        if len(order) == n:
+            break
+        following = next((c for c in candidates[current] if not visited[c]), None)
+        if following is None:
+            remaining = np.flatnonzero(~visited)
+            diff = vectors[remaining] - vectors[current]
+            following = int(remaining[np.argmin(np.einsum("nd,nd->n", diff, diff))])
+        current = following
+    return order
+
+
+def _nearest_neighbor_matrix(node_ids: Sequence[int], depot: Node, distances: DistanceMatrix) -> List[int]:
+    candidates = distances.indices(node_ids)
+    available = np.ones(len(candidates), dtype=bool)
+    order: List[int] = []
+    current = distances.index[depot.node_id]
+    for _ in range(len(candidates)):
+        row = np.where(available, distances.km[current, candidates], np.inf)
+        pick = int(np.argmin(row))
+        available[pick] = False
+        current = int(candidates[pick])
+        order.append(distances.node_ids[current])
+    return order
+
+
+def _local_matrix(
+    node_ids: Sequence[int], nodes: Dict[int, Node], depot: Node, distances: DistanceMatrix | None
+) -> np.ndarray:
+    """Distances among depot (row 0) and ``node_ids`` (rows 1..n)."""
+    ids = [depot.node_id, *node_ids]
+    if distances is None:
+        distances = DistanceMatrix.from_nodes({nid: depot if nid == depot.node_id else nodes[nid] for nid in ids})
+    idx = distances.indices(ids)
+    return np.asarray(distances.km[np.ix_(idx, idx)], dtype=np.float64)
+
+
+def _angles(node_ids: Sequence[int], nodes: Dict[int, Node], depot: Node) -> np.ndarray:
+    """Polar angle of each stop around the depot, in [0, 2*pi)."""
+    lat = np.array([nodes[nid].lat for nid in node_ids], dtype=np.float64)
+    lon = np.array([nodes[nid].lon for nid in node_ids], dtype=np.float64)
+    x = (lon - depot.lon) * math.cos(math.radians(depot.lat))
+    return np.mod(np.arctan2(lat - depot.lat, x), 2 * math.pi)
+
+
+def _by_angle(routes: List[List[int]], angles: np.ndarray) -> List[List[int]]:
+    """Routes (local 1-based indices) ordered by the mean angle of their stops, so
+    consecutive routes of the giant tour are geographic neighbours."""
+    def key(route: List[int]) -> float:
+        a = angles[np.asarray(route) - 1]
+        return float(np.mod(np.arctan2(np.sin(a).mean(), np.cos(a).mean()), 2 * math.pi))
+
+    return sorted((r for r in routes if r), key=key)
+
+
+def savings_order(
+    node_ids: Sequence[int],
+    nodes: Dict[int, Node],
+    depot: Node,
+    capacity: float,
+    distances: DistanceMatrix | None = None,
+    rng: np.random.Generator | None = None,
+    noise: float = 0.0,
+) -> List[int]:
+    """Clarke-Wright parallel savings, as a giant tour of the merged routes.
+
+    All savings ``d(0,i) + d(0,j) - d(i,j)`` are computed and sorted in one NumPy pass;
+    merges join route ends while the load fits ``capacity``. With ``rng``, savings are
+    scaled by ``1 ± noise`` for a randomized variant.
+    """
+    n = len(node_ids)
+    if n < 2:
+        return list(node_ids)
+    km = _local_matrix(node_ids, nodes, depot, distances)
+    demand = np.array([nodes[nid].demand for nid in node_ids], dtype=np.float64)
+    d0 = km[0, 1:]
+    iu, ju = np.triu_indices(n, 1)
+    values = d0[iu] + d0[ju] - km[iu + 1, ju + 1]
+    if rng is not None and noise > 0:
+        values = values * (1 + noise * rng.uniform(-1, 1, len(values)))
+    order = np.argsort(-values, kind="stable")
+    order = order[values[order] > 0]
+
+    route_of = list(range(n))
+    routes: Dict[int, List[int]] = {i: [i] for i in range(n)}
+    loads = demand.tolist()
+    for i, j in zip(iu[order].tolist(), ju[order].tolist()):
+        ri, rj = route_of[i], route_of[j]
+        if ri == rj or loads[ri] + loads[rj] > capacity:
+            continue
+        a, b = routes[ri], routes[rj]
+        if a[-1] == i and b[0] == j:
+            merged = a + b
+        elif a[0] == i and b[-1] == j:
+            merged = b + a
+        elif a[-1] == i and b[-1] == j:
+            merged = a + b[::-1]
+        elif a[0] == i and b[0] == j:
+            merged = a[::-1] + b
+        else:
+            continue
+        routes[ri] = merged
+        loads[ri] += loads[rj]
+        for stop in b:
+            route_of[stop] = ri
+        del routes[rj]
+    angles = _angles(node_ids, nodes, depot)
+    ordered = _by_angle([[stop + 1 for stop in route] for route in routes.values()], angles)
+    return [node_ids[stop - 1] for route in ordered for stop in route]
+
+
+def sweep_order(
+    node_ids: Sequence[int],
+    nodes: Dict[int, Node],
+    depot: Node,
+    capacity: float,
+    distances: DistanceMatrix | None = None,
+    start_angle: float = 0.0,
+) -> List[int]:
+    """Angular sweep around the depot from ``start_angle``: stops are cut into
+    capacity-sized clusters in angle order, each visited in nearest-neighbour order."""
+    n = len(node_ids)
+    if n < 2:
+        return list(node_ids)
+    km = _local_matrix(node_ids, nodes, depot, distances)
+    angles = np.mod(_angles(node_ids, nodes, depot) - start_angle, 2 * math.pi)
+    clusters: List[List[int]] = [[]]
+    load = 0.0
+    for stop in np.argsort(angles, kind="stable").tolist():
+        demand = nodes[node_ids[stop]].demand
+        if clusters[-1] and load + demand > capacity:
+            clusters.append([])
+            load = 0.0
+        clusters[-1].append(stop + 1)
+        load += demand
     order: List[int] = []
-    current = depot.node_id
-    while remaining:
-        next_node = min(remaining, key=lambda nid: haversine(nodes[current].coord, nodes[nid].coord))
-        order.append(next_node)
-        remaining.remove(next_node)
-        current = next_node
+    for cluster in clusters:
+        remaining = np.array(cluster)
+        current = 0
+        while len(remaining):
+            pick = int(np.argmin(km[current, remaining]))
+            current = int(remaining[pick])
+            order.append(node_ids[current - 1])
+            remaining = np.delete(remaining, pick)
     return order
 
 
-def trivial_sa_placeholder(order: Sequence[int]) -> List[int]:
-    """Placeholder for SA; currently returns same order to keep interface stable."""
-    return list(order)
+def regret_insertion_order(
+    node_ids: Sequence[int],
+    nodes: Dict[int, Node],
+    depot: Node,
+    capacity: float,
+    vehicles: int,
+    k: int = 2,
+    distances: DistanceMatrix | None = None,
+    rng: np.random.Generator | None = None,
+    noise: float = 0.0,
+) -> List[int]:
+    """Parallel regret-k insertion into ``vehicles`` routes.
+
+    Each step inserts the stop whose cheapest feasible insertion beats its next ``k - 1``
+    alternatives (other routes) by the most, at its cheapest position. Insertion costs
+    are kept per (stop, route) and only the column of the route that changed is
+    recomputed, one NumPy pass over its edges. Stops that fit nowhere close the tour.
+    """
+    n = len(node_ids)
+    if n < 2:
+        return list(node_ids)
+    km = _local_matrix(node_ids, nodes, depot, distances)
+    demand = np.concatenate([[0.0], [nodes[nid].demand for nid in node_ids]])
+    n_routes = max(1, min(vehicles, n))
+    routes: List[List[int]] = [[] for _ in range(n_routes)]
+    loads = np.zeros(n_routes)
+    cost = np.full((n + 1, n_routes), np.inf)
+    position = np.zeros((n + 1, n_routes), dtype=np.int64)
+    unrouted = np.ones(n + 1, dtype=bool)
+    unrouted[0] = False
+
+    def update(r: int) -> None:
+        candidates = np.flatnonzero(unrouted)
+        seq = np.array([0, *routes[r], 0])
+        a, b = seq[:-1], seq[1:]
+        extra = km[np.ix_(candidates, a)] + km[np.ix_(candidates, b)] - km[a, b]
+        best = np.argmin(extra, axis=1)
+        values = extra[np.arange(len(candidates)), best]
+        values[demand[candidates] + loads[r] > capacity] = np.inf
+        cost[candidates, r] = values
+        position[candidates, r] = best
+
+    for r in range(n_routes):
+        update(r)
+    kk = min(max(k, 2), n_routes)
+    while unrouted.any():
+        candidates = np.flatnonzero(unrouted)
+        options = np.sort(cost[candidates], axis=1)
+        best = options[:, 0]
+        feasible = np.isfinite(best)
+        if not feasible.any():
+            break
+        with np.errstate(invalid="ignore"):
+            # A stop with fewer than k feasible routes left gets an infinite regret
+            regret = (options[:, 1:kk] - best[:, None]).sum(axis=1) if kk > 1 else -best
+        if rng is not None and noise > 0:
+            regret = regret * (1 + noise * rng.uniform(-1, 1, len(regret)))
+        regret[~feasible] = -np.inf
+        # Highest regret first; ties go to the stop that is most expensive to place
+        pick = int(np.lexsort((best, regret))[-1])
+        stop = int(candidates[pick])
+        r = int(np.argmin(cost[stop]))
+        routes[r].insert(int(position[stop, r]), stop)
+        loads[r] += demand[stop]
+        unrouted[stop] = False
+        update(r)
+    order = [node_ids[stop - 1] for route in routes if route for stop in route]
+    return order + [node_ids[stop - 1] for stop in np.flatnonzero(unrouted)]
+
+
+def seed_orders(
+    mix: Dict[str, int],
+    nodes: Dict[int, Node],
+    depot: Node,
+    vrp: VRPParams,
+    distances: DistanceMatrix | None = None,
+    seed: int | None = None,
+    regret_k: int = 3,
+    noise: float = 0.2,
+) -> List[List[int]]:
+    """Initial GA/SA seeds: ``mix`` maps a constructor name to how many tours it builds.
+
+    The first tour of each constructor is its deterministic one; the others are
+    randomized (random sweep start angle, savings/regret values scaled by ``1 ± noise``).
+    ``nearest_neighbor`` has no randomized variant and builds at most one tour.
+    """
+    unknown = [name for name in mix if name not in CONSTRUCTORS]
+    if unknown:
+        raise ValueError(f"Unsupported seed heuristics {unknown}")
+    customers = [nid for nid in nodes if nid != depot.node_id]
+    rng = np.random.default_rng(seed)
+    orders: List[List[int]] = []
+    for name, count in mix.items():
+        for variant in range(int(count)):
+            randomized = rng if variant > 0 else None
+            if name == "nearest_neighbor":
+                if variant == 0:
+                    orders.append(nearest_neighbor_order(customers, nodes, depot, distances))
+            elif name == "savings":
+                orders.append(
+                    savings_order(customers, nodes, depot, vrp.vehicle_capacity, distances, randomized, noise)
+                )
+            elif name == "sweep":
+                start = float(rng.uniform(0, 2 * math.pi)) if variant > 0 else 0.0
+                orders.append(sweep_order(customers, nodes, depot, vrp.vehicle_capacity, distances, start))
+            else:
+                orders.append(
+                    regret_insertion_order(
+                        customers, nodes, depot, vrp.vehicle_capacity, vrp.vehicles, regret_k,
+                        distances, randomized, noise,
+                    )
+                )
+    return orders
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .distance import DistanceMatrix
+from .vrp import Node, RouteMetrics, VRPParams, WeightParams, hhmm_to_minutes
+
+# Per-position weight of the priority penalty for priorities 1, 2 and 3+
+PRIORITY_COEF = {1: 1.0, 2: 0.25}
+DEFAULT_PRIORITY_COEF = 0.1
+
+
+class ProblemInstance:
+    """Array-backed view of one VRP instance, compiled once from the node dict.
+
+    Node attributes live in contiguous arrays aligned with ``distances.node_ids``
+    (demand, priority coefficient, service time and time windows in integer minutes,
+    ``NaN`` when absent), so evaluation never touches ``Node`` objects, dicts keyed by
+    node id, or ``"HH:MM"`` strings.
+    """
+
+    def __init__(
+        self,
+        nodes_map: Dict[int, Node],
+        depot: Node,
+        vrp: VRPParams,
+        distances: DistanceMatrix | None = None,
+    ) -> None:
+        self.vrp = vrp
+        self.distances = distances if distances is not None else DistanceMatrix.from_nodes(nodes_map)
+        self.node_ids = self.distances.node_ids
+        self.index = self.distances.index
+        self.depot_id = depot.node_id
+        self.depot_idx = self.index[depot.node_id]
+        self.customer_ids = [nid for nid in self.node_ids if nid != depot.node_id]
+
+        # Dense id -> index lookup for whole arrays of node ids
+        self.id_offset = min(self.node_ids)
+        self.id_lookup = np.full(max(self.node_ids) - self.id_offset + 1, -1, dtype=np.int64)
+        self.id_lookup[np.asarray(self.node_ids) - self.id_offset] = np.arange(len(self.node_ids))
+
+        nodes = [nodes_map[nid] for nid in self.node_ids]
+        self.km = np.asarray(self.distances.km)
+        self.demand = np.array([n.demand for n in nodes], dtype=np.float64)
+        self.priority = np.array([n.priority for n in nodes], dtype=np.int64)
+        self.priority_coef = np.array(
+            [PRIORITY_COEF.get(n.priority, DEFAULT_PRIORITY_COEF) for n in nodes], dtype=np.float64
+        )
+        self.service = np.array([n.service_time_min for n in nodes], dtype=np.float64)
+        self.window_start = np.array(
+            [hhmm_to_minutes(n.window_start) if n.window_start else np.nan for n in nodes], dtype=np.float64
+        )
+        self.window_end = np.array(
+            [hhmm_to_minutes(n.window_end) if n.window_end else np.nan for n in nodes], dtype=np.float64
+        )
+        self.minutes_per_km = 60.0 / max(vrp.vehicle_speed_kmh, 1e-6)
+        self.depot_minutes = self.km[self.depot_idx].astype(np.float64) * self.minutes_per_km
+        if vrp.work_time_window:
+            start_str, end_str = vrp.work_time_window
+            self.work_window: Tuple[float, float] | None = (
+                hhmm_to_minutes(start_str),
+                hhmm_to_minutes(end_str),
+            )
+        else:
+            self.work_window = None
+
+        self._build_mirrors()
+
+    # Per-node arrays that fully describe an instance together with vrp/node ids/depot
+    ARRAY_FIELDS = (
+        "km",
+        "demand",
+        "priority",
+        "priority_coef",
+        "service",
+        "window_start",
+        "window_end",
+        "depot_minutes",
+    )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        vrp: VRPParams,
+        node_ids: Sequence[int],
+        depot_id: int,
+        arrays: Dict[str, np.ndarray],
+    ) -> "ProblemInstance":
+        """Rebuild an instance around existing arrays (e.g. views on shared memory)."""
+        self = cls.__new__(cls)
+        self.vrp = vrp
+        self.distances = DistanceMatrix(node_ids, arrays["km"])
+        self.node_ids = self.distances.node_ids
+        self.index = self.distances.index
+        self.depot_id = depot_id
+        self.depot_idx = self.index[depot_id]
+        self.customer_ids = [nid for nid in self.node_ids if nid != depot_id]
+        self.id_offset = min(self.node_ids)
+        self.id_lookup = np.full(max(self.node_ids) - self.id_offset + 1, -1, dtype=np.int64)
+        self.id_lookup[np.asarray(self.node_ids) - self.id_offset] = np.arange(len(self.node_ids))
+        for name in cls.ARRAY_FIELDS:
+            setattr(self, name, arrays[name])
+        self.minutes_per_km = 60.0 / max(vrp.vehicle_speed_kmh, 1e-6)
+        if vrp.work_time_window:
+            start_str, end_str = vrp.work_time_window
+            self.work_window = (hhmm_to_minutes(start_str), hhmm_to_minutes(end_str))
+        else:
+            self.work_window = None
+        self._build_mirrors()
+        return self
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+
+    def _build_mirrors(self) -> None:
+        # Plain-list mirrors: scalar loops index these much faster than NumPy scalars
+        self._demand = self.demand.tolist()
+        self._coef = self.priority_coef.tolist()
+        self._service = self.service.tolist()
+        self._depot_minutes = self.depot_minutes.tolist()
+        self._w_start = [None if np.isnan(v) else v for v in self.window_start.tolist()]
+        self._w_end = [None if np.isnan(v) else v for v in self.window_end.tolist()]
+
+    @property
+    def has_window_starts(self) -> bool:
+        return not np.isnan(self.window_start).all()
+
+    def to_index(self, node_ids: Sequence[int] | np.ndarray) -> np.ndarray:
+        """Matrix indices for an array (any shape) of node ids."""
+        return self.id_lookup[np.asarray(node_ids, dtype=np.int64) - self.id_offset]
+
+    def split(self, permutation: Sequence[int], weights: WeightParams | None = None) -> List[List[int]]:
+        """Cut a permutation into ``vrp.vehicles`` routes with the configured ``vrp.split``."""
+        if self.vrp.split == "optimal" and weights is not None:
+            return self.split_optimal(permutation, weights)
+        return self.split_greedy(permutation)
+
+    def split_greedy(self, permutation: Sequence[int]) -> List[List[int]]:
+        """Greedy capacity split, identical to ``split_routes``."""
+        routes: List[List[int]] = [[] for _ in range(self.vrp.vehicles)]
+        if not routes:
+            return routes
+        capacity = self.vrp.vehicle_capacity
+        demand = self._demand
+        index = self.index
+        vehicle_idx = 0
+        load = 0.0
+        for customer_id in permutation:
+            d = demand[index[customer_id]]
+            if load + d > capacity and routes[vehicle_idx]:
+                vehicle_idx += 1
+                load = 0.0
+                if vehicle_idx >= self.vrp.vehicles:
+                    break
+            routes[vehicle_idx].append(customer_id)
+            load += d
+        return routes
+
+    def split_optimal(self, permutation: Sequence[int], weights: WeightParams) -> List[List[int]]:
+        """Bellman (Prins) split: best cut of the permutation into at most ``vrp.vehicles``
+        consecutive routes, each within capacity and range, by total weighted route cost.
+
+        Arcs ``i -> j`` (customers ``i..j-1`` on one vehicle) are built in O(n*L) using
+        prefix sums of the leg distances, where L is the longest feasible route. A route
+        with a single customer is always allowed (penalized as usual). Falls back to the
+        greedy split when no partition fits in the fleet.
+        """
+        vehicles = self.vrp.vehicles
+        n = len(permutation)
+        if n == 0 or vehicles == 0:
+            return [[] for _ in range(vehicles)]
+        arcs = self._split_arcs([self.index[c] for c in permutation], weights)
+        empty_cost = self.route_cost([], weights)
+
+        # Unlimited fleet first: if it already fits, it is optimal for the fleet too
+        best = [math.inf] * (n + 1)
+        pred = [-1] * (n + 1)
+        used = [0] * (n + 1)
+        best[0] = 0.0
+        for i in range(n):
+            if best[i] == math.inf:
+                continue
+            for j, cost in arcs[i]:
+                value = best[i] + cost
+                if value < best[j]:
+                    best[j], pred[j], used[j] = value, i, used[i] + 1
+        if best[n] < math.inf and used[n] <= vehicles and empty_cost == 0:
+            cuts = [n]
+            while cuts[-1] > 0:
+                cuts.append(pred[cuts[-1]])
+            return self._routes_from_cuts(permutation, cuts[::-1])
+
+        # Fleet-limited Bellman over (routes used, position)
+        layers = [[math.inf] * (n + 1) for _ in range(vehicles + 1)]
+        preds = [[-1] * (n + 1) for _ in range(vehicles + 1)]
+        layers[0][0] = 0.0
+        for k in range(1, vehicles + 1):
+            prev, cur, cur_pred = layers[k - 1], layers[k], preds[k]
+            for i in range(n):
+                if prev[i] == math.inf:
+                    continue
+                for j, cost in arcs[i]:
+                    value = prev[i] + cost
+                    if value < cur[j]:
+                        cur[j], cur_pred[j] = value, i
+        totals = [layers[k][n] + (vehicles - k) * empty_cost for k in range(vehicles + 1)]
+        k = min(range(1, vehicles + 1), key=lambda r: totals[r])
+        if totals[k] == math.inf:
+            return self.split_greedy(permutation)
+        cuts = [n]
+        for layer in range(k, 0, -1):
+            cuts.append(preds[layer][cuts[-1]])
+        return self._routes_from_cuts(permutation, cuts[::-1])
+
+    def _routes_from_cuts(self, permutation: Sequence[int], cuts: List[int]) -> List[List[int]]:
+        routes = [list(permutation[a:b]) for a, b in zip(cuts[:-1], cuts[1:])]
+        return routes + [[] for _ in range(self.vrp.vehicles - len(routes))]
+
+    def _split_arcs(self, idx: List[int], weights: WeightParams) -> List[List[Tuple[int, float]]]:
+        """Feasible routes ``i -> j`` over the permutation (as indices) with their weighted cost."""
+        n = len(idx)
+        seq = np.asarray(idx, dtype=np.int64)
+        depot = self.depot_idx
+        out_km = self.km[depot, seq].astype(np.float64).tolist()
+        in_km = self.km[seq, depot].astype(np.float64).tolist()
+        prefix = [0.0] * n
+        if n > 1:
+            legs = np.cumsum(self.km[seq[:-1], seq[1:]], dtype=np.float64)
+            prefix = np.concatenate(([0.0], legs)).tolist()
+        demand, coef, service = self._demand, self._coef, self._service
+        depot_minutes, w_start, w_end = self._depot_minutes, self._w_start, self._w_end
+        capacity, max_range = self.vrp.vehicle_capacity, self.vrp.vehicle_range_km
+        window = self.work_window
+
+        arcs: List[List[Tuple[int, float]]] = []
+        for i in range(n):
+            row: List[Tuple[int, float]] = []
+            load = priority = late = 0.0
+            clock = window[0] if window is not None else 0.0
+            for j in range(i, n):
+                node = idx[j]
+                load += demand[node]
+                distance = out_km[i] + prefix[j] - prefix[i] + in_km[j]
+                # Load and distance only grow with j (triangle inequality), so stop at the first violation
+                if j > i and (load > capacity or distance > max_range):
+                    break
+                priority += coef[node] * (j - i)
+                time_pen = 0.0
+                if window is not None:
+                    arrive = clock + depot_minutes[node]
+                    if w_start[node] is not None and arrive < w_start[node]:
+                        arrive = w_start[node]
+                    if w_end[node] is not None and arrive > w_end[node]:
+                        late += arrive - w_end[node]
+                    clock = arrive + service[node]
+                    time_pen = late + max(clock - window[1], 0.0)
+                cost = (
+                    weights.w_distance * distance
+                    + weights.w_capacity * max(load - capacity, 0.0)
+                    + weights.w_range * max(distance - max_range, 0.0)
+                    + weights.w_priority * priority
+                    + weights.w_time * time_pen
+                )
+                row.append((j + 1, cost))
+            arcs.append(row)
+        return arcs
+
+    def route_values(
+        self, route_idx: Sequence[int]
+    ) -> Tuple[float, float, float, float, float, float, float]:
+        """(distance_km, time_min, load, capacity, range, priority, time) for a route given as
+        matrix indices; the last four are the raw penalty terms. Allocates no dicts."""
+        depot = self.depot_idx
+        if route_idx:
+            seq = np.fromiter(route_idx, dtype=np.int64, count=len(route_idx))
+            distance_km = float(
+                self.km[depot, seq[0]] + self.km[seq[:-1], seq[1:]].sum() + self.km[seq[-1], depot]
+            )
+        else:
+            distance_km = float(self.km[depot, depot]) * 2
+        service = self._service
+        load = 0.0
+        service_min = 0.0
+        priority = 0.0
+        coef = self._coef
+        demand = self._demand
+        for pos, i in enumerate(route_idx):
+            load += demand[i]
+            service_min += service[i]
+            priority += coef[i] * pos
+        time_min = distance_km * self.minutes_per_km + service_min
+
+        vrp = self.vrp
+        capacity_pen = load - vrp.vehicle_capacity if load > vrp.vehicle_capacity else 0.0
+        range_pen = distance_km - vrp.vehicle_range_km if distance_km > vrp.vehicle_range_km else 0.0
+        time_pen = 0.0
+        if self.work_window is not None:
+            work_start, work_end = self.work_window
+            clock = work_start
+            depot_minutes, w_start, w_end = self._depot_minutes, self._w_start, self._w_end
+            for i in route_idx:
+                arrive = clock + depot_minutes[i]
+                ws = w_start[i]
+                if ws is not None and arrive < ws:
+                    arrive = ws
+                we = w_end[i]
+                if we is not None and arrive > we:
+                    time_pen += arrive - we
+                clock = arrive + service[i]
+            if clock > work_end:
+                time_pen += clock - work_end
+        return distance_km, time_min, load, capacity_pen, range_pen, priority, time_pen
+
+    def route_metrics(self, route: Sequence[int]) -> RouteMetrics:
+        """Same result as ``compute_route_metrics`` for a route of node ids."""
+        distance_km, time_min, load, cap, rng, prio, late = self.route_values(
+            [self.index[nid] for nid in route]
+        )
+        return RouteMetrics(
+            sequence=[self.depot_id] + list(route) + [self.depot_id],
+            distance_km=distance_km,
+            time_min=time_min,
+            load=load,
+            penalties={"capacity": cap, "range": rng, "priority": prio, "time": late},
+        )
+
+    def route_cost(self, route: Sequence[int], weights: WeightParams) -> float:
+        """Weighted fitness contribution of one route of node ids."""
+        return self.route_cost_indices([self.index[nid] for nid in route], weights)
+
+    def route_cost_indices(self, route_idx: Sequence[int], weights: WeightParams) -> float:
+        """``route_cost`` for a route given as matrix indices."""
+        distance_km, _, _, cap, rng, prio, late = self.route_values(route_idx)
+        return (
+            weights.w_distance * distance_km
+            + weights.w_capacity * cap
+            + weights.w_range * rng
+            + weights.w_priority * prio
+            + weights.w_time * late
+        )
+
+    def fitness(self, permutation: Sequence[int], weights: WeightParams) -> float:
+        """Scalar fitness of a permutation: no RouteMetrics, no penalty dicts."""
+        distance = capacity = range_pen = priority = late = 0.0
+        index = self.index
+        for route in self.split(permutation, weights):
+            d, _, _, cap, rng, prio, tw = self.route_values([index[nid] for nid in route])
+            distance += d
+            capacity += cap
+            range_pen += rng
+            priority += prio
+            late += tw
+        return (
+            weights.w_distance * distance
+            + weights.w_capacity * capacity
+            + weights.w_range * range_pen
+            + weights.w_priority * priority
+            + weights.w_time * late
+        )
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import multiprocessing
+import random
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .distance import DistanceMatrix
+from .fitness import evaluate_individual
+from .ga import GAResult, GeneticAlgorithm, Individual, stop_criterion
+from .instance import ProblemInstance
+from .resequence import RouteResequencer
+from .vrp import GAParams, IslandParams, Node, VRPParams, WeightParams
+
+TOPOLOGIES = ("ring", "random")
+
+
+@dataclass
+class IslandReport:
+    """What one island sends back after a migration interval."""
+
+    convergence: List[float]
+    emigrants: List[Individual]
+    best_individual: Individual | None
+    best_fitness: float
+    done: bool
+    cache_hits: int
+    cache_misses: int
+    # Full fitness evaluations, counted against max_evaluations
+    evaluations: int
+    # Duration (s) of the island's last generation
+    last_step: float = 0.0
+
+
+class Island:
+    """One sub-population evolved by its own ``GeneticAlgorithm``.
+
+    The island keeps its own copy of the global ``random`` state and swaps it in only
+    while advancing, so islands run in one process or in many give the same results.
+    """
+
+    def __init__(
+        self,
+        nodes_map: Dict[int, Node],
+        depot: Node,
+        ga_params: GAParams,
+        vrp_params: VRPParams,
+        weights: WeightParams,
+        distances: DistanceMatrix | None,
+        base_orders: List[Sequence[int]],
+        migrants: int,
+    ) -> None:
+        self.ga = GeneticAlgorithm(nodes_map, depot, ga_params, vrp_params, weights, distances)
+        self.population = self.ga.new_population(base_orders)
+        self.rng_state = random.getstate()
+        self.migrants = migrants
+        self.generation = 0
+        self.stagnant = 0
+        self.best_individual: Individual | None = None
+        self.best_fitness = float("inf")
+        self.emigrants: List[Individual] = []
+        self.done = False
+        self.last_step = 0.0
+
+    def advance(
+        self, generations: int, immigrants: List[Individual], deadline: float | None = None
+    ) -> IslandReport:
+        """Replace the last offspring with ``immigrants`` and evolve up to ``generations``,
+        without starting a generation that would end after ``deadline`` (``time.time()``)."""
+        params = self.ga.ga
+        convergence: List[float] = []
+        saved = random.getstate()
+        random.setstate(self.rng_state)
+        try:
+            if immigrants and not self.done:
+                keep = max(len(self.population) - len(immigrants), params.elitism)
+                if isinstance(self.population, np.ndarray):
+                    incoming = np.asarray(immigrants, dtype=self.population.dtype)
+                    self.population = np.concatenate([self.population[:keep], incoming])
+                else:
+                    self.population = self.population[:keep] + [list(indiv) for indiv in immigrants]
+                self.population = self.population[: params.population_size]
+            for _ in range(generations):
+                if self.done or self.generation >= params.generations:
+                    self.done = True
+                    break
+                step_started = time.time()
+                # The first generation always runs so there is a best-so-far to report
+                if deadline is not None and self.generation and step_started + self.last_step > deadline:
+                    break
+                evaluated = self.population
+                self.population, fitness_vals, _ = self.ga.evolve(self.population)
+                order = sorted(range(len(fitness_vals)), key=lambda i: fitness_vals[i])
+                gen_best_fit = fitness_vals[order[0]]
+                if gen_best_fit < self.best_fitness:
+                    self.best_fitness = gen_best_fit
+                    self.best_individual = list(map(int, evaluated[order[0]]))
+                    self.stagnant = 0
+                else:
+                    self.stagnant += 1
+                convergence.append(gen_best_fit)
+                self.emigrants = [list(map(int, evaluated[i])) for i in order[: self.migrants]]
+                self.generation += 1
+                self.last_step = time.time() - step_started
+                if self.stagnant >= params.stagnation_patience:
+                    self.done = True
+            if self.generation >= params.generations:
+                self.done = True
+        finally:
+            self.rng_state = random.getstate()
+            random.setstate(saved)
+        return IslandReport(
+            convergence=convergence,
+            emigrants=self.emigrants,
+            best_individual=self.best_individual,
+            best_fitness=self.best_fitness,
+            done=self.done,
+            cache_hits=self.ga.cache_hits,
+            cache_misses=self.ga.cache_misses,
+            evaluations=self.ga.evaluations,
+            last_step=self.last_step,
+        )
+
+    def close(self) -> None:
+        self.ga.close()
+
+
+def _island_process(conn, args: tuple) -> None:
+    """Worker loop: build one island, then answer ``(generations, immigrants)`` requests."""
+    try:
+        island = Island(*args)
+    except Exception as exc:  # reported to the parent on the first request
+        island, error = None, exc
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        try:
+            conn.send(island.advance(*message) if island is not None else error)
+        except Exception as exc:
+            conn.send(exc)
+    if island is not None:
+        island.close()
+    conn.close()
+
+
+class _RemoteIsland:
+    """``Island`` living in its own process; ``send``/``receive`` let all islands run at once."""
+
+    def __init__(self, args: tuple) -> None:
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_island_process, args=(child, args), daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, generations: int, immigrants: List[Individual], deadline: float | None = None) -> None:
+        self.conn.send((generations, immigrants, deadline))
+
+    def receive(self) -> IslandReport:
+        report = self.conn.recv()
+        if isinstance(report, Exception):
+            raise report
+        return report
+
+    def close(self) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+class IslandModel:
+    """Island-model GA: ``count`` sub-populations evolving in parallel with migration.
+
+    Every ``migration_interval`` generations each island sends its ``migrants`` best
+    individuals to a neighbour (``ring``) or to a randomly drawn island (``random``),
+    where they replace the last offspring. ``run`` returns a ``GAResult`` like
+    ``GeneticAlgorithm.run``, with the per-generation best over all islands as the
+    convergence trace. The time limit is a shared deadline every island honours; the
+    evaluation budget and target fitness are checked between migrations.
+    """
+
+    def __init__(
+        self,
+        nodes_map: Dict[int, Node],
+        depot: Node,
+        ga_params: GAParams,
+        vrp_params: VRPParams,
+        weights: WeightParams,
+        islands: IslandParams,
+        distances: DistanceMatrix | None = None,
+    ) -> None:
+        if islands.count < 1:
+            raise ValueError("Island count must be at least 1")
+        if islands.topology not in TOPOLOGIES:
+            raise ValueError(f"Unsupported topology {islands.topology}")
+        self.nodes_map = nodes_map
+        self.depot = depot
+        self.ga = ga_params
+        self.vrp = vrp_params
+        self.weights = weights
+        self.islands = islands
+        self.distances = distances if distances is not None else DistanceMatrix.from_nodes(nodes_map)
+
+    def island_params(self, index: int) -> GAParams:
+        """GA settings of one island: own seed, serial evaluation, then configured overrides."""
+        seed = self.ga.seed + index if self.ga.seed is not None else None
+        # Islands already occupy the cores; nested worker pools would only oversubscribe them
+        params = replace(self.ga, seed=seed, executor="serial")
+        overrides = self.islands.overrides[index] if index < len(self.islands.overrides) else {}
+        return replace(params, **(overrides or {}))
+
+    def _migrate(self, reports: List[IslandReport], rng: random.Random) -> List[List[Individual]]:
+        count = len(reports)
+        immigrants: List[List[Individual]] = [[] for _ in range(count)]
+        if count < 2:
+            return immigrants
+        for i, report in enumerate(reports):
+            if self.islands.topology == "ring":
+                target = (i + 1) % count
+            else:
+                target = rng.choice([j for j in range(count) if j != i])
+            immigrants[target].extend(report.emigrants)
+        return immigrants
+
+    def run(self, base_orders: List[Sequence[int]]) -> GAResult:
+        count = self.islands.count
+        args = [
+            (
+                self.nodes_map, self.depot, self.island_params(i), self.vrp, self.weights,
+                self.distances, base_orders, self.islands.migrants,
+            )
+            for i in range(count)
+        ]
+        if self.islands.processes:
+            islands = [_RemoteIsland(a) for a in args]
+        else:
+            islands = [Island(*a) for a in args]
+        rng = random.Random(self.ga.seed)
+        interval = max(1, self.islands.migration_interval)
+        immigrants: List[List[Individual]] = [[] for _ in range(count)]
+        convergence: List[float] = []
+        generation = 0
+        stop_reason = "generations"
+        started = time.time()
+        deadline = started + self.ga.time_limit_s if self.ga.time_limit_s is not None else None
+        try:
+            while generation < self.ga.generations:
+                step = min(interval, self.ga.generations - generation)
+                if self.islands.processes:
+                    for island, incoming in zip(islands, immigrants):
+                        island.send(step, incoming, deadline)
+                    reports = [island.receive() for island in islands]
+                else:
+                    reports = [
+                        island.advance(step, incoming, deadline) for island, incoming in zip(islands, immigrants)
+                    ]
+                for g in range(step):
+                    values = [r.convergence[g] for r in reports if len(r.convergence) > g]
+                    if values:
+                        convergence.append(min(values))
+                generation += step
+                if all(r.done for r in reports):
+                    if generation < self.ga.generations:
+                        stop_reason = "stagnation"
+                    break
+                limit = stop_criterion(
+                    self.ga,
+                    min(r.best_fitness for r in reports),
+                    sum(r.evaluations for r in reports),
+                    time.time() - started,
+                    max(r.last_step for r in reports),
+                )
+                if limit is not None and generation < self.ga.generations:
+                    stop_reason = limit
+                    break
+                immigrants = self._migrate(reports, rng)
+        finally:
+            for island in islands:
+                island.close()
+
+        best = min(reports, key=lambda r: r.best_fitness)
+        assert best.best_individual is not None
+        best_individual, best_fitness = best.best_individual, best.best_fitness
+        if self.ga.resequence_max_stops > 0:
+            instance = ProblemInstance(self.nodes_map, self.depot, self.vrp, self.distances)
+            resequencer = RouteResequencer(instance, self.weights, self.ga.resequence_max_stops)
+            best_individual, best_fitness = resequencer.improve(best_individual)
+        _, routes = evaluate_individual(
+            best_individual, self.nodes_map, self.depot, self.vrp, self.weights, self.distances
+        )
+        return GAResult(
+            best_individual=best_individual,
+            best_fitness=best_fitness,
+            convergence=convergence,
+            decoded_history=[],
+            cache_hits=sum(r.cache_hits for r in reports),
+            cache_misses=sum(r.cache_misses for r in reports),
+            best_routes=routes,
+            stop_reason=stop_reason,
+        )
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .instance import ProblemInstance
+from .vrp import WeightParams
+
+# Route index -> new stop list (matrix indices) for the routes a move rewrites
+Changes = Dict[int, List[int]]
+EPS = 1e-9
+MAX_SEGMENT = 3
+
+
+class LocalSearch:
+    """First-improvement local search on the routes a permutation decodes to.
+
+    Moves are 2-opt and Or-opt (segments of 1-3 stops) inside a route, plus relocate
+    and swap between routes. Candidates pair each stop with its nearest neighbours and
+    are screened with O(1) distance deltas on the matrix; a screened move is kept only
+    if the exact cost of the routes it rewrites (penalties included) drops. Don't-look
+    bits: a stop is re-examined only after a move changes one of its arcs.
+
+    ``candidates`` (node id -> nearest node ids, e.g. ``SpatialIndex.candidate_lists``)
+    replaces the per-row scan of the distance matrix.
+
+    Under the greedy split a move must also keep every route boundary where
+    ``split_greedy`` cuts (the cut depends on the next route's first stop), so the
+    improved permutation decodes to the same routes.
+    """
+
+    def __init__(
+        self,
+        instance: ProblemInstance,
+        weights: WeightParams,
+        neighbors: int = 10,
+        candidates: Dict[int, List[int]] | None = None,
+    ) -> None:
+        self.instance = instance
+        self.weights = weights
+        self.km = instance.km
+        self.depot = instance.depot_idx
+        self.capacity = instance.vrp.vehicle_capacity
+        self.vehicles = instance.vrp.vehicles
+        self.greedy = instance.vrp.split != "optimal"
+        self.demand = instance._demand
+        # Full permutation fitness evaluations made by improve()
+        self.evaluations = 0
+        if candidates is not None:
+            index = instance.index
+            self.neighbors = {
+                index[nid]: [index[other] for other in near[:neighbors]] for nid, near in candidates.items()
+            }
+        else:
+            self.neighbors = self._neighbor_lists(neighbors)
+
+    def _neighbor_lists(self, k: int) -> Dict[int, List[int]]:
+        """Nearest customers of each customer by matrix rows (when no spatial candidates are given)."""
+        customers = np.array([self.instance.index[nid] for nid in self.instance.customer_ids], dtype=np.int64)
+        k = min(k, len(customers) - 1)
+        if k <= 0:
+            return {int(c): [] for c in customers}
+        lists: Dict[int, List[int]] = {}
+        for c in customers:
+            row = self.km[c, customers]
+            nearest = np.argpartition(row, k)[: k + 1]
+            nearest = nearest[np.argsort(row[nearest], kind="stable")]
+            lists[int(c)] = [int(v) for v in customers[nearest] if v != c][:k]
+        return lists
+
+    def _cost(self, route: Sequence[int]) -> float:
+        return self.instance.route_cost_indices(route, self.weights)
+
+    def improve(self, permutation: Sequence[int]) -> Tuple[List[int], float]:
+        """Improved permutation and its fitness; the input itself if nothing improves."""
+        inst = self.instance
+        before = inst.fitness(permutation, self.weights)
+        self.evaluations += 1
+        routes_ids = inst.split(permutation, self.weights)
+        served = {nid for route in routes_ids for nid in route}
+        dropped = [nid for nid in permutation if nid not in served]
+        routes = [[inst.index[nid] for nid in route] for route in routes_ids]
+        tail = inst.index[dropped[0]] if dropped else None
+        if not self._search(routes, tail):
+            return list(permutation), before
+        node_ids = inst.node_ids
+        candidate = [node_ids[i] for route in routes for i in route] + dropped
+        after = inst.fitness(candidate, self.weights)
+        self.evaluations += 1
+        if after < before - EPS:
+            return candidate, after
+        return list(permutation), before
+
+    def _search(self, routes: List[List[int]], tail: int | None) -> bool:
+        """Apply improving moves to ``routes`` in place; True if any was applied."""
+        demand = self.demand
+        loads = [sum(demand[i] for i in route) for route in routes]
+        costs = [self._cost(route) for route in routes]
+        where: Dict[int, Tuple[int, int]] = {}
+        for r, route in enumerate(routes):
+            for p, i in enumerate(route):
+                where[i] = (r, p)
+
+        active = deque(i for route in routes for i in route)
+        queued = set(active)
+        improved = False
+        while active:
+            u = active.popleft()
+            queued.discard(u)
+            found = self._find_move(u, routes, loads, costs, where, tail)
+            if found is None:
+                continue
+            changes, new_costs, endpoints = found
+            for r, route in changes.items():
+                routes[r] = route
+                loads[r] = sum(demand[i] for i in route)
+                costs[r] = new_costs[r]
+                for p, i in enumerate(route):
+                    where[i] = (r, p)
+            improved = True
+            for i in endpoints:
+                if i != self.depot and i not in queued:
+                    queued.add(i)
+                    active.append(i)
+        return improved
+
+    def _find_move(
+        self,
+        u: int,
+        routes: List[List[int]],
+        loads: List[float],
+        costs: List[float],
+        where: Dict[int, Tuple[int, int]],
+        tail: int | None,
+    ) -> Tuple[Changes, Dict[int, float], List[int]] | None:
+        km = self.km
+        depot = self.depot
+        ru, iu = where[u]
+        route_u = routes[ru]
+        pu = route_u[iu - 1] if iu > 0 else depot
+        nu = route_u[iu + 1] if iu + 1 < len(route_u) else depot
+
+        for v in self.neighbors[u]:
+            if v not in where:
+                continue
+            rv, iv = where[v]
+            route_v = routes[rv]
+            pv = route_v[iv - 1] if iv > 0 else depot
+            nv = route_v[iv + 1] if iv + 1 < len(route_v) else depot
+            same = ru == rv
+
+            # Or-opt / relocate: move u..u+L-1 after v (or in front of v if v starts its route)
+            for length in range(1, MAX_SEGMENT + 1 if same else 2):
+                last_pos = iu + length - 1
+                if last_pos >= len(route_u) or (same and iu <= iv <= last_pos):
+                    break
+                last = route_u[last_pos]
+                nl = route_u[last_pos + 1] if last_pos + 1 < len(route_u) else depot
+                removal = km[pu, nl] - km[pu, u] - km[last, nl]
+                for before in (False, True) if iv == 0 else (False,):
+                    x, y = (pv, v) if before else (v, nv)
+                    if same and (x == last or y == u or (not before and v == pu)):
+                        continue
+                    delta = removal + km[x, u] + km[last, y] - km[x, y]
+                    if delta >= -EPS:
+                        continue
+                    changes = self._relocate(routes, ru, iu, length, rv, iv, before)
+                    move = self._accept(changes, routes, loads, costs, tail)
+                    if move is not None:
+                        return changes, move, [pu, nl, x, y, u, last]
+
+            if same:
+                # 2-opt: reverse the stops between u and v so that they become adjacent
+                i, j = sorted((iu, iv))
+                if j == i + 1:
+                    continue
+                a, b = route_u[i], route_u[j]
+                na = route_u[i + 1]
+                nb = route_u[j + 1] if j + 1 < len(route_u) else depot
+                delta = km[a, b] + km[na, nb] - km[a, na] - km[b, nb]
+                if delta >= -EPS:
+                    continue
+                changes = {ru: route_u[: i + 1] + route_u[i + 1 : j + 1][::-1] + route_u[j + 1 :]}
+                move = self._accept(changes, routes, loads, costs, tail)
+                if move is not None:
+                    return changes, move, [a, na, b, nb]
+            else:
+                # Swap u and v between their routes
+                delta = (
+                    km[pu, v] + km[v, nu] - km[pu, u] - km[u, nu]
+                    + km[pv, u] + km[u, nv] - km[pv, v] - km[v, nv]
+                )
+                if delta >= -EPS:
+                    continue
+                new_u, new_v = list(route_u), list(route_v)
+                new_u[iu], new_v[iv] = v, u
+                changes = {ru: new_u, rv: new_v}
+                move = self._accept(changes, routes, loads, costs, tail)
+                if move is not None:
+                    return changes, move, [pu, nu, pv, nv, u, v]
+        return None
+
+    @staticmethod
+    def _relocate(
+        routes: List[List[int]], ru: int, iu: int, length: int, rv: int, iv: int, before: bool
+    ) -> Changes:
+        segment = routes[ru][iu : iu + length]
+        rest = routes[ru][:iu] + routes[ru][iu + length :]
+        if ru == rv:
+            at = (iv if iv < iu else iv - length) + (0 if before else 1)
+            return {ru: rest[:at] + segment + rest[at:]}
+        at = iv + (0 if before else 1)
+        return {ru: rest, rv: routes[rv][:at] + segment + routes[rv][at:]}
+
+    def _accept(
+        self,
+        changes: Changes,
+        routes: List[List[int]],
+        loads: List[float],
+        costs: List[float],
+        tail: int | None,
+    ) -> Dict[int, float] | None:
+        """Exact route costs of an improving, feasible move, or None to reject it."""
+        demand = self.demand
+        new_loads = {r: sum(demand[i] for i in route) for r, route in changes.items()}
+        for r, route in changes.items():
+            if len(route) > 1 and new_loads[r] > self.capacity and new_loads[r] > loads[r]:
+                return None
+        if self.greedy and not self._split_consistent(changes, new_loads, routes, loads, tail):
+            return None
+        new_costs = {r: self._cost(route) for r, route in changes.items()}
+        if sum(new_costs.values()) >= sum(costs[r] for r in changes) - EPS:
+            return None
+        return new_costs
+
+    def _split_consistent(
+        self,
+        changes: Changes,
+        new_loads: Dict[int, float],
+        routes: List[List[int]],
+        loads: List[float],
+        tail: int | None,
+    ) -> bool:
+        """Would ``split_greedy`` cut the concatenated routes exactly at their boundaries?"""
+        demand = self.demand
+        previous: float | None = None
+        used = 0
+        for r, route in enumerate(routes):
+            route = changes.get(r, route)
+            if not route:
+                continue
+            if previous is not None and previous + demand[route[0]] <= self.capacity:
+                return False
+            previous = new_loads.get(r, loads[r])
+            used += 1
+        if tail is not None:
+            # Dropped stops must still find the fleet exhausted
+            if used < self.vehicles or (previous is not None and previous + demand[tail] <= self.capacity):
+                return False
+        return True
@@ -1,30 +1,129 @@
 from __future__ import annotations
 
 import random
-from typing import List, Sequence
+from typing import List, Mapping, Sequence, Tuple
+
+import numpy as np
 
 Individual = List[int]
+# Inclusive (first, last) positions a mutation changed; used for delta evaluation
+Span = Tuple[int, int]
 
 
-def swap_mutation(individual: Sequence[int]) -> Individual:
+def _swap(individual: Sequence[int]) -> Tuple[Individual, Span]:
     mutant = list(individual)
     i, j = random.sample(range(len(mutant)), 2)
     mutant[i], mutant[j] = mutant[j], mutant[i]
-    return mutant
+    return mutant, (min(i, j), max(i, j))
 
 
-def inversion_mutation(individual: Sequence[int]) -> Individual:
+def _inversion(individual: Sequence[int]) -> Tuple[Individual, Span]:
     mutant = list(individual)
     i, j = sorted(random.sample(range(len(mutant)), 2))
     mutant[i:j] = reversed(mutant[i:j])
-    return mutant
+    return mutant, (i, j - 1)
+
+
+def _neighbor_inversion(individual: Sequence[int], candidates: Mapping[int, Sequence[int]]) -> Tuple[Individual, Span]:
+    mutant = list(individual)
+    pos_u = random.randrange(len(mutant))
+    options = candidates.get(mutant[pos_u])
+    if not options:
+        return _inversion(individual)
+    pos_v = mutant.index(random.choice(options))
+    # Reverse the stops between u and its neighbour v so that v ends up next to u
+    i, j = (pos_u + 1, pos_v + 1) if pos_v > pos_u else (pos_v, pos_u)
+    mutant[i:j] = reversed(mutant[i:j])
+    return mutant, (i, j - 1)
+
+
+def swap_mutation(individual: Sequence[int]) -> Individual:
+    return _swap(individual)[0]
+
+
+def inversion_mutation(individual: Sequence[int]) -> Individual:
+    return _inversion(individual)[0]
+
 
+def mutate_with_span(
+    individual: Sequence[int], method: str, candidates: Mapping[int, Sequence[int]] | None = None
+) -> Tuple[Individual, Span | None]:
+    """Like ``mutate`` but also returns the span of positions that may have changed.
 
-def mutate(individual: Sequence[int], method: str) -> Individual:
+    ``neighbor`` needs ``candidates`` (node id -> nearby node ids, e.g. from
+    ``SpatialIndex.candidate_lists``): it picks a stop and one of its neighbours and
+    makes them adjacent with an inversion.
+    """
     if len(individual) < 2:
-        return list(individual)
+        return list(individual), None
     if method.lower() == "swap":
-        return swap_mutation(individual)
+        return _swap(individual)
     if method.lower() == "inversion":
-        return inversion_mutation(individual)
+        return _inversion(individual)
+    if method.lower() == "neighbor" and candidates is not None:
+        return _neighbor_inversion(individual, candidates)
     raise ValueError(f"Unsupported mutation method: {method}")
+
+
+def mutate(
+    individual: Sequence[int], method: str, candidates: Mapping[int, Sequence[int]] | None = None
+) -> Individual:
+    return mutate_with_span(individual, method, candidates)[0]
+
+
+def random_spans(length: int, count: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """``count`` pairs of distinct positions in ``range(length)`` as (lower, upper) arrays."""
+    a = rng.integers(0, length, size=count)
+    b = rng.integers(0, length - 1, size=count)
+    b += b >= a
+    return np.minimum(a, b), np.maximum(a, b)
+
+
+def swap_rows(population: np.ndarray, rows: np.ndarray, i: np.ndarray, j: np.ndarray) -> None:
+    """Swap genes ``i`` and ``j`` of each selected row, in place."""
+    genes_i = population[rows, i]
+    population[rows, i] = population[rows, j]
+    population[rows, j] = genes_i
+
+
+def inversion_rows(population: np.ndarray, rows: np.ndarray, i: np.ndarray, j: np.ndarray) -> None:
+    """Reverse genes ``i .. j-1`` of each selected row (``i < j``), in place."""
+    cols = np.arange(population.shape[1])
+    inside = (cols >= i[:, None]) & (cols < j[:, None])
+    source = np.where(inside, (i + j - 1)[:, None] - cols, cols)
+    population[rows] = np.take_along_axis(population[rows], source, axis=1)
+
+
+def neighbor_inversion_rows(
+    population: np.ndarray, rows: np.ndarray, table: np.ndarray, rng: np.random.Generator
+) -> None:
+    """``neighbor`` mutation of each selected row, in place; row ``id`` of ``table`` lists
+    the neighbour ids of stop ``id`` (``SpatialIndex.candidate_table``)."""
+    pos_u = rng.integers(0, population.shape[1], size=len(rows))
+    u = population[rows, pos_u]
+    v = table[u, rng.integers(0, table.shape[1], size=len(rows))]
+    pos_v = np.argmax(population[rows] == v[:, None], axis=1)
+    after = pos_v > pos_u
+    inversion_rows(population, rows, np.where(after, pos_u + 1, pos_v), np.where(after, pos_v + 1, pos_u))
+
+
+def mutate_rows(
+    population: np.ndarray,
+    rows: np.ndarray,
+    method: str,
+    rng: np.random.Generator,
+    table: np.ndarray | None = None,
+) -> None:
+    """Vectorized ``mutate`` applied to the given (distinct) rows of a 2D population, in place."""
+    if len(rows) == 0 or population.shape[1] < 2:
+        return
+    if method.lower() == "neighbor" and table is not None and table.shape[1] > 0:
+        neighbor_inversion_rows(population, rows, table, rng)
+        return
+    i, j = random_spans(population.shape[1], len(rows), rng)
+    if method.lower() == "swap":
+        swap_rows(population, rows, i, j)
+    elif method.lower() == "inversion":
+        inversion_rows(population, rows, i, j)
+    else:
+        raise ValueError(f"Unsupported mutation method: {method}")
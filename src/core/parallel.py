@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .batch_fitness import BatchEvaluator
+from .instance import ProblemInstance
+from .vrp import VRPParams, WeightParams
+
+EXECUTORS = ("serial", "threads", "processes")
+# name -> (shared memory block name, shape, dtype string)
+ArraySpec = Dict[str, Tuple[str, Tuple[int, ...], str]]
+
+# Per-process state of a pool worker, set once by _init_worker
+_WORKER: Dict[str, object] = {}
+
+
+class SharedArrays:
+    """Copies named NumPy arrays into ``multiprocessing.shared_memory`` blocks.
+
+    ``specs`` is small and picklable; workers pass it to ``attach`` to get zero-copy
+    views on the same memory. The owner must call ``close`` to release the blocks.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]) -> None:
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.specs: ArraySpec = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def attach(specs: ArraySpec) -> Tuple[Dict[str, np.ndarray], List[shared_memory.SharedMemory]]:
+    """Read-only views on blocks created by ``SharedArrays``; keep the blocks alive while in use.
+
+    Pool workers share their parent's resource tracker, so attaching does not take
+    ownership: the blocks are unlinked once, by ``SharedArrays.close``.
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    blocks: List[shared_memory.SharedMemory] = []
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        view.flags.writeable = False
+        arrays[name] = view
+        blocks.append(block)
+    return arrays, blocks
+
+
+def _scorer(instance: ProblemInstance, weights: WeightParams, engine: str) -> Callable[[Sequence], List[float]]:
+    if engine == "batch":
+        evaluator = BatchEvaluator(instance, weights)
+        return lambda chunk: evaluator.evaluate(np.asarray(chunk)).tolist()
+    return lambda chunk: [instance.fitness(indiv, weights) for indiv in np.asarray(chunk).tolist()]
+
+
+def _init_worker(
+    specs: ArraySpec,
+    vrp: VRPParams,
+    node_ids: List[int],
+    depot_id: int,
+    weights: WeightParams,
+    engine: str,
+) -> None:
+    arrays, blocks = attach(specs)
+    instance = ProblemInstance.from_arrays(vrp, node_ids, depot_id, arrays)
+    _WORKER["blocks"] = blocks
+    _WORKER["score"] = _scorer(instance, weights, engine)
+
+
+def _score_chunk(chunk: Sequence) -> List[float]:
+    return _WORKER["score"](chunk)  # type: ignore[operator]
+
+
+class ParallelEvaluator:
+    """Scores chunks of a population on a thread or process pool.
+
+    Process workers never receive ``nodes_map``: the instance arrays (distance matrix,
+    demand, windows, ...) are published once in shared memory and each worker rebuilds
+    a ``ProblemInstance`` on top of them. Chunks are contiguous and results are joined in
+    submission order, so scores do not depend on scheduling.
+    """
+
+    def __init__(
+        self,
+        instance: ProblemInstance,
+        weights: WeightParams,
+        engine: str,
+        executor: str,
+        workers: int | None = None,
+    ) -> None:
+        if executor not in ("threads", "processes"):
+            raise ValueError(f"Unsupported executor {executor}")
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.shared: SharedArrays | None = None
+        self.pool: Executor
+        if executor == "threads":
+            score = _scorer(instance, weights, engine)
+            self._task: Callable[[Sequence], List[float]] = score
+            self.pool = ThreadPoolExecutor(max_workers=self.workers)
+        else:
+            self.shared = SharedArrays(instance.arrays())
+            self._task = _score_chunk
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.shared.specs, instance.vrp, instance.node_ids, instance.depot_id, weights, engine),
+            )
+
+    def evaluate(self, individuals: Sequence[Sequence[int]]) -> List[float]:
+        if len(individuals) == 0:
+            return []
+        n_chunks = min(self.workers, len(individuals))
+        bounds = np.linspace(0, len(individuals), n_chunks + 1).astype(int)
+        chunks = [
+            np.asarray(individuals[lo:hi], dtype=np.int64)
+            for lo, hi in zip(bounds[:-1], bounds[1:])
+        ]
+        results: List[float] = []
+        for scores in self.pool.map(self._task, chunks):
+            results.extend(scores)
+        return results
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True)
+        if self.shared is not None:
+            self.shared.close()
+            self.shared = None
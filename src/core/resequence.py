@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from .instance import ProblemInstance
+from .vrp import WeightParams
+
+# Largest route Held-Karp is run on: 2^n * n states
+MAX_STOPS = 16
+
+
+def held_karp(
+    km: np.ndarray, depot: int, stops: Sequence[int], coef: Sequence[float], w_distance: float, w_priority: float
+) -> Tuple[List[int], float]:
+    """Order of ``stops`` (matrix indices) minimizing ``w_distance * route km +
+    w_priority * sum(coef[i] * position of i)`` for a route from and back to ``depot``.
+
+    Bitmask dynamic programming over (visited set, last stop), vectorized one subset
+    size at a time: O(2^n * n^2) work in O(n) NumPy steps. Returns the order and its value.
+    """
+    n = len(stops)
+    if n <= 1:
+        return list(stops), (w_distance * (km[depot, stops[0]] + km[stops[0], depot]) if n else 0.0)
+    idx = np.asarray(stops, dtype=np.int64)
+    leg = w_distance * km[np.ix_(idx, idx)].astype(np.float64)
+    place = w_priority * np.asarray(coef, dtype=np.float64)
+    full = 1 << n
+    dp = np.full((full, n), np.inf)
+    parent = np.full((full, n), -1, dtype=np.int64)
+    singles = 1 << np.arange(n)
+    dp[singles, np.arange(n)] = w_distance * km[depot, idx]
+    masks = np.arange(full)
+    size = np.zeros(full, dtype=np.int64)
+    for j in range(n):
+        size += (masks >> j) & 1
+    bit = (masks[:, None] >> np.arange(n)) & 1  # (full, n)
+    for k in range(2, n + 1):
+        layer = masks[size == k]
+        # prev[m, j]: the layer's mask without j; only meaningful where j is in the mask
+        prev = layer[:, None] ^ singles[None, :]
+        # cand[m, i, j]: reach i over prev[m, j], then step i -> j as the k-th stop
+        # dp is infinite wherever i is not in prev, so no further masking is needed
+        cand = dp[prev].transpose(0, 2, 1) + leg[None, :, :]
+        best_i = np.argmin(cand, axis=1)
+        value = np.take_along_axis(cand, best_i[:, None, :], axis=1)[:, 0, :] + place[None, :] * (k - 1)
+        value[bit[layer] == 0] = np.inf
+        dp[layer] = value
+        parent[layer] = best_i
+    total = dp[full - 1] + w_distance * km[idx, depot]
+    last = int(np.argmin(total))
+    order: List[int] = []
+    mask = full - 1
+    while last >= 0:
+        order.append(last)
+        last, mask = int(parent[mask, last]), mask ^ (1 << last)
+    return [int(idx[i]) for i in reversed(order)], float(total.min())
+
+
+class RouteResequencer:
+    """Exact re-ordering of the stops inside each short route.
+
+    Routes with at most ``max_stops`` stops get the order minimizing distance plus the
+    priority penalty (``held_karp``), computed once per stop set and kept in an LRU memo
+    of ``memo_size`` entries. Capacity does not depend on the order; range and time
+    penalties do, so on every call that order is used only when its full route cost is
+    below the cost of the route passed in.
+    """
+
+    def __init__(
+        self, instance: ProblemInstance, weights: WeightParams, max_stops: int = 10, memo_size: int = 100000
+    ) -> None:
+        self.instance = instance
+        self.weights = weights
+        self.max_stops = min(max_stops, MAX_STOPS)
+        self.memo_size = memo_size
+        self.memo: OrderedDict[frozenset, List[int]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Full permutation fitness evaluations made by improve()
+        self.evaluations = 0
+
+    def route(self, route: Sequence[int]) -> List[int]:
+        """Cheaper of ``route`` (node ids) and its Held-Karp order; the route itself when too long."""
+        if len(route) < 3 or len(route) > self.max_stops:
+            return list(route)
+        key = frozenset(route)
+        instance = self.instance
+        if key in self.memo:
+            self.hits += 1
+            self.memo.move_to_end(key)
+            best = self.memo[key]
+        else:
+            self.misses += 1
+            idx = [instance.index[nid] for nid in route]
+            order, _ = held_karp(
+                instance.km, instance.depot_idx, idx, instance.priority_coef[idx],
+                self.weights.w_distance, self.weights.w_priority,
+            )
+            best = [instance.node_ids[i] for i in order]
+            self.memo[key] = best
+            if len(self.memo) > self.memo_size:
+                self.memo.popitem(last=False)
+        if instance.route_cost(best, self.weights) >= instance.route_cost(route, self.weights):
+            return list(route)
+        return list(best)
+
+    def improve(self, permutation: Sequence[int]) -> Tuple[List[int], float]:
+        """Permutation with every short route of its split re-sequenced, and its fitness;
+        the input itself when re-splitting the result does not score better."""
+        instance = self.instance
+        fitness = instance.fitness(permutation, self.weights)
+        self.evaluations += 1
+        routes = instance.split(permutation, self.weights)
+        placed = sum(len(r) for r in routes)
+        candidate = [nid for route in routes for nid in self.route(route)] + list(permutation[placed:])
+        if candidate == list(permutation):
+            return list(permutation), fitness
+        value = instance.fitness(candidate, self.weights)
+        self.evaluations += 1
+        # Re-splitting can cut the new order elsewhere, so only a better score is kept
+        if value < fitness:
+            return candidate, value
+        return list(permutation), fitness
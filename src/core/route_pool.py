@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+from .instance import ProblemInstance
+from .vrp import WeightParams
+
+
+def set_partition(
+    masks: Sequence[int],
+    costs: Sequence[float],
+    universe: int,
+    max_columns: int,
+    upper: float = float("inf"),
+    max_nodes: int = 20000,
+) -> Tuple[List[int] | None, float]:
+    """Cheapest choice of at most ``max_columns`` columns (bitmasks) covering every bit of
+    ``universe`` exactly once, costing less than ``upper``.
+
+    Depth-first branch and bound in the style of Algorithm X: branch on the uncovered bit
+    held by the fewest columns still compatible with the partial cover, trying the
+    cheapest columns first, and prune with the bound "cost so far plus, for every
+    uncovered bit, the smallest per-bit share ``cost / size`` of any column holding it".
+    The search stops after ``max_nodes`` branches, returning the best cover found so
+    far (``None`` when there is none below ``upper``).
+    """
+    # Columns renumbered cheapest first, so scanning a column bitset low to high is cost order
+    order = sorted((c for c, m in enumerate(masks) if m and not m & ~universe), key=lambda c: costs[c])
+    bits_of = [[b for b in range(masks[c].bit_length()) if masks[c] >> b & 1] for c in order]
+    holders = {b: 0 for b in range(universe.bit_length()) if universe >> b & 1}
+    share = dict.fromkeys(holders, float("inf"))
+    for i, (c, bits) in enumerate(zip(order, bits_of)):
+        for b in bits:
+            holders[b] |= 1 << i
+            share[b] = min(share[b], costs[c] / len(bits))
+    if not all(holders.values()):
+        return None, upper
+    conflicts = [0] * len(order)
+    for i, bits in enumerate(bits_of):
+        for b in bits:
+            conflicts[i] |= holders[b]
+    column_share = [sum(share[b] for b in bits) for bits in bits_of]
+
+    best: List[int] | None = None
+    best_cost = upper
+    chosen: List[int] = []
+    nodes = 0
+
+    def search(uncovered: int, compatible: int, cost: float, remaining: float) -> None:
+        nonlocal best, best_cost, nodes
+        if not uncovered:
+            if cost < best_cost:
+                best, best_cost = [order[i] for i in chosen], cost
+            return
+        if len(chosen) >= max_columns or cost + remaining >= best_cost:
+            return
+        # Uncovered bit with the fewest compatible columns; none left means a dead end
+        branch, fewest = 0, -1
+        rest = uncovered
+        while rest:
+            low = rest & -rest
+            options = holders[low.bit_length() - 1] & compatible
+            count = options.bit_count()
+            if count == 0:
+                return
+            if fewest < 0 or count < fewest:
+                branch, fewest = options, count
+            rest ^= low
+        while branch:
+            if nodes >= max_nodes:
+                return
+            nodes += 1
+            low = branch & -branch
+            i = low.bit_length() - 1
+            branch ^= low
+            chosen.append(i)
+            search(
+                uncovered & ~masks[order[i]],
+                compatible & ~conflicts[i],
+                cost + costs[order[i]],
+                remaining - column_share[i],
+            )
+            chosen.pop()
+
+    search(universe, (1 << len(order)) - 1, 0.0, sum(share.values()))
+    return best, best_cost
+
+
+class RoutePool:
+    """Distinct feasible routes seen during a run, keyed by stop set.
+
+    For each set of stops only the cheapest order is kept (cost as in
+    ``ProblemInstance.route_cost``). A route is feasible when it has no capacity, range
+    or time-window penalty; the priority term is part of its cost. When the pool
+    outgrows ``size`` the routes with the highest cost per stop are dropped.
+    """
+
+    def __init__(self, instance: ProblemInstance, weights: WeightParams, size: int = 500) -> None:
+        self.instance = instance
+        self.weights = weights
+        self.size = size
+        self.routes: Dict[frozenset, Tuple[float, List[int]]] = {}
+        self.bits = {nid: i for i, nid in enumerate(instance.customer_ids)}
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+    def cost(self, route: Sequence[int]) -> Tuple[float, bool]:
+        """(weighted cost, feasible) of one route of node ids."""
+        idx = [self.instance.index[nid] for nid in route]
+        distance, _, _, cap, rng, prio, late = self.instance.route_values(idx)
+        w = self.weights
+        cost = w.w_distance * distance + w.w_capacity * cap + w.w_range * rng + w.w_priority * prio + w.w_time * late
+        return cost, cap == 0 and rng == 0 and late == 0
+
+    def add(self, route: Sequence[int]) -> bool:
+        """Keep ``route`` if it is feasible and the cheapest order of its stops so far."""
+        if not route:
+            return False
+        cost, feasible = self.cost(route)
+        key = frozenset(route)
+        if not feasible or (key in self.routes and self.routes[key][0] <= cost):
+            return False
+        self.routes[key] = (cost, list(route))
+        if len(self.routes) > self.size:
+            worst = max(self.routes, key=lambda k: self.routes[k][0] / len(k))
+            del self.routes[worst]
+        return True
+
+    def recombine(
+        self, incumbent: List[List[int]], vehicles: int, max_nodes: int = 20000
+    ) -> Tuple[List[List[int]], float] | None:
+        """Best partition of the customers into at most ``vehicles`` pooled routes that is
+        cheaper than ``incumbent`` (whose routes are candidates too, feasible or not).
+
+        Returns the routes and their total cost, or ``None`` when nothing cheaper is found.
+        """
+        columns: Dict[frozenset, Tuple[float, List[int]]] = dict(self.routes)
+        incumbent = [r for r in incumbent if r]
+        upper = 0.0
+        for route in incumbent:
+            cost, _ = self.cost(route)
+            upper += cost
+            key = frozenset(route)
+            if key not in columns or columns[key][0] > cost:
+                columns[key] = (cost, list(route))
+        universe = (1 << len(self.bits)) - 1
+        covered = sum(1 << self.bits[nid] for route in incumbent for nid in route)
+        if covered != universe or sum(len(r) for r in incumbent) != len(self.bits):
+            # The incumbent drops or repeats stops: any exact cover is an improvement
+            upper = float("inf")
+        entries = list(columns.values())
+        masks = [sum(1 << self.bits[nid] for nid in route) for _, route in entries]
+        # Tiny tolerance so that re-finding the incumbent's cost does not count as a gain
+        chosen, total = set_partition(
+            masks, [cost for cost, _ in entries], universe, vehicles, upper - 1e-9, max_nodes
+        )
+        if chosen is None:
+            return None
+        return [entries[c][1] for c in chosen], total
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import heapq
 import random
+from bisect import bisect_left
+from itertools import accumulate
 from typing import List, Sequence, Tuple
 
+import numpy as np
+
 Individual = Sequence[int]
 
+METHODS = ("tournament", "roulette", "sus")
+
 
 def tournament_selection(population: List[Individual], fitness: List[float], k: int = 3) -> Individual:
     """Select best of k random individuals (lower fitness is better)."""
@@ -14,10 +21,8 @@ def tournament_selection(population: List[Individual], fitness: List[float], k:
 
 
 def roulette_selection(population: List[Individual], fitness: List[float]) -> Individual:
-    """Roulette selection on inverted fitness (lower is better)."""
-    max_fit = max(fitness)
-    # Avoid division by zero: shift values up
-    adjusted = [max_fit - f + 1e-6 for f in fitness]
+    """Roulette selection on inverted fitness (lower is better); O(n) per pick, see ``ParentSampler``."""
+    adjusted = _roulette_weights(fitness)
     total = sum(adjusted)
     pick = random.uniform(0, total)
     current = 0.0
@@ -42,3 +47,118 @@ def select_pair(
             roulette_selection(population, fitness),
         )
     raise ValueError(f"Unsupported selection method: {method}")
+
+
+def _roulette_weights(fitness: Sequence[float]) -> List[float]:
+    max_fit = max(fitness)
+    # Avoid division by zero: shift values up
+    return [max_fit - f + 1e-6 for f in fitness]
+
+
+class ParentSampler:
+    """Parent indices for one generation, drawn with the ``random`` module.
+
+    Roulette weights are accumulated once per generation and each pick is a binary
+    search, avoiding the O(n) scan of ``roulette_selection``. Picks match it only up to
+    floating-point rounding: the running total is not summed the same way as ``sum()``.
+    Stochastic universal sampling (``sus``) places ``count`` evenly spaced pointers
+    from one random offset and serves them in shuffled order.
+    """
+
+    def __init__(self, fitness: Sequence[float], method: str, tournament_k: int = 3, count: int = 0) -> None:
+        if method not in METHODS:
+            raise ValueError(f"Unsupported selection method: {method}")
+        self.fitness = fitness
+        self.method = method
+        self.k = tournament_k
+        self._order = range(len(fitness))
+        if method != "tournament":
+            self._cumulative = list(accumulate(_roulette_weights(fitness)))
+        self._queue: List[int] = []
+        if method == "sus" and count > 0:
+            total = self._cumulative[-1]
+            step = total / count
+            start = random.uniform(0, step)
+            last = len(fitness) - 1
+            self._queue = [min(bisect_left(self._cumulative, start + i * step), last) for i in range(count)]
+            random.shuffle(self._queue)
+
+    def pick(self) -> int:
+        if self.method == "tournament":
+            return min(random.sample(self._order, self.k), key=self.fitness.__getitem__)
+        if self.method == "sus" and self._queue:
+            return self._queue.pop()
+        cumulative = self._cumulative
+        return min(bisect_left(cumulative, random.uniform(0, cumulative[-1])), len(cumulative) - 1)
+
+    def pair(self) -> Tuple[int, int]:
+        return self.pick(), self.pick()
+
+
+def elite_positions(fitness: Sequence[float], count: int) -> List[int]:
+    """Indices of the ``count`` best individuals, best first (ties by position), without a full sort."""
+    return heapq.nsmallest(count, range(len(fitness)), key=fitness.__getitem__)
+
+
+def elite_indices(fitness: np.ndarray, count: int) -> np.ndarray:
+    """``np.argsort(fitness, kind="stable")[:count]`` via a partial sort."""
+    n = len(fitness)
+    if count <= 0:
+        return np.empty(0, dtype=np.int64)
+    if count >= n:
+        return np.argsort(fitness, kind="stable")
+    threshold = np.partition(fitness, count - 1)[count - 1]
+    # All ties at the threshold stay candidates so the stable order decides among them
+    candidates = np.flatnonzero(fitness <= threshold)
+    return candidates[np.argsort(fitness[candidates], kind="stable")[:count]]
+
+
+def tournament_indices(fitness: np.ndarray, k: int, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Winners of ``count`` independent k-tournaments, each over distinct contenders.
+
+    When repeats are rare (``k * k <= n / 2``, so at most about a quarter of the rows) all
+    k-tuples are drawn in one call and the rows with a repeated contender are redrawn;
+    otherwise each row takes the k smallest of n random keys, which is distinct by design.
+    """
+    n = len(fitness)
+    k = min(k, n)
+    if 2 * k * k > n:
+        contenders = np.argpartition(rng.random((count, n)), k - 1, axis=1)[:, :k]
+        return contenders[np.arange(count), np.argmin(fitness[contenders], axis=1)]
+    contenders = rng.integers(0, n, size=(count, k))
+    while k > 1:
+        ordered = np.sort(contenders, axis=1)
+        repeated = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+        if len(repeated) == 0:
+            break
+        contenders[repeated] = rng.integers(0, n, size=(len(repeated), k))
+    return contenders[np.arange(count), np.argmin(fitness[contenders], axis=1)]
+
+
+def roulette_indices(fitness: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """``count`` roulette picks on inverted fitness, with the weights of ``roulette_selection``."""
+    cumulative = np.cumsum(fitness.max() - fitness + 1e-6)
+    picks = rng.random(count) * cumulative[-1]
+    return np.minimum(np.searchsorted(cumulative, picks, side="left"), len(fitness) - 1)
+
+
+def sus_indices(fitness: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Stochastic universal sampling on the roulette weights, returned in shuffled order."""
+    cumulative = np.cumsum(fitness.max() - fitness + 1e-6)
+    step = cumulative[-1] / count
+    pointers = rng.uniform(0, step) + step * np.arange(count)
+    picks = np.minimum(np.searchsorted(cumulative, pointers, side="left"), len(fitness) - 1)
+    return rng.permutation(picks)
+
+
+def select_indices(
+    fitness: np.ndarray, method: str, tournament_k: int, count: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Indices of ``count`` selected parents, drawn in one vectorized step."""
+    if method == "tournament":
+        return tournament_indices(fitness, tournament_k, count, rng)
+    if method == "roulette":
+        return roulette_indices(fitness, count, rng)
+    if method == "sus":
+        return sus_indices(fitness, count, rng)
+    raise ValueError(f"Unsupported selection method: {method}")
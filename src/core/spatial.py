@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from .distance import EARTH_RADIUS_KM
+
+LEAF_SIZE = 32
+
+
+def unit_vectors(lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+    """(n, 3) points on the unit sphere; chord length grows monotonically with
+    great-circle distance, so Euclidean neighbours are great-circle neighbours."""
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lon = np.radians(np.asarray(lons, dtype=np.float64))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def chord_to_km(chord: np.ndarray | float) -> np.ndarray | float:
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0.0, 1.0))
+
+
+class KDTree:
+    """Static KD-tree over 3D points: median splits on the widest axis, leaves of at
+    most ``leaf_size`` points, and a bounding box per node for pruning."""
+
+    def __init__(self, points: np.ndarray, leaf_size: int = LEAF_SIZE) -> None:
+        self.points = np.asarray(points, dtype=np.float64)
+        n = len(self.points)
+        self.order = np.arange(n)
+        self.start: List[int] = []
+        self.stop: List[int] = []
+        self.children: List[tuple] = []
+        box_min: List[np.ndarray] = []
+        box_max: List[np.ndarray] = []
+        pending = [(0, n, self._new_node(0, n, box_min, box_max))] if n else []
+        while pending:
+            lo, hi, node = pending.pop()
+            if hi - lo <= leaf_size:
+                continue
+            idx = self.order[lo:hi]
+            dim = int(np.argmax(box_max[node] - box_min[node]))
+            mid = (lo + hi) // 2
+            self.order[lo:hi] = idx[np.argpartition(self.points[idx, dim], mid - lo)]
+            left = self._new_node(lo, mid, box_min, box_max)
+            right = self._new_node(mid, hi, box_min, box_max)
+            self.children[node] = (left, right)
+            pending.extend([(lo, mid, left), (mid, hi, right)])
+        self.box_min = np.array(box_min).reshape(-1, 3)
+        self.box_max = np.array(box_max).reshape(-1, 3)
+
+    def _new_node(self, lo: int, hi: int, box_min: List[np.ndarray], box_max: List[np.ndarray]) -> int:
+        pts = self.points[self.order[lo:hi]]
+        box_min.append(pts.min(axis=0))
+        box_max.append(pts.max(axis=0))
+        self.start.append(lo)
+        self.stop.append(hi)
+        self.children.append(())
+        return len(self.start) - 1
+
+    def _box_distance(self, a: int, b: int) -> float:
+        gap = np.maximum(0.0, np.maximum(self.box_min[a] - self.box_max[b], self.box_min[b] - self.box_max[a]))
+        return float(np.sqrt(gap @ gap))
+
+    def knn(self, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Chord distances and indices of every point's ``k`` nearest other points, nearest first.
+
+        Queries are answered a leaf at a time: all points of a leaf share one best-first
+        traversal, pruned by the box distance to the leaf against their worst k-th distance.
+        """
+        n = len(self.points)
+        k = min(k, n - 1)
+        dist = np.full((n, max(k, 0)), np.inf)
+        index = np.full((n, max(k, 0)), -1, dtype=np.int64)
+        if k <= 0:
+            return dist, index
+        for leaf, kids in enumerate(self.children):
+            if kids:
+                continue
+            queries = self.order[self.start[leaf] : self.stop[leaf]]
+            q = self.points[queries]
+            best_d = np.full((len(queries), k), np.inf)
+            best_i = np.full((len(queries), k), -1, dtype=np.int64)
+            heap = [(0.0, 0)]
+            while heap:
+                bound, node = heapq.heappop(heap)
+                if bound > best_d.max():
+                    break
+                if self.children[node]:
+                    for child in self.children[node]:
+                        heapq.heappush(heap, (self._box_distance(leaf, child), child))
+                    continue
+                members = self.order[self.start[node] : self.stop[node]]
+                diff = q[:, None, :] - self.points[members][None, :, :]
+                d = np.sqrt(np.einsum("qmd,qmd->qm", diff, diff))
+                d[queries[:, None] == members[None, :]] = np.inf
+                cand_d = np.hstack([best_d, d])
+                cand_i = np.hstack([best_i, np.broadcast_to(members, d.shape)])
+                keep = np.argpartition(cand_d, k - 1, axis=1)[:, :k]
+                best_d = np.take_along_axis(cand_d, keep, axis=1)
+                best_i = np.take_along_axis(cand_i, keep, axis=1)
+            # Nearest first, ties by index
+            ranked = np.lexsort((best_i, best_d), axis=1)
+            dist[queries] = np.take_along_axis(best_d, ranked, axis=1)
+            index[queries] = np.take_along_axis(best_i, ranked, axis=1)
+        return dist, index
+
+
+class SpatialIndex:
+    """Great-circle nearest neighbours of stops, without a dense distance matrix.
+
+    Stops are projected to 3D unit vectors and indexed in a ``KDTree``; neighbour lists
+    are computed once per ``k`` and cached. Memory is O(n * k).
+    """
+
+    def __init__(self, node_ids: Sequence[int], lats: Sequence[float], lons: Sequence[float]) -> None:
+        self.node_ids = [int(nid) for nid in node_ids]
+        self.vectors = unit_vectors(lats, lons)
+        self.tree = KDTree(self.vectors)
+        self._knn: Dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_nodes(cls, nodes: Mapping[int, object], node_ids: Sequence[int] | None = None) -> "SpatialIndex":
+        ids = list(nodes) if node_ids is None else list(node_ids)
+        return cls(ids, [nodes[nid].lat for nid in ids], [nodes[nid].lon for nid in ids])
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def neighbors(self, k: int) -> np.ndarray:
+        """(n, k) positions of each stop's ``k`` nearest stops, nearest first."""
+        if k not in self._knn:
+            self._knn[k] = self.tree.knn(k)
+        return self._knn[k][1]
+
+    def neighbor_km(self, k: int) -> np.ndarray:
+        """Great-circle distances (km) matching ``neighbors(k)``."""
+        self.neighbors(k)
+        return chord_to_km(self._knn[k][0])
+
+    def candidate_lists(self, k: int) -> Dict[int, List[int]]:
+        """Node id -> node ids of its ``k`` nearest stops, nearest first."""
+        ids = self.node_ids
+        return {ids[i]: [ids[j] for j in row] for i, row in enumerate(self.neighbors(k).tolist())}
+
+    def candidate_table(self, k: int) -> np.ndarray:
+        """``candidate_lists`` as an array whose row ``node_id`` holds that stop's neighbour ids."""
+        ids = np.asarray(self.node_ids, dtype=np.int64)
+        neighbors = self.neighbors(k)
+        table = np.zeros((int(ids.max()) + 1 if len(ids) else 0, neighbors.shape[1]), dtype=np.int64)
+        table[ids] = ids[neighbors]
+        return table
+
+    def nearest_to(self, lat: float, lon: float) -> int:
+        """Position of the stop closest to a point (a linear scan, for one-off queries)."""
+        diff = self.vectors - unit_vectors([lat], [lon])
+        return int(np.argmin(np.einsum("nd,nd->n", diff, diff)))
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, List, Sequence, Tuple
 
-from .distance import haversine, route_distance
+from .distance import DistanceMatrix, haversine, route_distance
 
 
 @dataclass
@@ -55,6 +55,77 @@ class GAParams:
     elitism: int
     stagnation_patience: int
     seed: int | None = None
+    fitness_engine: str = "individual"
+    fitness_cache_size: int = 10000
+    keep_decoded: bool = False
+    executor: str = "serial"
+    workers: int | None = None
+    population_backend: str = "list"
+    local_search: str = "none"
+    local_search_rate: float = 0.1
+    local_search_neighbors: int = 10
+    mutation_neighbors: int = 10
+    time_limit_s: float | None = None
+    max_evaluations: int | None = None
+    target_fitness: float | None = None
+    checkpoint_path: str | None = None
+    checkpoint_every: int = 10
+    deduplicate: bool = False
+    dedup_mutations: int = 3
+    restart_diversity: float = 0.0
+    restart_fraction: float = 0.5
+    # Construction heuristic -> number of seed tours (see heuristics.seed_orders)
+    seeding: Dict[str, int] = field(default_factory=lambda: {"nearest_neighbor": 1})
+    seed_regret_k: int = 3
+    seed_noise: float = 0.2
+    # Set-partitioning recombination of pooled routes every N generations (0 = off)
+    route_pool_every: int = 0
+    route_pool_size: int = 500
+    route_pool_nodes: int = 20000
+    # Held-Karp re-ordering of routes with at most this many stops (0 = off)
+    resequence_max_stops: int = 0
+    resequence_elites: bool = False
+
+
+@dataclass
+class SAParams:
+    max_iterations: int = 200000
+    time_limit_s: float = 1.0
+    cooling: str = "geometric"
+    # None: calibrated so an average uphill move is accepted with probability 0.5
+    initial_temperature: float | None = None
+    final_temperature_ratio: float = 1e-3
+    moves: List[str] = field(default_factory=lambda: ["swap", "inversion", "relocate"])
+    seed: int | None = None
+    post_optimize: bool = False
+
+
+@dataclass
+class IslandParams:
+    count: int = 1
+    migration_interval: int = 10
+    migrants: int = 2
+    topology: str = "ring"
+    processes: bool = True
+    # Per-island GAParams overrides (e.g. crossover/mutation/selection), by island index
+    overrides: List[Dict[str, object]] = field(default_factory=list)
+
+
+@dataclass
+class DecompositionParams:
+    enabled: bool = False
+    # kmeans | sweep
+    method: str = "kmeans"
+    # Cluster size in vehicle loads, and the share of it clusters are sized for
+    vehicles_per_cluster: int = 2
+    fill: float = 0.9
+    iterations: int = 10
+    # Nearest centroids compared per stop in each k-means step
+    candidates: int = 8
+    processes: bool = True
+    workers: int | None = None
+    repair_rounds: int = 2
+    repair_neighbors: int = 8
 
 
 @dataclass
@@ -65,6 +136,7 @@ class VRPParams:
     vehicle_speed_kmh: float
     service_time_min: float
     work_time_window: Sequence[str] | None = None
+    split: str = "greedy"
 
 
 @dataclass
@@ -76,6 +148,13 @@ class WeightParams:
     w_time: float
 
 
+@lru_cache(maxsize=None)
+def hhmm_to_minutes(value: str) -> int:
+    """Minutes since midnight for an ``"HH:MM"`` string (parsed once per distinct value)."""
+    hours, minutes = value.strip().split(":")
+    return int(hours) * 60 + int(minutes)
+
+
 def split_routes(
     permutation: Sequence[int],
     nodes_map: Dict[int, Node],
@@ -105,10 +184,14 @@ def compute_route_metrics(
     depot: Node,
     vrp: VRPParams,
     weights: WeightParams,
+    distances: DistanceMatrix | None = None,
 ) -> RouteMetrics:
     sequence = [depot.node_id] + list(route) + [depot.node_id]
-    coords = [nodes_map[idx].coord for idx in sequence]
-    distance_km = route_distance(coords)
+    if distances is not None:
+        distance_km = distances.route_distance(sequence)
+    else:
+        coords = [nodes_map[idx].coord for idx in sequence]
+        distance_km = route_distance(coords)
     # Travel time in minutes + service times
     travel_time_min = distance_km / max(vrp.vehicle_speed_kmh, 1e-6) * 60
     service_time_min = sum(nodes_map[idx].service_time_min for idx in route)
@@ -134,25 +217,29 @@ def compute_route_metrics(
     # Time window penalty (simplified earliest-start schedule)
     if vrp.work_time_window:
         start_str, end_str = vrp.work_time_window
-        work_start = datetime.strptime(start_str, "%H:%M")
-        work_end = datetime.strptime(end_str, "%H:%M")
+        work_start = hhmm_to_minutes(start_str)
+        work_end = hhmm_to_minutes(end_str)
         current_time = work_start
         for idx in route:
             node = nodes_map[idx]
-            travel_minutes = haversine(depot.coord, node.coord) / max(vrp.vehicle_speed_kmh, 1e-6) * 60
-            arrive = current_time + timedelta(minutes=travel_minutes)
+            if distances is not None:
+                leg_km = distances.between(depot.node_id, idx)
+            else:
+                leg_km = haversine(depot.coord, node.coord)
+            travel_minutes = leg_km / max(vrp.vehicle_speed_kmh, 1e-6) * 60
+            arrive = current_time + travel_minutes
             if node.window_start:
-                window_start = datetime.strptime(node.window_start, "%H:%M")
+                window_start = hhmm_to_minutes(node.window_start)
                 if arrive < window_start:
                     arrive = window_start
             if node.window_end:
-                window_end = datetime.strptime(node.window_end, "%H:%M")
+                window_end = hhmm_to_minutes(node.window_end)
                 if arrive > window_end:
-                    penalties["time"] += (arrive - window_end).total_seconds() / 60
-            arrive += timedelta(minutes=node.service_time_min)
+                    penalties["time"] += arrive - window_end
+            arrive += node.service_time_min
             current_time = arrive
         if current_time > work_end:
-            penalties["time"] += (current_time - work_end).total_seconds() / 60
+            penalties["time"] += current_time - work_end
 
     return RouteMetrics(
         sequence=sequence,
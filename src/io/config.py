@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict
 
 import yaml
 
-from src.core.vrp import GAParams, VRPParams, WeightParams, Node
+from src.core.vrp import DecompositionParams, GAParams, IslandParams, Node, SAParams, VRPParams, WeightParams
 
 
 @dataclass
@@ -18,6 +18,10 @@ class Config:
     llm: Dict[str, Any]
     logging: Dict[str, Any]
     output: Dict[str, Any]
+    cache: Dict[str, Any] = field(default_factory=dict)
+    islands: IslandParams = field(default_factory=IslandParams)
+    sa: SAParams = field(default_factory=SAParams)
+    decomposition: DecompositionParams = field(default_factory=DecompositionParams)
 
 
 class ConfigLoader:
@@ -28,6 +32,9 @@ class ConfigLoader:
         vrp_cfg = cfg.get("vrp", {})
         weights_cfg = cfg.get("weights", {})
         depot_cfg = cfg.get("depot", {})
+        islands_cfg = cfg.get("islands") or {}
+        sa_cfg = cfg.get("sa") or {}
+        decomposition_cfg = cfg.get("decomposition") or {}
 
         ga = GAParams(
             population_size=ga_cfg.get("population_size", 100),
@@ -41,6 +48,38 @@ class ConfigLoader:
             elitism=int(ga_cfg.get("elitism", 2)),
             stagnation_patience=int(ga_cfg.get("stagnation_patience", 30)),
             seed=ga_cfg.get("seed"),
+            fitness_engine=ga_cfg.get("fitness_engine", "individual"),
+            fitness_cache_size=int(ga_cfg.get("fitness_cache_size", 10000)),
+            keep_decoded=bool(ga_cfg.get("keep_decoded", False)),
+            executor=str(ga_cfg.get("executor", "serial")).lower(),
+            workers=int(ga_cfg["workers"]) if ga_cfg.get("workers") else None,
+            population_backend=str(ga_cfg.get("population_backend", "list")).lower(),
+            local_search=str(ga_cfg.get("local_search", "none")).lower(),
+            local_search_rate=float(ga_cfg.get("local_search_rate", 0.1)),
+            local_search_neighbors=int(ga_cfg.get("local_search_neighbors", 10)),
+            mutation_neighbors=int(ga_cfg.get("mutation_neighbors", 10)),
+            time_limit_s=float(ga_cfg["time_limit_s"]) if ga_cfg.get("time_limit_s") else None,
+            max_evaluations=int(ga_cfg["max_evaluations"]) if ga_cfg.get("max_evaluations") else None,
+            target_fitness=(
+                float(ga_cfg["target_fitness"]) if ga_cfg.get("target_fitness") is not None else None
+            ),
+            checkpoint_path=str(ga_cfg["checkpoint_path"]) if ga_cfg.get("checkpoint_path") else None,
+            checkpoint_every=int(ga_cfg.get("checkpoint_every", 10)),
+            deduplicate=bool(ga_cfg.get("deduplicate", False)),
+            dedup_mutations=int(ga_cfg.get("dedup_mutations", 3)),
+            restart_diversity=float(ga_cfg.get("restart_diversity", 0.0) or 0.0),
+            restart_fraction=float(ga_cfg.get("restart_fraction", 0.5)),
+            seeding={
+                str(name).lower(): int(count)
+                for name, count in (ga_cfg.get("seeding") or {"nearest_neighbor": 1}).items()
+            },
+            seed_regret_k=int(ga_cfg.get("seed_regret_k", 3)),
+            seed_noise=float(ga_cfg.get("seed_noise", 0.2)),
+            route_pool_every=int(ga_cfg.get("route_pool_every", 0)),
+            route_pool_size=int(ga_cfg.get("route_pool_size", 500)),
+            route_pool_nodes=int(ga_cfg.get("route_pool_nodes", 20000)),
+            resequence_max_stops=int(ga_cfg.get("resequence_max_stops", 0)),
+            resequence_elites=bool(ga_cfg.get("resequence_elites", False)),
         )
         vrp = VRPParams(
             vehicles=int(vrp_cfg.get("vehicles", 3)),
@@ -49,6 +88,7 @@ class ConfigLoader:
             vehicle_speed_kmh=float(vrp_cfg.get("vehicle_speed_kmh", 50)),
             service_time_min=float(vrp_cfg.get("service_time_min", 10)),
             work_time_window=vrp_cfg.get("work_time_window"),
+            split=str(vrp_cfg.get("split", "greedy")).lower(),
         )
         weights = WeightParams(
             w_distance=float(weights_cfg.get("w_distance", 1.0)),
@@ -57,6 +97,38 @@ class ConfigLoader:
             w_priority=float(weights_cfg.get("w_priority", 10.0)),
             w_time=float(weights_cfg.get("w_time", 10.0)),
         )
+        islands = IslandParams(
+            count=int(islands_cfg.get("count", 1)),
+            migration_interval=int(islands_cfg.get("migration_interval", 10)),
+            migrants=int(islands_cfg.get("migrants", 2)),
+            topology=str(islands_cfg.get("topology", "ring")).lower(),
+            processes=bool(islands_cfg.get("processes", True)),
+            overrides=list(islands_cfg.get("overrides") or []),
+        )
+        sa = SAParams(
+            max_iterations=int(sa_cfg.get("max_iterations", 200000)),
+            time_limit_s=float(sa_cfg.get("time_limit_s", 1.0)),
+            cooling=str(sa_cfg.get("cooling", "geometric")).lower(),
+            initial_temperature=(
+                float(sa_cfg["initial_temperature"]) if sa_cfg.get("initial_temperature") is not None else None
+            ),
+            final_temperature_ratio=float(sa_cfg.get("final_temperature_ratio", 1e-3)),
+            moves=list(sa_cfg.get("moves") or ["swap", "inversion", "relocate"]),
+            seed=sa_cfg.get("seed", ga_cfg.get("seed")),
+            post_optimize=bool(sa_cfg.get("post_optimize", False)),
+        )
+        decomposition = DecompositionParams(
+            enabled=bool(decomposition_cfg.get("enabled", False)),
+            method=str(decomposition_cfg.get("method", "kmeans")).lower(),
+            vehicles_per_cluster=int(decomposition_cfg.get("vehicles_per_cluster", 2)),
+            fill=float(decomposition_cfg.get("fill", 0.9)),
+            iterations=int(decomposition_cfg.get("iterations", 10)),
+            candidates=int(decomposition_cfg.get("candidates", 8)),
+            processes=bool(decomposition_cfg.get("processes", True)),
+            workers=int(decomposition_cfg["workers"]) if decomposition_cfg.get("workers") else None,
+            repair_rounds=int(decomposition_cfg.get("repair_rounds", 2)),
+            repair_neighbors=int(decomposition_cfg.get("repair_neighbors", 8)),
+        )
         depot = Node(
             node_id=0,
             name=depot_cfg.get("name", "Deposito"),
@@ -77,4 +149,8 @@ class ConfigLoader:
             llm=cfg.get("llm", {}),
             logging=cfg.get("logging", {}),
             output=cfg.get("output", {}),
+            cache=cfg.get("cache") or {},
+            islands=islands,
+            sa=sa,
+            decomposition=decomposition,
         )
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from src.core.distance import DistanceMatrix, haversine_pairwise
+from src.core.vrp import Node
+
+DEFAULT_CACHE_DIR = "outputs/cache"
+# Rows computed per block while filling the memmap; bounds peak RAM on large networks
+BLOCK_ROWS = 512
+
+
+def dataset_key(nodes: Dict[int, Node]) -> str:
+    """Stable hash of node ids and coordinates."""
+    node_ids = list(nodes)
+    h = hashlib.sha1()
+    h.update(np.asarray(node_ids, dtype=np.int64).tobytes())
+    h.update(np.asarray([nodes[nid].lat for nid in node_ids], dtype=np.float64).tobytes())
+    h.update(np.asarray([nodes[nid].lon for nid in node_ids], dtype=np.float64).tobytes())
+    return h.hexdigest()[:16]
+
+
+def _build(nodes: Dict[int, Node], km_path: Path) -> None:
+    node_ids = list(nodes)
+    lats = np.asarray([nodes[nid].lat for nid in node_ids], dtype=np.float64)
+    lons = np.asarray([nodes[nid].lon for nid in node_ids], dtype=np.float64)
+    n = len(node_ids)
+
+    km_tmp = km_path.with_name(km_path.name + f".{os.getpid()}.tmp")
+    km = np.lib.format.open_memmap(km_tmp, mode="w+", dtype=np.float32, shape=(n, n))
+    for start in range(0, n, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, n)
+        km[start:stop] = haversine_pairwise(lats[start:stop], lons[start:stop], lats, lons)
+    km.flush()
+    del km
+    # Atomic publish: readers never see a partially written matrix
+    os.replace(km_tmp, km_path)
+
+
+def load_distance_matrix(
+    nodes: Dict[int, Node],
+    cache_dir: str | Path | None = DEFAULT_CACHE_DIR,
+) -> DistanceMatrix:
+    """Open the cached float32 distance matrix, building it on a miss.
+
+    The file is ``<cache_dir>/<key>_km.npy`` and is memory-mapped read-only, so repeated
+    runs on the same dataset start without recomputing anything. Travel times are not
+    cached: they are distances scaled by the vehicle speed. ``cache_dir=None`` disables
+    the cache and computes the matrix in memory.
+    """
+    if cache_dir is None:
+        return DistanceMatrix.from_nodes(nodes)
+    directory = Path(cache_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    km_path = directory / f"{dataset_key(nodes)}_km.npy"
+    if not km_path.exists():
+        _build(nodes, km_path)
+    return DistanceMatrix(list(nodes), np.load(km_path, mmap_mode="r"))
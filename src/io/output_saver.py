@@ -30,6 +30,35 @@ def save_log_records(records: List[Dict[str, Any]], path: str | Path) -> None:
             f.write(json.dumps(rec, ensure_ascii=False) + "\n")
 
 
+class JsonlWriter:
+    """Appends one JSON record per line as they arrive, flushing every ``flush_every`` records.
+
+    The file is truncated on open unless ``append`` is set (e.g. when resuming a run).
+    """
+
+    def __init__(self, path: str | Path, flush_every: int = 10, append: bool = False) -> None:
+        self.flush_every = max(flush_every, 1)
+        self._pending = 0
+        mode = "a" if append else "w"
+        self._file = ensure_parent(path).open(mode, encoding="utf-8", buffering=1 << 16)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self._file.flush()
+            self._pending = 0
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
 def save_convergence(convergence: List[float], path: str | Path) -> None:
     p = ensure_parent(path)
     pd.Series(convergence).to_csv(p, index_label="generation", header=["best_fitness"])
@@ -118,6 +118,7 @@ def enrich_route_for_llm(
     depot: Any,
     departure_time: str = "08:00",
     vehicle_speed_kmh: float = 60.0,
+    distances: Optional[Any] = None,
 ) -> Dict[str, Any]:
     """
     Enriquece uma rota com nomes, ETAs acumulativos e detalhes de cada parada.
@@ -128,6 +129,7 @@ def enrich_route_for_llm(
         depot: Node do depósito
         departure_time: Horário de partida (HH:MM)
         vehicle_speed_kmh: Velocidade média para cálculo de ETA
+        distances: DistanceMatrix pré-calculada (opcional) para ETAs por trecho
     
     Returns:
         Dict enriquecido com stops_detail, alerts, e todos os campos necessários
@@ -162,9 +164,13 @@ def enrich_route_for_llm(
         prev_node_id = sequence[i - 1]
         prev_node = nodes_map.get(prev_node_id, depot)
         
-        # Usar distância aproximada (haversine seria melhor, mas usamos estimativa)
-        # O tempo já está calculado na rota, distribuímos proporcionalmente
-        travel_time_min = route.get("time_min", 0) / max(len(sequence) - 2, 1)
+        if distances is not None and prev_node_id in distances and node_id in distances:
+            # Tempo real do trecho a partir da matriz de distâncias
+            leg_km = distances.between(prev_node_id, node_id)
+            travel_time_min = leg_km / vehicle_speed_kmh * 60 if vehicle_speed_kmh > 0 else 0
+        else:
+            # Sem matriz: o tempo já está calculado na rota, distribuímos proporcionalmente
+            travel_time_min = route.get("time_min", 0) / max(len(sequence) - 2, 1)
         
         # Atualizar horário atual
         current_time += timedelta(minutes=travel_time_min)
@@ -402,6 +408,7 @@ def instructions_for_route(
     depot: Any,
     departure_time: str = "08:00",
     vehicle_speed_kmh: float = 60.0,
+    distances: Optional[Any] = None,
 ) -> str:
     """
     Gera instruções detalhadas para um motorista.
@@ -413,6 +420,7 @@ def instructions_for_route(
         depot: Node do depósito
         departure_time: Horário de partida (HH:MM)
         vehicle_speed_kmh: Velocidade média do veículo
+        distances: DistanceMatrix pré-calculada (opcional)
     
     Returns:
         String com instruções formatadas em Markdown
@@ -424,6 +432,7 @@ def instructions_for_route(
         depot=depot,
         departure_time=departure_time,
         vehicle_speed_kmh=vehicle_speed_kmh,
+        distances=distances,
     )
     
     # Tentar usar LLM, se disponível
@@ -619,6 +628,7 @@ def generate_all_instructions(
     depot: Any,
     departure_time: str = "08:00",
     vehicle_speed_kmh: float = 60.0,
+    distances: Optional[Any] = None,
 ) -> str:
     """
     Gera instruções para todos os motoristas em um único documento.
@@ -630,6 +640,7 @@ def generate_all_instructions(
         depot: Node do depósito
         departure_time: Horário de partida
         vehicle_speed_kmh: Velocidade média
+        distances: DistanceMatrix pré-calculada (opcional)
     
     Returns:
         String com todas as instruções consolidadas
@@ -648,6 +659,7 @@ def generate_all_instructions(
             depot=depot,
             departure_time=departure_time,
             vehicle_speed_kmh=vehicle_speed_kmh,
+            distances=distances,
         )
         all_instructions.append(instructions)
         all_instructions.append("\n---\n")
@@ -662,6 +674,7 @@ def navigation_instructions_for_route(
     depot: Any,
     departure_time: str = "08:00",
     vehicle_speed_kmh: float = 60.0,
+    distances: Optional[Any] = None,
 ) -> str:
     """
     Gera instruções de navegação ponto-a-ponto para um motorista.
@@ -673,6 +686,7 @@ def navigation_instructions_for_route(
         depot: Node do depósito
         departure_time: Horário de partida (HH:MM)
         vehicle_speed_kmh: Velocidade média do veículo
+        distances: DistanceMatrix pré-calculada (opcional)
     
     Returns:
         String com instruções de navegação em Markdown
@@ -720,7 +734,9 @@ def navigation_instructions_for_route(
             return llm_response
     
     # Fallback: gerar navegação básica sem LLM
-    return _generate_navigation_fallback(sequence, nodes_map, depot, departure_time, vehicle_speed_kmh)
+    return _generate_navigation_fallback(
+        sequence, nodes_map, depot, departure_time, vehicle_speed_kmh, distances
+    )
 
 
 def _generate_navigation_fallback(
@@ -729,6 +745,7 @@ def _generate_navigation_fallback(
     depot: Any,
     departure_time: str,
     vehicle_speed_kmh: float,
+    distances: Optional[Any] = None,
 ) -> str:
     """Gera instruções de navegação básicas sem LLM."""
     from src.core.distance import haversine
@@ -755,7 +772,11 @@ def _generate_navigation_fallback(
         
         # Calcular distância do trecho
         try:
-            dist = haversine(prev_node.lat, prev_node.lon, node.lat, node.lon)
+            prev_id = getattr(prev_node, "node_id", None)
+            if distances is not None and prev_id in distances and node_id in distances:
+                dist = distances.between(prev_id, node_id)
+            else:
+                dist = haversine(prev_node.coord, node.coord)
         except Exception:
             dist = 0
         
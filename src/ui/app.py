@@ -7,7 +7,7 @@ import subprocess
 import sys
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 # Ensure project root is on sys.path so `import src.*` works when running via streamlit
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -19,11 +19,13 @@ import matplotlib.pyplot as plt
 import streamlit as st
 
 from src.cli import build_solution_json
-from src.core.fitness import evaluate_individual
-from src.core.ga import GeneticAlgorithm
-from src.core.heuristics import nearest_neighbor_order
+from src.core.annealing import SimulatedAnnealing
+from src.core.ga import GenerationSnapshot, GeneticAlgorithm
+from src.core.heuristics import seed_orders
+from src.core.islands import IslandModel
 from src.core.vrp import Node
 from src.io.config import ConfigLoader
+from src.io.distance_cache import DEFAULT_CACHE_DIR, load_distance_matrix
 from src.io.load_data import load_nodes, validate_nodes
 from src.llm.render import LLMClient, instructions_for_route, navigation_instructions_for_route
 
@@ -148,13 +150,19 @@ def plot_convergence_fig(convergence: List[float]) -> bytes:
     return buf.read()
 
 
-def run_optimizer(config_path: str, data_path: str, num_vehicles: Optional[int] = None):
+def run_optimizer(
+    config_path: str,
+    data_path: str,
+    num_vehicles: Optional[int] = None,
+    on_generation: Optional[Callable[[GenerationSnapshot, int], None]] = None,
+):
     """Executa o otimizador GA.
     
     Args:
         config_path: Caminho para o arquivo de configuração YAML
         data_path: Caminho para o arquivo CSV de dados
         num_vehicles: Número de veículos (sobrescreve config se informado)
+        on_generation: Chamado a cada geração com o snapshot e o total de gerações
     """
     cfg = ConfigLoader.load(config_path)
     
@@ -168,16 +176,40 @@ def run_optimizer(config_path: str, data_path: str, num_vehicles: Optional[int]
         raise ValueError("; ".join(errors))
 
     nodes_with_depot = {cfg.depot.node_id: cfg.depot, **nodes}
-    base_orders = [
-        nearest_neighbor_order(
-            [n for n in nodes_with_depot if n != cfg.depot.node_id], nodes_with_depot, cfg.depot
-        )
-    ]
-    ga = GeneticAlgorithm(nodes_with_depot, cfg.depot, cfg.ga, cfg.vrp, cfg.weights)
-    best_indiv, best_fit, convergence, _ = ga.run(base_orders)
-    fitness_val, routes = evaluate_individual(best_indiv, nodes_with_depot, cfg.depot, cfg.vrp, cfg.weights)
+    distances = load_distance_matrix(
+        nodes_with_depot, cfg.cache.get("distance_dir", DEFAULT_CACHE_DIR)
+    )
+    # Sementes da população inicial: mistura configurável de heurísticas construtivas
+    base_orders = seed_orders(
+        cfg.ga.seeding, nodes_with_depot, cfg.depot, cfg.vrp, distances,
+        cfg.ga.seed, cfg.ga.seed_regret_k, cfg.ga.seed_noise,
+    )
+    if cfg.islands.count > 1:
+        # Modelo de ilhas: subpopulações em processos separados com migração periódica
+        result = IslandModel(
+            nodes_with_depot, cfg.depot, cfg.ga, cfg.vrp, cfg.weights, cfg.islands, distances
+        ).run(base_orders)
+    else:
+        ga = GeneticAlgorithm(nodes_with_depot, cfg.depot, cfg.ga, cfg.vrp, cfg.weights, distances)
+        # Progresso geração a geração (barra na UI) em vez de uma chamada bloqueante
+        for snapshot in ga.iterate(base_orders):
+            if on_generation is not None:
+                on_generation(snapshot, cfg.ga.generations)
+        result = ga.result()
+    if cfg.sa.post_optimize:
+        # Pós-otimização do melhor indivíduo com recozimento simulado
+        refined = SimulatedAnnealing(
+            nodes_with_depot, cfg.depot, cfg.sa, cfg.vrp, cfg.weights, distances
+        ).anneal(result.best_individual)
+        if refined.best_fitness < result.best_fitness:
+            result.best_individual = refined.best_individual
+            result.best_fitness = refined.best_fitness
+            result.best_routes = refined.best_routes
+    convergence = result.convergence
+    fitness_val, routes = result.best_fitness, result.best_routes
     solution_json = build_solution_json(routes, convergence, cfg.depot, nodes_with_depot, fitness_val)
-    return solution_json, routes, convergence, cfg
+    solution_json["stop_reason"] = result.stop_reason
+    return solution_json, routes, convergence, cfg, distances
 
 
 def main():
@@ -296,9 +328,20 @@ def main():
             st.error("❌ Selecione um arquivo CSV ou use o padrão.")
             return
         
+        progress = st.progress(0.0, text="Rodando GA...")
+
+        def show_progress(snapshot: GenerationSnapshot, total: int) -> None:
+            progress.progress(
+                min(snapshot.generation / max(total, 1), 1.0),
+                text=f"Geração {snapshot.generation}/{total} · melhor fitness {snapshot.best_fitness:.2f}"
+                f" · {snapshot.elapsed:.1f} s",
+            )
+
         with st.spinner("Rodando GA..."):
             try:
-                solution, routes, convergence, cfg = run_optimizer(config_path, data_path, num_vehicles)
+                solution, routes, convergence, cfg, distances = run_optimizer(
+                    config_path, data_path, num_vehicles, on_generation=show_progress
+                )
             except Exception as e:
                 st.error(f"Erro: {e}")
                 # Limpar arquivo temporário
@@ -306,7 +349,7 @@ def main():
                     os.unlink(temp_file_path)
                 return
 
-        st.success("✅ Otimização concluída!")
+        st.success(f"✅ Otimização concluída! (critério de parada: {solution.get('stop_reason', 'generations')})")
 
         # --- Métricas Globais ---
         gm = solution["global_metrics"]
@@ -358,6 +401,7 @@ def main():
                         depot=cfg.depot,
                         departure_time=cfg.llm.get("departure_time", "08:00"),
                         vehicle_speed_kmh=cfg.vrp.vehicle_speed_kmh,
+                        distances=distances,
                     )
                     st.markdown(instr)
                 except Exception as e:
@@ -373,6 +417,7 @@ def main():
                         depot=cfg.depot,
                         departure_time=cfg.llm.get("departure_time", "08:00"),
                         vehicle_speed_kmh=cfg.vrp.vehicle_speed_kmh,
+                        distances=distances,
                     )
                     st.markdown(nav_instr)
                 except Exception as e:
@@ -4,6 +4,7 @@ from typing import Dict, List
 
 import folium
 
+from src.core.distance import DistanceMatrix
 from src.core.vrp import Node, RouteMetrics
 
 
@@ -28,6 +29,7 @@ def render_map(
     nodes: Dict[int, Node],
     routes: List[RouteMetrics],
     path: str,
+    distances: DistanceMatrix | None = None,
 ) -> None:
     m = folium.Map(location=[depot.lat, depot.lon], zoom_start=4)
     folium.Marker([depot.lat, depot.lon], popup=f"Depot: {depot.name}", icon=folium.Icon(color="black")).add_to(m)
@@ -42,5 +44,8 @@ def render_map(
     for idx, route in enumerate(routes):
         color = COLORS[idx % len(COLORS)]
         coords = [[nodes[nid].lat, nodes[nid].lon] for nid in route.sequence]
-        folium.PolyLine(coords, color=color, weight=4, opacity=0.8).add_to(m)
+        km = distances.route_distance(route.sequence) if distances is not None else route.distance_km
+        folium.PolyLine(
+            coords, color=color, weight=4, opacity=0.8, tooltip=f"V{idx + 1}: {km:.1f} km"
+        ).add_to(m)
     m.save(path)
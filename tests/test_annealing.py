@@ -0,0 +1,52 @@
+import random
+
+from src.core.annealing import SimulatedAnnealing
+from src.core.fitness import evaluate_individual
+from src.core.vrp import Node, SAParams, VRPParams, WeightParams
+
+
+def _problem(split="greedy"):
+    rng = random.Random(8)
+    nodes = {0: Node(0, "Depot", "", -23.5, -46.6, 0, 1)}
+    for i in range(1, 16):
+        nodes[i] = Node(
+            i, f"N{i}", "", -23.5 + rng.uniform(-1, 1), -46.6 + rng.uniform(-1, 1),
+            rng.randint(5, 30), rng.randint(1, 3),
+        )
+    vrp = VRPParams(3, 120, 500, 60, 10, ["08:00", "17:00"], split=split)
+    weights = WeightParams(1.0, 50.0, 50.0, 5.0, 1.0)
+    return nodes, vrp, weights
+
+
+def test_annealing_is_deterministic_and_improves_start():
+    nodes, vrp, weights = _problem()
+    params = SAParams(max_iterations=3000, time_limit_s=0, seed=5)
+    start = list(range(15, 0, -1))
+    first = SimulatedAnnealing(nodes, nodes[0], params, vrp, weights).anneal(start)
+    second = SimulatedAnnealing(nodes, nodes[0], params, vrp, weights).anneal(start)
+    assert first.best_individual == second.best_individual
+    assert first.convergence == second.convergence
+    start_fitness, _ = evaluate_individual(start, nodes, nodes[0], vrp, weights)
+    fitness, routes = evaluate_individual(first.best_individual, nodes, nodes[0], vrp, weights)
+    assert abs(fitness - first.best_fitness) < 1e-6
+    assert first.best_fitness < start_fitness
+    assert len(first.best_routes) == len(routes)
+
+
+def test_annealing_linear_schedule_with_optimal_split():
+    nodes, vrp, weights = _problem("optimal")
+    params = SAParams(max_iterations=500, time_limit_s=0, cooling="linear", moves=["relocate"], seed=1)
+    result = SimulatedAnnealing(nodes, nodes[0], params, vrp, weights).run([list(range(1, 16))])
+    fitness, _ = evaluate_individual(result.best_individual, nodes, nodes[0], vrp, weights)
+    assert abs(fitness - result.best_fitness) < 1e-6
+    assert sorted(result.best_individual) == list(range(1, 16))
+
+
+def test_annealing_reports_the_true_fitness_on_an_overloaded_fleet():
+    nodes, _, weights = _problem()
+    vrp = VRPParams(2, 80, 500, 60, 10, ["08:00", "17:00"])  # the fleet cannot serve everyone
+    for seed in range(6):
+        params = SAParams(max_iterations=1500, time_limit_s=0, seed=seed)
+        result = SimulatedAnnealing(nodes, nodes[0], params, vrp, weights).run([])
+        fitness, _ = evaluate_individual(result.best_individual, nodes, nodes[0], vrp, weights)
+        assert abs(fitness - result.best_fitness) < 1e-6
@@ -0,0 +1,35 @@
+import random
+
+import numpy as np
+
+from src.core.batch_fitness import BatchEvaluator
+from src.core.fitness import evaluate_individual
+from src.core.instance import ProblemInstance
+from src.core.vrp import Node, VRPParams, WeightParams
+
+
+def _instance(with_windows: bool):
+    rng = random.Random(5)
+    nodes = {0: Node(0, "Depot", "", -23.5, -46.6, 0, 1)}
+    for i in range(1, 13):
+        start = f"{rng.randint(8, 11):02d}:00" if with_windows and i % 3 == 0 else None
+        end = f"{rng.randint(9, 14):02d}:30" if i % 4 == 0 else None
+        nodes[i] = Node(
+            i, f"N{i}", "", -23.5 + rng.uniform(-2, 2), -46.6 + rng.uniform(-2, 2),
+            rng.randint(5, 40), rng.randint(1, 3), start, end, rng.randint(0, 20),
+        )
+    vrp = VRPParams(3, 90, 300, 60, 10, ["08:00", "13:00"])
+    weights = WeightParams(1.0, 50.0, 20.0, 5.0, 2.0)
+    return nodes, vrp, weights
+
+
+def test_batch_matches_evaluate_individual():
+    for with_windows in (False, True):
+        nodes, vrp, weights = _instance(with_windows)
+        evaluator = BatchEvaluator(ProblemInstance(nodes, nodes[0], vrp), weights)
+        rng = random.Random(1)
+        population = [rng.sample(range(1, 13), 12) for _ in range(20)]
+        batch = evaluator.evaluate(np.array(population))
+        for indiv, fit in zip(population, batch):
+            expected, _ = evaluate_individual(indiv, nodes, nodes[0], vrp, weights)
+            assert abs(fit - expected) < 1e-6 * max(1.0, abs(expected))
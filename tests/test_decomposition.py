@@ -0,0 +1,89 @@
+import random
+
+from src.core.decomposition import (
+    Decomposition,
+    kmeans_clusters,
+    repair_boundaries,
+    route_cost,
+    sweep_clusters,
+)
+from src.core.spatial import SpatialIndex
+from src.core.vrp import DecompositionParams, GAParams, Node, VRPParams, WeightParams, compute_route_metrics
+
+
+def _problem(n=120):
+    rng = random.Random(8)
+    nodes = {0: Node(0, "Depot", "", -23.5, -46.6, 0, 1)}
+    for i in range(1, n + 1):
+        nodes[i] = Node(
+            i, f"N{i}", "", -23.5 + rng.uniform(-1, 1), -46.6 + rng.uniform(-1, 1),
+            rng.randint(5, 20), rng.randint(1, 3),
+        )
+    vrp = VRPParams(4, 100, 10000, 60, 0, None)
+    weights = WeightParams(1.0, 50.0, 50.0, 5.0, 1.0)
+    ga = GAParams(
+        population_size=20, generations=10, selection="tournament", tournament_k=3,
+        crossover="PMX", crossover_rate=0.8, mutation="inversion", mutation_rate=0.2,
+        elitism=2, stagnation_patience=100, seed=3,
+    )
+    return nodes, vrp, weights, ga
+
+
+def test_clusters_cover_every_stop_within_demand_limit():
+    nodes, _, _, _ = _problem()
+    customers = list(range(1, 121))
+    total = sum(nodes[i].demand for i in customers)
+    for clusters in (
+        kmeans_clusters(customers, nodes, 200, fill=0.9),
+        sweep_clusters(customers, nodes, nodes[0], 180),
+    ):
+        assert sorted(nid for c in clusters for nid in c) == customers
+        assert len(clusters) >= total / 200
+        assert max(sum(nodes[i].demand for i in c) for c in clusters) <= 200
+
+
+def test_repair_moves_only_improve_cost():
+    nodes, vrp, weights, _ = _problem(40)
+    customers = list(range(1, 41))
+    # Two interleaved "clusters": many stops sit next to a stop of the other one
+    routes = [customers[0::2], customers[1::2]]
+
+    def cost(rs):
+        return sum(route_cost(compute_route_metrics(r, nodes, nodes[0], vrp, weights), weights) for r in rs)
+
+    before = cost(routes)
+    moves = repair_boundaries(
+        routes, [0, 1], nodes, nodes[0], vrp, weights, SpatialIndex.from_nodes(nodes, customers), 4, 3
+    )
+    assert moves > 0
+    assert cost(routes) < before
+    assert sorted(routes[0] + routes[1]) == customers
+
+
+def test_decomposition_routes_every_stop_once():
+    nodes, vrp, weights, ga = _problem()
+    for method in ("kmeans", "sweep"):
+        solver = Decomposition(
+            nodes, nodes[0], ga, vrp, weights, DecompositionParams(enabled=True, method=method, processes=False)
+        )
+        result = solver.run()
+        assert solver.cluster_count > 1
+        visited = [nid for r in result.best_routes for nid in r.sequence[1:-1]]
+        assert sorted(visited) == list(range(1, 121))
+        assert sorted(result.best_individual) == list(range(1, 121))
+        total = sum(route_cost(r, weights) for r in result.best_routes)
+        assert abs(total - result.best_fitness) < 1e-6
+        assert len(result.convergence) == 10
+        # Repair only ever lowers the assembled cost below the clusters' own sum
+        assert result.best_fitness <= result.convergence[-1] + 1e-6
+
+
+def test_decomposition_process_pool_matches_serial():
+    nodes, vrp, weights, ga = _problem(60)
+    params = DecompositionParams(enabled=True, vehicles_per_cluster=1)
+    pooled = Decomposition(nodes, nodes[0], ga, vrp, weights, params).run()
+    serial = Decomposition(
+        nodes, nodes[0], ga, vrp, weights, DecompositionParams(enabled=True, vehicles_per_cluster=1, processes=False)
+    ).run()
+    assert pooled.best_individual == serial.best_individual
+    assert pooled.best_fitness == serial.best_fitness
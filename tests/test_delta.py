@@ -0,0 +1,48 @@
+import random
+
+from src.core.delta import DeltaEvaluator
+from src.core.fitness import evaluate_individual
+from src.core.instance import ProblemInstance
+from src.core.mutation import mutate_with_span
+from src.core.vrp import Node, VRPParams, WeightParams
+
+
+def test_delta_matches_full_evaluation():
+    rng = random.Random(11)
+    nodes = {0: Node(0, "Depot", "", -23.5, -46.6, 0, 1)}
+    for i in range(1, 21):
+        nodes[i] = Node(
+            i, f"N{i}", "", -23.5 + rng.uniform(-1, 1), -46.6 + rng.uniform(-1, 1),
+            rng.randint(5, 40), rng.randint(1, 3), None, "11:00" if i % 5 == 0 else None, 10,
+        )
+    vrp = VRPParams(4, 100, 150, 60, 10, ["08:00", "12:00"])
+    weights = WeightParams(1.0, 50.0, 20.0, 5.0, 2.0)
+    evaluator = DeltaEvaluator(ProblemInstance(nodes, nodes[0], vrp), weights)
+    random.seed(4)
+    perm = list(range(1, 21))
+    for _ in range(200):
+        random.shuffle(perm)
+        parent = evaluator.full(perm)
+        child, (lo, hi) = mutate_with_span(perm, random.choice(["swap", "inversion"]))
+        state = evaluator.apply(parent, child, lo, hi)
+        expected, _ = evaluate_individual(child, nodes, nodes[0], vrp, weights)
+        assert abs(state.fitness - expected) < 1e-9
+        assert state.starts == evaluator.full(child).starts
+
+
+def test_delta_rescores_a_lighter_customer_at_the_first_dropped_position():
+    # One vehicle cannot take everyone: position 3 (customer 4) is the first one dropped
+    demands = {1: 10, 2: 10, 3: 10, 4: 10, 5: 5}
+    nodes = {0: Node(0, "Depot", "", -23.5, -46.6, 0, 1)}
+    for i, demand in demands.items():
+        nodes[i] = Node(i, f"N{i}", "", -23.5 + 0.01 * i, -46.6, demand, 1)
+    vrp = VRPParams(1, 35, 10000, 60, 0, None)
+    weights = WeightParams(1.0, 50.0, 50.0, 5.0, 1.0)
+    evaluator = DeltaEvaluator(ProblemInstance(nodes, nodes[0], vrp), weights)
+    parent = evaluator.full([1, 2, 3, 4, 5])
+    assert parent.served == 3
+    child = [1, 2, 3, 5, 4]  # the lighter customer now fits
+    state = evaluator.apply(parent, child, 3, 4)
+    expected, _ = evaluate_individual(child, nodes, nodes[0], vrp, weights)
+    assert state.served == 4
+    assert abs(state.fitness - expected) < 1e-9
@@ -1,4 +1,5 @@
-from src.core.distance import haversine
+from src.core.distance import DistanceMatrix, haversine
+from src.core.vrp import Node
 
 
 def test_haversine_zero():
@@ -9,3 +10,17 @@ def test_haversine_known():
     # Rough distance between São Paulo and Rio de Janeiro ~ 360 km
     d = haversine((-23.5505, -46.6333), (-22.9068, -43.1729))
     assert 340 <= d <= 380
+
+
+def test_distance_matrix_matches_haversine():
+    nodes = {
+        0: Node(0, "Depot", "", -23.5505, -46.6333, 0, 1),
+        7: Node(7, "Rio", "", -22.9068, -43.1729, 10, 1),
+        9: Node(9, "BH", "", -19.9167, -43.9345, 10, 2),
+    }
+    matrix = DistanceMatrix.from_nodes(nodes)
+    for a in nodes:
+        for b in nodes:
+            assert abs(matrix.between(a, b) - haversine(nodes[a].coord, nodes[b].coord)) < 1e-9
+    expected = haversine(nodes[0].coord, nodes[7].coord) + haversine(nodes[7].coord, nodes[9].coord)
+    assert abs(matrix.route_distance([0, 7, 9]) - expected) < 1e-9
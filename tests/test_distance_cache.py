@@ -0,0 +1,33 @@
+import numpy as np
+
+from src.core.distance import haversine
+from src.core.vrp import Node
+from src.io.distance_cache import dataset_key, load_distance_matrix
+
+
+def _nodes():
+    return {
+        0: Node(0, "Depot", "", -23.5505, -46.6333, 0, 1),
+        1: Node(1, "Rio", "", -22.9068, -43.1729, 10, 1),
+        2: Node(2, "BH", "", -19.9167, -43.9345, 10, 2),
+    }
+
+
+def test_cache_builds_then_memory_maps(tmp_path):
+    nodes = _nodes()
+    first = load_distance_matrix(nodes, tmp_path)
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+    second = load_distance_matrix(nodes, tmp_path)
+    assert isinstance(second.km, np.memmap)
+    assert second.km.dtype == np.float32
+    assert np.array_equal(np.asarray(first.km), np.asarray(second.km))
+    expected = haversine(nodes[0].coord, nodes[1].coord)
+    assert abs(second.between(0, 1) - expected) < 1e-3
+
+
+def test_key_depends_on_coordinates():
+    nodes = _nodes()
+    key = dataset_key(nodes)
+    assert key == dataset_key(_nodes())
+    nodes[2].lat += 0.01
+    assert key != dataset_key(nodes)
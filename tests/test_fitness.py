@@ -1,4 +1,5 @@
-from src.core.fitness import evaluate_individual
+from src.core.distance import DistanceMatrix
+from src.core.fitness import evaluate_fitness, evaluate_individual
 from src.core.vrp import Node, VRPParams, WeightParams
 
 
@@ -20,3 +21,32 @@ def test_fitness_penalizes_capacity():
     fitness, routes = evaluate_individual([1, 2], nodes, nodes[0], vrp, weights)
     assert fitness > 0
     assert routes[0].penalties["capacity"] > 0
+
+
+def test_fitness_same_with_distance_matrix():
+    nodes = {
+        0: Node(0, "Depot", "", -23.5, -46.6, 0, 1),
+        1: Node(1, "A", "", -22.9, -43.2, 30, 1, "09:00", "10:00", 15),
+        2: Node(2, "B", "", -19.9, -43.9, 40, 2),
+        3: Node(3, "C", "", -25.4, -49.3, 50, 3, None, "08:30", 10),
+    }
+    vrp = VRPParams(2, 80, 500, 60, 10, ["08:00", "12:00"])
+    weights = WeightParams(1, 10, 5, 2, 3)
+    matrix = DistanceMatrix.from_nodes(nodes)
+    plain, _ = evaluate_individual([3, 1, 2], nodes, nodes[0], vrp, weights)
+    fast, _ = evaluate_individual([3, 1, 2], nodes, nodes[0], vrp, weights, matrix)
+    assert abs(plain - fast) < 1e-6
+
+
+def test_scalar_fitness_matches_decoded_fitness():
+    nodes = {
+        0: Node(0, "Depot", "", -23.5, -46.6, 0, 1),
+        1: Node(1, "A", "", -22.9, -43.2, 30, 1, "09:00", "10:00", 15),
+        2: Node(2, "B", "", -19.9, -43.9, 40, 2),
+        3: Node(3, "C", "", -25.4, -49.3, 50, 3, None, "08:30", 10),
+    }
+    vrp = VRPParams(2, 80, 500, 60, 10, ["08:00", "12:00"])
+    weights = WeightParams(1, 10, 5, 2, 3)
+    for perm in ([3, 1, 2], [1, 2, 3], [2, 3, 1]):
+        decoded, _ = evaluate_individual(perm, nodes, nodes[0], vrp, weights)
+        assert abs(evaluate_fitness(perm, nodes, nodes[0], vrp, weights) - decoded) < 1e-9
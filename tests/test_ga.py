@@ -0,0 +1,296 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.core.fitness import evaluate_individual
+from src.core.ga import PHASES, GeneticAlgorithm
+from src.core.vrp import GAParams, Node, VRPParams, WeightParams
+
+
+def _problem(customers=10):
+    rng = random.Random(3)
+    nodes = {0: Node(0, "Depot", "", -23.5, -46.6, 0, 1)}
+    for i in range(1, customers + 1):
+        nodes[i] = Node(
+            i, f"N{i}", "", -23.5 + rng.uniform(-1, 1), -46.6 + rng.uniform(-1, 1),
+            rng.randint(5, 30), rng.randint(1, 3),
+        )
+    vrp = VRPParams(3, 80, 400, 60, 10, ["08:00", "17:00"])
+    weights = WeightParams(1.0, 50.0, 50.0, 5.0, 1.0)
+    return nodes, vrp, weights
+
+
+def _params(**overrides):
+    params = dict(
+        population_size=30, generations=15, selection="tournament", tournament_k=3,
+        crossover="PMX", crossover_rate=0.7, mutation="swap", mutation_rate=0.2,
+        elitism=2, stagnation_patience=100, seed=7,
+    )
+    params.update(overrides)
+    return GAParams(**params)
+
+
+def test_fitness_cache_counts_repeats_without_changing_result():
+    nodes, vrp, weights = _problem()
+    cached = GeneticAlgorithm(nodes, nodes[0], _params(), vrp, weights).run([])
+    uncached = GeneticAlgorithm(nodes, nodes[0], _params(fitness_cache_size=0), vrp, weights).run([])
+    assert cached.cache_hits > 0
+    assert cached.cache_hits + cached.cache_misses == 30 * 15
+    assert cached.convergence == uncached.convergence
+    assert cached.best_individual == uncached.best_individual
+
+
+def test_best_individual_matches_best_fitness():
+    nodes, vrp, weights = _problem()
+    result = GeneticAlgorithm(nodes, nodes[0], _params(), vrp, weights).run([])
+    fitness, _ = evaluate_individual(result.best_individual, nodes, nodes[0], vrp, weights)
+    assert abs(fitness - result.best_fitness) < 1e-9
+    assert result.best_fitness == min(result.convergence)
+
+
+def test_delta_engine_matches_individual_engine():
+    nodes, vrp, weights = _problem()
+    params = dict(crossover_rate=0.3, mutation="inversion", mutation_rate=0.5, fitness_cache_size=0)
+    individual = GeneticAlgorithm(nodes, nodes[0], _params(**params), vrp, weights).run([])
+    delta = GeneticAlgorithm(
+        nodes, nodes[0], _params(fitness_engine="delta", **params), vrp, weights
+    ).run([])
+    assert delta.best_individual == individual.best_individual
+    assert all(abs(a - b) < 1e-9 for a, b in zip(delta.convergence, individual.convergence))
+
+
+def test_routes_decoded_only_for_best_unless_requested():
+    nodes, vrp, weights = _problem()
+    lazy = GeneticAlgorithm(nodes, nodes[0], _params(), vrp, weights).run([])
+    assert lazy.decoded_history == []
+    assert len(lazy.best_routes) == vrp.vehicles
+    eager = GeneticAlgorithm(nodes, nodes[0], _params(keep_decoded=True), vrp, weights).run([])
+    assert len(eager.decoded_history) == 30
+
+
+@pytest.mark.parametrize("backend", ["list", "array"])
+def test_parallel_executors_match_serial(backend):
+    nodes, vrp, weights = _problem()
+    params = _params(population_backend=backend)
+    serial = GeneticAlgorithm(nodes, nodes[0], params, vrp, weights).run([])
+    for executor in ("threads", "processes"):
+        for engine in ("individual", "batch"):
+            params = _params(
+                population_backend=backend, executor=executor, workers=2, fitness_engine=engine
+            )
+            result = GeneticAlgorithm(nodes, nodes[0], params, vrp, weights).run([])
+            assert result.best_individual == serial.best_individual
+            assert all(abs(a - b) < 1e-9 for a, b in zip(result.convergence, serial.convergence))
+
+
+def test_array_backend_is_deterministic_and_consistent():
+    nodes, vrp, weights = _problem()
+    params = _params(population_backend="array", mutation="inversion", fitness_engine="batch")
+    first = GeneticAlgorithm(nodes, nodes[0], params, vrp, weights).run([])
+    second = GeneticAlgorithm(nodes, nodes[0], params, vrp, weights).run([])
+    assert first.best_individual == second.best_individual
+    assert first.convergence == second.convergence
+    assert sorted(first.best_individual) == list(range(1, 11))
+    fitness, _ = evaluate_individual(first.best_individual, nodes, nodes[0], vrp, weights)
+    assert abs(fitness - first.best_fitness) < 1e-9
+
+    ga = GeneticAlgorithm(nodes, nodes[0], params, vrp, weights)
+    population = ga.new_population([list(range(1, 11))])
+    assert population.dtype == np.int32 and population.shape == (30, 10)
+    offspring, _, _ = ga.evolve(population)
+    assert offspring.shape == population.shape
+    assert (np.sort(offspring, axis=1) == np.arange(1, 11)).all()
+
+
+def test_local_search_modes_keep_results_consistent():
+    nodes, vrp, weights = _problem()
+    plain = GeneticAlgorithm(nodes, nodes[0], _params(), vrp, weights).run([])
+    for backend in ("list", "array"):
+        for mode in ("elites", "offspring"):
+            params = _params(local_search=mode, local_search_rate=0.3, population_backend=backend)
+            result = GeneticAlgorithm(nodes, nodes[0], params, vrp, weights).run([])
+            fitness, _ = evaluate_individual(result.best_individual, nodes, nodes[0], vrp, weights)
+            assert abs(fitness - result.best_fitness) < 1e-9
+            assert result.best_fitness <= plain.best_fitness
+
+
+def test_stop_criteria_return_best_so_far_with_reason():
+    nodes, vrp, weights = _problem()
+    full = GeneticAlgorithm(nodes, nodes[0], _params(), vrp, weights).run([])
+    assert full.stop_reason == "generations" and len(full.convergence) == 15
+
+    target = full.convergence[4]
+    early = GeneticAlgorithm(nodes, nodes[0], _params(target_fitness=target), vrp, weights).run([])
+    assert early.stop_reason == "target_fitness"
+    assert early.best_fitness <= target and early.convergence == full.convergence[: len(early.convergence)]
+
+    budget = GeneticAlgorithm(nodes, nodes[0], _params(max_evaluations=60), vrp, weights).run([])
+    assert budget.stop_reason == "max_evaluations" and len(budget.convergence) < 15
+    # Local search evaluations count against the same budget as offspring
+    params = _params(max_evaluations=60, local_search="offspring", local_search_rate=1.0)
+    ga = GeneticAlgorithm(nodes, nodes[0], params, vrp, weights)
+    searched = ga.run([])
+    assert ga.evaluations > ga.cache_misses
+    assert len(searched.convergence) < len(budget.convergence)
+
+    timed = GeneticAlgorithm(nodes, nodes[0], _params(time_limit_s=1e-9), vrp, weights).run([])
+    assert timed.stop_reason == "time_limit" and len(timed.convergence) == 1
+    fitness, _ = evaluate_individual(timed.best_individual, nodes, nodes[0], vrp, weights)
+    assert abs(fitness - timed.best_fitness) < 1e-9
+
+    stale = GeneticAlgorithm(nodes, nodes[0], _params(stagnation_patience=1), vrp, weights).run([])
+    assert stale.stop_reason == "stagnation"
+
+
+def test_checkpoint_resume_continues_identically(tmp_path):
+    nodes, vrp, weights = _problem()
+    for backend, engine in (("list", "batch"), ("list", "delta"), ("array", "batch")):
+        options = dict(population_backend=backend, fitness_engine=engine, local_search="offspring", local_search_rate=0.3)
+        straight = GeneticAlgorithm(nodes, nodes[0], _params(generations=20, **options), vrp, weights).run([])
+        path = str(tmp_path / f"{backend}_{engine}.npz")
+        params = _params(generations=8, checkpoint_path=path, checkpoint_every=3, **options)
+        first = GeneticAlgorithm(nodes, nodes[0], params, vrp, weights).run([])
+        assert first.convergence == straight.convergence[:8]
+        random.seed(0)  # a fresh process would not share the interrupted run's RNG state
+        resumed_params = _params(generations=20, checkpoint_path=path, **options)
+        resumed = GeneticAlgorithm(nodes, nodes[0], resumed_params, vrp, weights).run([], resume=True)
+        assert resumed.convergence == straight.convergence
+        assert resumed.best_individual == straight.best_individual
+        assert (resumed.cache_hits, resumed.cache_misses) == (straight.cache_hits, straight.cache_misses)
+
+
+def test_checkpoint_resume_keeps_route_pool(tmp_path):
+    nodes, _, weights = _problem(customers=20)
+    vrp = VRPParams(6, 80, 10000, 60, 10, None, "optimal")
+    options = dict(population_backend="array", route_pool_every=2)
+    ga = GeneticAlgorithm(nodes, nodes[0], _params(generations=20, **options), vrp, weights)
+    recombined = [s.stats["recombined"] for s in ga.iterate([])]
+    straight = ga.result()
+    assert sum(recombined[8:]) > 0  # the pool still pays off after the checkpoint
+    path = str(tmp_path / "pool.npz")
+    params = _params(generations=8, checkpoint_path=path, **options)
+    GeneticAlgorithm(nodes, nodes[0], params, vrp, weights).run([])
+    random.seed(0)
+    resumed_params = _params(generations=20, checkpoint_path=path, **options)
+    resumed = GeneticAlgorithm(nodes, nodes[0], resumed_params, vrp, weights).run([], resume=True)
+    assert resumed.convergence == straight.convergence
+    assert resumed.best_individual == straight.best_individual
+
+
+def test_iterate_yields_snapshots_and_stops_on_break():
+    nodes, vrp, weights = _problem()
+    full = GeneticAlgorithm(nodes, nodes[0], _params(), vrp, weights).run([])
+    ga = GeneticAlgorithm(nodes, nodes[0], _params(), vrp, weights)
+    snapshots = list(ga.iterate([]))
+    assert [s.generation for s in snapshots] == list(range(1, 16))
+    assert [s.generation_best for s in snapshots] == full.convergence
+    assert snapshots[-1].best_fitness == full.best_fitness
+    assert snapshots[-1].stop_reason == "generations" and snapshots[0].stop_reason is None
+    assert all(s.mean_fitness >= s.generation_best for s in snapshots)
+
+    ga = GeneticAlgorithm(nodes, nodes[0], _params(), vrp, weights)
+    for snapshot in ga.iterate([]):
+        if snapshot.generation == 4:
+            break
+    partial = ga.result()
+    assert partial.stop_reason == "interrupted"
+    assert partial.convergence == full.convergence[:4]
+    assert partial.best_individual == snapshot.best_individual
+
+
+def test_snapshots_carry_generation_telemetry():
+    nodes, vrp, weights = _problem()
+    for backend in ("list", "array"):
+        ga = GeneticAlgorithm(nodes, nodes[0], _params(population_backend=backend), vrp, weights)
+        snapshots = list(ga.iterate([]))
+        first = snapshots[0].record()
+        assert first["evaluations"] + first["cache_hits"] == 30
+        assert sum(s.stats["evaluations"] for s in snapshots) == ga.cache_misses
+        assert all(first[f"time_{phase}"] >= 0 for phase in PHASES)
+        assert all(0 < s.stats["diversity"] <= 1 for s in snapshots)
+        assert all(s.stats["worst_fitness"] >= s.mean_fitness for s in snapshots)
+        assert "best_individual" not in first
+
+
+def test_sus_selection_runs_on_both_backends():
+    nodes, vrp, weights = _problem()
+    for backend in ("list", "array"):
+        result = GeneticAlgorithm(
+            nodes, nodes[0], _params(selection="sus", population_backend=backend), vrp, weights
+        ).run([])
+        fitness, _ = evaluate_individual(result.best_individual, nodes, nodes[0], vrp, weights)
+        assert abs(fitness - result.best_fitness) < 1e-9
+
+
+def test_deduplication_and_restart_keep_population_diverse():
+    nodes, vrp, weights = _problem()
+    for backend in ("list", "array"):
+        # Low mutation and high elitism pressure: the plain GA fills up with clones
+        base = dict(population_backend=backend, mutation_rate=0.02, crossover_rate=0.3, tournament_k=6)
+        plain = GeneticAlgorithm(nodes, nodes[0], _params(**base), vrp, weights)
+        plain_stats = [s.stats for s in plain.iterate([])]
+        assert min(s["diversity"] for s in plain_stats) < 0.9
+
+        ga = GeneticAlgorithm(nodes, nodes[0], _params(deduplicate=True, **base), vrp, weights)
+        stats = [s.stats for s in ga.iterate([])]
+        # Scored generations after the first hold no clones outside the elites
+        assert all(s["diversity"] >= 1 - 2 / 30 for s in stats[1:])
+        assert sum(s["duplicates"] for s in stats) > 0
+
+        params = _params(restart_diversity=0.99, restart_fraction=0.5, **base)
+        ga = GeneticAlgorithm(nodes, nodes[0], params, vrp, weights)
+        stats = [s.stats for s in ga.iterate([])]
+        assert all(0 < s["edge_diversity"] <= 1 for s in stats)
+        assert all(s["restarted"] == 14 for s in stats if s["edge_diversity"] < 0.99)
+        result = ga.result()
+        fitness, _ = evaluate_individual(result.best_individual, nodes, nodes[0], vrp, weights)
+        assert abs(fitness - result.best_fitness) < 1e-9
+
+
+def test_neighbor_mutation_and_spatial_candidates_on_both_backends():
+    nodes, vrp, weights = _problem()
+    for backend in ("list", "array"):
+        params = _params(
+            mutation="neighbor", mutation_neighbors=3, population_backend=backend,
+            local_search="offspring", local_search_neighbors=4,
+        )
+        ga = GeneticAlgorithm(nodes, nodes[0], params, vrp, weights)
+        result = ga.run([])
+        fitness, _ = evaluate_individual(result.best_individual, nodes, nodes[0], vrp, weights)
+        assert abs(fitness - result.best_fitness) < 1e-9
+        assert sorted(result.best_individual) == list(range(1, 11))
+        assert len(ga.spatial().candidate_lists(3)[1]) == 3
+
+
+def test_route_pool_recombination_on_both_backends():
+    nodes, _, weights = _problem()
+    vrp = VRPParams(6, 80, 10000, 60, 10, None, "optimal")
+    for backend in ("list", "array"):
+        params = _params(route_pool_every=3, population_backend=backend, generations=20)
+        ga = GeneticAlgorithm(nodes, nodes[0], params, vrp, weights)
+        stats = [s.stats for s in ga.iterate([])]
+        assert all(s["route_pool"] > 0 for s in stats)
+        assert stats[-1]["route_pool"] >= stats[0]["route_pool"]
+        assert sum(s["recombined"] for s in stats) > 0
+        result = ga.result()
+        fitness, _ = evaluate_individual(result.best_individual, nodes, nodes[0], vrp, weights)
+        assert abs(fitness - result.best_fitness) < 1e-9
+
+
+def test_resequencing_final_best_and_elites_on_both_backends():
+    nodes, vrp, weights = _problem()
+    for backend in ("list", "array"):
+        plain = GeneticAlgorithm(nodes, nodes[0], _params(population_backend=backend), vrp, weights).run([])
+        # Same trajectory, then the final best is re-ordered: never worse
+        final = GeneticAlgorithm(
+            nodes, nodes[0], _params(population_backend=backend, resequence_max_stops=8), vrp, weights
+        ).run([])
+        assert final.best_fitness <= plain.best_fitness
+        assert final.convergence == plain.convergence
+        params = _params(population_backend=backend, resequence_max_stops=8, resequence_elites=True)
+        ga = GeneticAlgorithm(nodes, nodes[0], params, vrp, weights)
+        for result in (final, ga.run([])):
+            fitness, _ = evaluate_individual(result.best_individual, nodes, nodes[0], vrp, weights)
+            assert abs(fitness - result.best_fitness) < 1e-9
+        assert ga.resequencer.misses > 0
@@ -0,0 +1,68 @@
+import random
+
+import numpy as np
+
+from src.core.distance import DistanceMatrix
+from src.core.heuristics import (
+    CONSTRUCTORS,
+    regret_insertion_order,
+    savings_order,
+    seed_orders,
+    sweep_order,
+)
+from src.core.instance import ProblemInstance
+from src.core.vrp import Node, VRPParams, WeightParams
+
+
+def _problem(n=40):
+    rng = random.Random(2)
+    nodes = {0: Node(0, "Depot", "", -23.5, -46.6, 0, 1)}
+    for i in range(1, n + 1):
+        nodes[i] = Node(
+            i, f"N{i}", "", -23.5 + rng.uniform(-1, 1), -46.6 + rng.uniform(-1, 1), rng.randint(5, 20), 1
+        )
+    vrp = VRPParams(6, 100, 10000, 60, 0, None)
+    return nodes, vrp
+
+
+def test_constructors_return_permutations_that_beat_random():
+    nodes, vrp = _problem()
+    customers = list(range(1, 41))
+    dm = DistanceMatrix.from_nodes(nodes)
+    instance = ProblemInstance(nodes, nodes[0], vrp, dm)
+    weights = WeightParams(1.0, 50.0, 50.0, 0.0, 0.0)
+    shuffled = customers[:]
+    random.Random(0).shuffle(shuffled)
+    random_fitness = instance.fitness(shuffled, weights)
+    orders = seed_orders({name: 1 for name in CONSTRUCTORS}, nodes, nodes[0], vrp, dm)
+    assert len(orders) == len(CONSTRUCTORS)
+    for order in orders:
+        assert sorted(order) == customers
+        assert instance.fitness(order, weights) < random_fitness / 2
+
+
+def test_constructed_routes_respect_capacity():
+    nodes, vrp = _problem()
+    customers = list(range(1, 41))
+    demand = {nid: nodes[nid].demand for nid in customers}
+    order = sweep_order(customers, nodes, nodes[0], vrp.vehicle_capacity)
+    assert sorted(order) == customers
+    # Regret insertion fills at most `vehicles` routes, so the greedy split serves every stop
+    order = regret_insertion_order(customers, nodes, nodes[0], vrp.vehicle_capacity, vrp.vehicles, k=3)
+    routes = ProblemInstance(nodes, nodes[0], vrp, DistanceMatrix.from_nodes(nodes)).split(order)
+    assert sum(len(r) for r in routes) == len(customers)
+    assert all(sum(demand[nid] for nid in r) <= vrp.vehicle_capacity for r in routes)
+
+
+def test_randomized_variants_differ_and_are_reproducible():
+    nodes, vrp = _problem()
+    mix = {"nearest_neighbor": 3, "savings": 3, "sweep": 3, "regret": 3}
+    first = seed_orders(mix, nodes, nodes[0], vrp, seed=5)
+    again = seed_orders(mix, nodes, nodes[0], vrp, seed=5)
+    assert first == again
+    # nearest_neighbor builds a single tour
+    assert len(first) == 1 + 3 * 3
+    assert len({tuple(order) for order in first}) >= 8
+    customers = list(range(1, 41))
+    noisy = savings_order(customers, nodes, nodes[0], vrp.vehicle_capacity, rng=np.random.default_rng(1), noise=0.3)
+    assert sorted(noisy) == customers
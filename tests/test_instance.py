@@ -0,0 +1,83 @@
+import random
+
+from src.core.fitness import evaluate_individual
+from src.core.instance import ProblemInstance
+from src.core.vrp import Node, VRPParams, WeightParams, compute_route_metrics, split_routes
+
+
+def _problem():
+    nodes = {
+        0: Node(0, "Depot", "", -23.5, -46.6, 0, 1),
+        1: Node(1, "A", "", -22.9, -43.2, 30, 1, "09:00", "10:00", 15),
+        2: Node(2, "B", "", -19.9, -43.9, 40, 2),
+        3: Node(3, "C", "", -25.4, -49.3, 50, 3, None, "08:30", 10),
+        4: Node(4, "D", "", -23.0, -46.0, 20, 1, "13:00", None, 5),
+    }
+    vrp = VRPParams(2, 80, 500, 60, 10, ["08:00", "12:00"])
+    return nodes, vrp
+
+
+def test_instance_parses_windows_to_minutes():
+    nodes, vrp = _problem()
+    instance = ProblemInstance(nodes, nodes[0], vrp)
+    assert instance.work_window == (480, 720)
+    assert instance.window_start[instance.index[1]] == 540
+    assert instance.window_end[instance.index[3]] == 510
+
+
+def test_instance_split_and_metrics_match_reference():
+    nodes, vrp = _problem()
+    instance = ProblemInstance(nodes, nodes[0], vrp)
+    weights = WeightParams(1, 10, 5, 2, 3)
+    perm = [3, 1, 4, 2]
+    routes = split_routes(perm, nodes, nodes[0], vrp)
+    assert instance.split(perm) == routes
+    for route in routes:
+        expected = compute_route_metrics(route, nodes, nodes[0], vrp, weights)
+        got = instance.route_metrics(route)
+        assert got.sequence == expected.sequence
+        assert abs(got.distance_km - expected.distance_km) < 1e-9
+        for key, value in expected.penalties.items():
+            assert abs(got.penalties[key] - value) < 1e-9
+    plain, _ = evaluate_individual(perm, nodes, nodes[0], vrp, weights)
+    fast, _ = evaluate_individual(perm, nodes, nodes[0], vrp, weights, instance=instance)
+    assert abs(plain - fast) < 1e-9
+
+
+def _brute_force_split(instance, perm, weights):
+    best = None
+    n, vehicles = len(perm), instance.vrp.vehicles
+    for mask in range(1 << (n - 1)):
+        cuts = [0] + [i + 1 for i in range(n - 1) if mask >> i & 1] + [n]
+        routes = [perm[a:b] for a, b in zip(cuts[:-1], cuts[1:])]
+        if len(routes) > vehicles:
+            continue
+        loads = [sum(instance.demand[instance.index[c]] for c in r) for r in routes]
+        if any(load > instance.vrp.vehicle_capacity for r, load in zip(routes, loads) if len(r) > 1):
+            continue
+        cost = sum(instance.route_cost(r, weights) for r in routes)
+        if best is None or cost < best:
+            best = cost
+    return best
+
+
+def test_optimal_split_matches_brute_force():
+    rng = random.Random(2)
+    nodes = {0: Node(0, "Depot", "", -23.5, -46.6, 0, 1)}
+    for i in range(1, 10):
+        nodes[i] = Node(
+            i, f"N{i}", "", -23.5 + rng.uniform(-1, 1), -46.6 + rng.uniform(-1, 1),
+            rng.randint(10, 40), rng.randint(1, 3),
+        )
+    vrp = VRPParams(4, 90, 10000, 60, 10, ["08:00", "17:00"], split="optimal")
+    weights = WeightParams(1.0, 50.0, 50.0, 5.0, 1.0)
+    instance = ProblemInstance(nodes, nodes[0], vrp)
+    for _ in range(20):
+        perm = rng.sample(range(1, 10), 9)
+        routes = instance.split(perm, weights)
+        assert len(routes) == 4
+        assert [c for r in routes for c in r] == perm
+        cost = sum(instance.route_cost(r, weights) for r in routes)
+        assert abs(cost - _brute_force_split(instance, perm, weights)) < 1e-9
+        fitness, _ = evaluate_individual(perm, nodes, nodes[0], vrp, weights)
+        assert abs(fitness - cost) < 1e-9
@@ -0,0 +1,64 @@
+import random
+from dataclasses import replace
+
+from src.core.fitness import evaluate_individual
+from src.core.ga import GeneticAlgorithm
+from src.core.islands import IslandModel
+from src.core.vrp import GAParams, IslandParams, Node, VRPParams, WeightParams
+
+
+def _problem():
+    rng = random.Random(5)
+    nodes = {0: Node(0, "Depot", "", -23.5, -46.6, 0, 1)}
+    for i in range(1, 13):
+        nodes[i] = Node(
+            i, f"N{i}", "", -23.5 + rng.uniform(-1, 1), -46.6 + rng.uniform(-1, 1),
+            rng.randint(5, 30), rng.randint(1, 3),
+        )
+    vrp = VRPParams(3, 80, 400, 60, 10, ["08:00", "17:00"])
+    weights = WeightParams(1.0, 50.0, 50.0, 5.0, 1.0)
+    ga = GAParams(
+        population_size=20, generations=12, selection="tournament", tournament_k=3,
+        crossover="PMX", crossover_rate=0.7, mutation="swap", mutation_rate=0.2,
+        elitism=2, stagnation_patience=100, seed=11,
+    )
+    return nodes, vrp, weights, ga
+
+
+def test_single_island_matches_plain_ga():
+    nodes, vrp, weights, ga = _problem()
+    plain = GeneticAlgorithm(nodes, nodes[0], ga, vrp, weights).run([])
+    islands = IslandParams(count=1, migration_interval=5, processes=False)
+    model = IslandModel(nodes, nodes[0], ga, vrp, weights, islands).run([])
+    assert model.best_individual == plain.best_individual
+    assert model.convergence == plain.convergence
+
+
+def test_islands_in_processes_match_in_process_run():
+    nodes, vrp, weights, ga = _problem()
+    overrides = [{}, {"crossover": "OX"}, {"mutation": "inversion", "selection": "roulette"}]
+    results = []
+    for processes in (False, True):
+        islands = IslandParams(
+            count=3, migration_interval=4, migrants=2, topology="random",
+            processes=processes, overrides=overrides,
+        )
+        results.append(IslandModel(nodes, nodes[0], ga, vrp, weights, islands).run([]))
+    serial, parallel = results
+    assert serial.best_individual == parallel.best_individual
+    assert serial.convergence == parallel.convergence
+    assert len(serial.convergence) == ga.generations
+    fitness, _ = evaluate_individual(serial.best_individual, nodes, nodes[0], vrp, weights)
+    assert abs(fitness - serial.best_fitness) < 1e-9
+    assert serial.best_fitness == min(serial.convergence)
+    assert len(serial.best_routes) == vrp.vehicles
+
+
+def test_island_model_stops_on_limits():
+    nodes, vrp, weights, ga = _problem()
+    islands = IslandParams(count=2, migration_interval=3, processes=False)
+    timed = IslandModel(nodes, nodes[0], replace(ga, time_limit_s=1e-9), vrp, weights, islands).run([])
+    assert timed.stop_reason == "time_limit" and len(timed.convergence) == 1
+    budget = IslandModel(nodes, nodes[0], replace(ga, max_evaluations=50), vrp, weights, islands).run([])
+    assert budget.stop_reason == "max_evaluations" and len(budget.convergence) < ga.generations
+    assert budget.best_fitness == min(budget.convergence)
@@ -0,0 +1,48 @@
+import random
+
+from src.core.instance import ProblemInstance
+from src.core.local_search import LocalSearch
+from src.core.vrp import Node, VRPParams, WeightParams
+
+
+def _instance(split="greedy", seed=1, n=30):
+    rng = random.Random(seed)
+    nodes = {0: Node(0, "Depot", "", -23.5, -46.6, 0, 1)}
+    for i in range(1, n + 1):
+        nodes[i] = Node(
+            i, f"N{i}", "", -23.5 + rng.uniform(-1, 1), -46.6 + rng.uniform(-1, 1),
+            rng.randint(5, 30), rng.randint(1, 3), None, rng.choice([None, "11:00"]), 10,
+        )
+    vrp = VRPParams(4, 150, 600, 60, 10, ["08:00", "17:00"], split=split)
+    return ProblemInstance(nodes, nodes[0], vrp)
+
+
+def test_local_search_improves_and_never_worsens():
+    weights = WeightParams(1.0, 50.0, 50.0, 5.0, 1.0)
+    rng = random.Random(0)
+    for split in ("greedy", "optimal"):
+        instance = _instance(split)
+        search = LocalSearch(instance, weights, neighbors=8)
+        gains = 0
+        for _ in range(5):
+            perm = list(instance.customer_ids)
+            rng.shuffle(perm)
+            before = instance.fitness(perm, weights)
+            improved, fitness = search.improve(perm)
+            assert sorted(improved) == sorted(perm)
+            assert abs(instance.fitness(improved, weights) - fitness) < 1e-9
+            assert fitness <= before
+            gains += fitness < before
+        assert gains == 5
+
+
+def test_greedy_moves_keep_route_boundaries():
+    instance = _instance("greedy", seed=4)
+    search = LocalSearch(instance, WeightParams(1.0, 50.0, 50.0, 0.0, 0.0), neighbors=6)
+    perm = list(instance.customer_ids)
+    random.Random(2).shuffle(perm)
+    routes = [[instance.index[nid] for nid in route] for route in instance.split(perm)]
+    assert search._search(routes, None)
+    encoded = [instance.node_ids[i] for route in routes for i in route]
+    decoded = [[instance.index[nid] for nid in route] for route in instance.split(encoded)]
+    assert [r for r in decoded if r] == [r for r in routes if r]
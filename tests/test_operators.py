@@ -1,7 +1,17 @@
 import random
 
-from src.core.crossover import ox, pmx
-from src.core.mutation import inversion_mutation, swap_mutation
+import numpy as np
+
+from src.core.crossover import ox, ox_batch, ox_with_cuts, pmx, pmx_batch, pmx_with_cuts
+from src.core.diversity import duplicate_positions, edge_diversity
+from src.core.mutation import (
+    inversion_mutation,
+    inversion_rows,
+    mutate_rows,
+    mutate_with_span,
+    swap_mutation,
+    swap_rows,
+)
 
 
 def test_pmx_preserves_genes():
@@ -34,3 +44,83 @@ def test_inversion_mutation_reverses_segment():
     mutated = inversion_mutation(ind)
     assert sorted(mutated) == sorted(ind)
     assert mutated != ind
+
+
+def test_row_mutations_match_list_semantics():
+    population = np.tile(np.arange(8, dtype=np.int32), (3, 1))
+    rows, i, j = np.array([0, 2]), np.array([1, 0]), np.array([5, 7])
+    swapped = population.copy()
+    swap_rows(swapped, rows, i, j)
+    assert swapped[0].tolist() == [0, 5, 2, 3, 4, 1, 6, 7]
+    assert swapped[1].tolist() == list(range(8))
+    assert swapped[2].tolist() == [7, 1, 2, 3, 4, 5, 6, 0]
+    inverted = population.copy()
+    inversion_rows(inverted, rows, i, j)
+    assert inverted[0].tolist() == [0, 4, 3, 2, 1, 5, 6, 7]
+    assert inverted[2].tolist() == [6, 5, 4, 3, 2, 1, 0, 7]
+
+
+def test_mutate_rows_keeps_permutations():
+    rng = np.random.default_rng(0)
+    population = np.array([rng.permutation(20) for _ in range(50)], dtype=np.int32)
+    original = population.copy()
+    rows = np.arange(0, 50, 2)
+    for method in ("swap", "inversion"):
+        mutate_rows(population, rows, method, rng)
+        assert (np.sort(population, axis=1) == np.arange(20)).all()
+        assert (population[1::2] == original[1::2]).all()
+
+
+def test_neighbor_mutation_makes_candidates_adjacent():
+    random.seed(4)
+    candidates = {g: [(g + 5) % 12] for g in range(12)}
+    for _ in range(50):
+        perm = random.sample(range(12), 12)
+        state = random.getstate()
+        u = perm[random.randrange(12)]
+        random.setstate(state)
+        child, (i, j) = mutate_with_span(perm, "neighbor", candidates)
+        assert sorted(child) == list(range(12))
+        assert child[:i] == perm[:i] and child[j + 1 :] == perm[j + 1 :]
+        assert abs(child.index(u) - child.index((u + 5) % 12)) == 1
+
+    rng = np.random.default_rng(1)
+    population = np.array([rng.permutation(12) for _ in range(20)], dtype=np.int32)
+    table = np.array([[(g + 5) % 12] for g in range(12)])
+    rows = np.arange(0, 20, 2)
+    u = population[rows, np.random.default_rng(2).integers(0, 12, size=len(rows))]
+    mutate_rows(population, rows, "neighbor", np.random.default_rng(2), table)
+    assert (np.sort(population, axis=1) == np.arange(12)).all()
+    for row, stop in zip(rows, u):
+        where = population[row].tolist()
+        assert abs(where.index(stop) - where.index((stop + 5) % 12)) == 1
+
+
+def test_crossover_with_cuts_known_offspring():
+    p1 = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+    p2 = [9, 3, 7, 8, 2, 6, 5, 1, 4]
+    assert pmx_with_cuts(p1, p2, 3, 7) == ([9, 3, 2, 4, 5, 6, 7, 1, 8], [1, 7, 3, 8, 2, 6, 5, 4, 9])
+    assert ox_with_cuts(p1, p2, 3, 7) == ([3, 8, 2, 4, 5, 6, 7, 1, 9], [3, 4, 7, 8, 2, 6, 5, 9, 1])
+
+
+def test_batched_crossover_matches_pairwise():
+    rng = np.random.default_rng(4)
+    genes = rng.choice(1000, size=25, replace=False)
+    parents1 = np.array([rng.permutation(genes) for _ in range(40)])
+    parents2 = np.array([rng.permutation(genes) for _ in range(40)])
+    lo = rng.integers(0, 24, size=40)
+    hi = lo + 1 + rng.integers(0, 24 - lo)
+    for batch, pairwise in ((pmx_batch, pmx_with_cuts), (ox_batch, ox_with_cuts)):
+        children1, children2 = batch(parents1, parents2, lo, hi)
+        for k in range(40):
+            expected = pairwise(parents1[k].tolist(), parents2[k].tolist(), int(lo[k]), int(hi[k]))
+            assert (children1[k].tolist(), children2[k].tolist()) == expected
+
+
+def test_edge_diversity_and_duplicate_positions():
+    clones = np.tile(np.arange(1, 6), (4, 1))
+    assert edge_diversity(clones) == 4 / 10
+    assert edge_diversity([[1, 2, 3], [3, 2, 1]]) == 2 / 3
+    assert edge_diversity([[1, 2, 3], [2, 3, 1]]) == 1.0
+    assert duplicate_positions([7, 8, 7, 7, 9, 8]) == [2, 3, 5]
+    assert duplicate_positions([7, 7, 8, 7], skip=2) == [3]
@@ -0,0 +1,78 @@
+import itertools
+import random
+
+import numpy as np
+
+from src.core.instance import ProblemInstance
+from src.core.resequence import RouteResequencer, held_karp
+from src.core.vrp import Node, VRPParams, WeightParams
+
+
+def test_held_karp_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for n in range(1, 8):
+        km = rng.uniform(1, 100, (n + 1, n + 1))
+        coef = rng.choice([1.0, 0.25, 0.1], n + 1)
+        stops = list(range(1, n + 1))
+
+        def value(order):
+            legs = km[0, order[0]] + sum(km[a, b] for a, b in zip(order, order[1:])) + km[order[-1], 0]
+            return 1.5 * legs + 3.0 * sum(coef[i] * pos for pos, i in enumerate(order))
+
+        order, total = held_karp(km, 0, stops, coef[stops], 1.5, 3.0)
+        assert sorted(order) == stops
+        assert abs(total - value(order)) < 1e-9
+        assert abs(total - min(value(p) for p in itertools.permutations(stops))) < 1e-9
+
+
+def _instance(n=30):
+    rng = random.Random(5)
+    nodes = {0: Node(0, "Depot", "", -23.5, -46.6, 0, 1)}
+    for i in range(1, n + 1):
+        nodes[i] = Node(
+            i, f"N{i}", "", -23.5 + rng.uniform(-1, 1), -46.6 + rng.uniform(-1, 1),
+            rng.randint(5, 25), rng.randint(1, 3),
+        )
+    vrp = VRPParams(8, 100, 10000, 60, 0, None)
+    return ProblemInstance(nodes, nodes[0], vrp), WeightParams(1.0, 50.0, 50.0, 5.0, 1.0)
+
+
+def test_routes_are_memoized_by_stop_set_and_never_worse():
+    instance, weights = _instance()
+    resequencer = RouteResequencer(instance, weights, max_stops=8)
+    route = [7, 3, 12, 1, 25, 9]
+    best = resequencer.route(route)
+    assert sorted(best) == sorted(route)
+    assert instance.route_cost(best, weights) <= instance.route_cost(route, weights)
+    assert resequencer.route(list(reversed(route))) == best
+    assert (resequencer.hits, resequencer.misses) == (1, 1)
+    long_route = list(range(1, 10))
+    assert resequencer.route(long_route) == long_route
+
+
+def test_memo_hit_is_compared_against_the_incoming_route():
+    instance, weights = _instance()
+    resequencer = RouteResequencer(instance, weights, max_stops=8)
+    good = resequencer.route([7, 3, 12, 1, 25, 9])
+    orders = sorted(itertools.permutations(good), key=lambda r: instance.route_cost(list(r), weights))
+    middle, worst = list(orders[len(orders) // 2]), list(orders[-1])
+    # The memoized order is only a candidate: each caller keeps its route unless it is cheaper
+    resequencer.memo[frozenset(good)] = middle
+    assert resequencer.route(good) == good
+    assert resequencer.route(worst) == middle
+
+
+def test_improve_keeps_a_permutation_and_never_scores_worse():
+    instance, weights = _instance()
+    resequencer = RouteResequencer(instance, weights, max_stops=10)
+    rng = random.Random(2)
+    improved_any = False
+    for _ in range(10):
+        perm = list(range(1, 31))
+        rng.shuffle(perm)
+        improved, fitness = resequencer.improve(perm)
+        assert sorted(improved) == list(range(1, 31))
+        assert abs(fitness - instance.fitness(improved, weights)) < 1e-9
+        assert fitness <= instance.fitness(perm, weights)
+        improved_any |= improved != perm
+    assert improved_any
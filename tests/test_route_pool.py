@@ -0,0 +1,99 @@
+import itertools
+import random
+
+from src.core.instance import ProblemInstance
+from src.core.route_pool import RoutePool, set_partition
+from src.core.vrp import Node, VRPParams, WeightParams
+
+
+def _brute_force(masks, costs, universe, max_columns):
+    best = float("inf")
+    for r in range(1, max_columns + 1):
+        for combo in itertools.combinations(range(len(masks)), r):
+            union = 0
+            ok = True
+            for c in combo:
+                if union & masks[c]:
+                    ok = False
+                    break
+                union |= masks[c]
+            if ok and union == universe:
+                best = min(best, sum(costs[c] for c in combo))
+    return best
+
+
+def test_set_partition_is_exact_on_small_instances():
+    rng = random.Random(1)
+    for _ in range(30):
+        masks = [rng.randrange(1, 1 << 8) for _ in range(14)] + [1 << b for b in range(8)]
+        costs = [rng.uniform(1, 10) * bin(m).count("1") ** 0.5 for m in masks]
+        for max_columns in (3, 8):
+            chosen, total = set_partition(masks, costs, (1 << 8) - 1, max_columns)
+            expected = _brute_force(masks, costs, (1 << 8) - 1, max_columns)
+            if chosen is None:
+                assert expected == float("inf")
+                continue
+            assert abs(total - expected) < 1e-9
+            assert len(chosen) <= max_columns
+            assert sum(masks[c] for c in chosen) == (1 << 8) - 1
+
+
+def test_set_partition_respects_upper_bound_and_missing_bits():
+    masks, costs = [0b011, 0b100, 0b001, 0b010], [3.0, 1.0, 1.0, 1.0]
+    assert set_partition(masks, costs, 0b111, 3)[0] is not None
+    assert set_partition(masks, costs, 0b111, 3, upper=3.0) == (None, 3.0)
+    assert set_partition(masks, costs, 0b1111, 4)[0] is None
+
+
+def _instance():
+    nodes = {0: Node(0, "Depot", "", -23.5, -46.6, 0, 1)}
+    rng = random.Random(4)
+    for i in range(1, 9):
+        nodes[i] = Node(i, f"N{i}", "", -23.5 + rng.uniform(-0.5, 0.5), -46.6 + rng.uniform(-0.5, 0.5), 10, 1)
+    vrp = VRPParams(4, 30, 10000, 60, 0, None)
+    weights = WeightParams(1.0, 50.0, 50.0, 1.0, 1.0)
+    return ProblemInstance(nodes, nodes[0], vrp), weights
+
+
+def test_pool_keeps_cheapest_feasible_order_per_stop_set():
+    instance, weights = _instance()
+    pool = RoutePool(instance, weights, size=3)
+    assert not pool.add([1, 2, 3, 4])  # over capacity
+    forward, backward = [1, 2, 3], [3, 2, 1]
+    pool.add(forward)
+    pool.add(backward)
+    assert len(pool) == 1
+    kept = pool.routes[frozenset(forward)]
+    assert kept[0] == min(pool.cost(forward)[0], pool.cost(backward)[0])
+    for route in ([4], [5, 6], [7, 8], [4, 5]):
+        pool.add(route)
+    assert len(pool) == 3
+
+
+def test_recombine_finds_the_best_partition_of_pooled_routes():
+    instance, weights = _instance()
+    pool = RoutePool(instance, weights)
+    rng = random.Random(6)
+    partitions = []
+    for _ in range(6):
+        stops = list(range(1, 9))
+        rng.shuffle(stops)
+        partitions.append([stops[0:3], stops[3:6], stops[6:8]])
+    for routes in partitions:
+        for route in routes:
+            pool.add(route)
+
+    def cost(routes):
+        return sum(pool.cost(r)[0] for r in routes)
+
+    incumbent = max(partitions, key=cost)
+    entries = list(pool.routes.values())
+    masks = [sum(1 << pool.bits[n] for n in route) for _, route in entries]
+    expected = _brute_force(masks, [c for c, _ in entries], (1 << 8) - 1, 4)
+    assert expected < cost(incumbent)
+    routes, total = pool.recombine(incumbent, vehicles=4)
+    assert sorted(n for r in routes for n in r) == list(range(1, 9))
+    assert abs(total - expected) < 1e-9 and abs(total - cost(routes)) < 1e-9
+    # Nothing beats the best partition itself, and one vehicle cannot serve everyone
+    assert pool.recombine(routes, vehicles=4) is None
+    assert pool.recombine(incumbent, vehicles=1) is None
@@ -1,6 +1,17 @@
 import random
 
-from src.core.selection import roulette_selection, tournament_selection
+import numpy as np
+
+from src.core.selection import (
+    ParentSampler,
+    elite_indices,
+    elite_positions,
+    roulette_indices,
+    roulette_selection,
+    sus_indices,
+    tournament_indices,
+    tournament_selection,
+)
 
 
 def test_tournament_best_selected():
@@ -17,3 +28,58 @@ def test_roulette_returns_individual():
     random.seed(1)
     selected = roulette_selection(pop, fitness)
     assert selected in pop
+
+
+def test_vectorized_selection_indices():
+    rng = np.random.default_rng(3)
+    fitness = np.array([5.0, 1.0, 3.0, 4.0])
+    # A tournament over the whole population always picks the best
+    assert (tournament_indices(fitness, 4, 10, rng) == 1).all()
+    picks = roulette_indices(fitness, 1000, rng)
+    assert picks.min() >= 0 and picks.max() < len(fitness)
+    counts = np.bincount(picks, minlength=4)
+    assert counts[1] > counts[2] > counts[3] > counts[0]
+
+
+def test_parent_sampler_matches_roulette_selection():
+    fitness = [5.0, 1.0, 3.0, 4.0, 1.0]
+    pop = [[i] for i in range(len(fitness))]
+    random.seed(4)
+    expected = [roulette_selection(pop, fitness)[0] for _ in range(50)]
+    random.seed(4)
+    sampler = ParentSampler(fitness, "roulette")
+    assert [sampler.pick() for _ in range(50)] == expected
+
+
+def test_sus_spreads_picks_by_weight():
+    fitness = np.array([5.0, 1.0, 3.0, 4.0])
+    weights = fitness.max() - fitness + 1e-6
+    expected = weights / weights.sum() * 100
+    # SUS keeps every count within one of its expectation
+    counts = np.bincount(sus_indices(fitness, 100, np.random.default_rng(0)), minlength=4)
+    assert (np.abs(counts - expected) < 1).all()
+    random.seed(2)
+    sampler = ParentSampler(fitness.tolist(), "sus", count=100)
+    counts = np.bincount([sampler.pick() for _ in range(100)], minlength=4)
+    assert (np.abs(counts - expected) < 1).all()
+
+
+def test_elite_indices_match_stable_sort():
+    rng = np.random.default_rng(1)
+    fitness = rng.integers(0, 5, 40).astype(float)
+    for count in (0, 1, 3, 7, 40):
+        assert elite_indices(fitness, count).tolist() == np.argsort(fitness, kind="stable")[:count].tolist()
+        assert elite_positions(fitness.tolist(), count) == np.argsort(fitness, kind="stable")[:count].tolist()
+
+
+def test_vectorized_tournament_uses_distinct_contenders():
+    rng = np.random.default_rng(5)
+    fitness = np.arange(6, dtype=float)
+    # With k = n every tournament holds the whole population, so the best always wins
+    assert (tournament_indices(fitness, 6, 500, rng) == 0).all()
+    # With k = n - 1 the worst can never win
+    assert tournament_indices(fitness, 5, 500, rng).max() < 5
+    # Large k on a large population draws distinct contenders directly instead of redrawing
+    fitness = rng.permutation(300).astype(float)
+    assert (tournament_indices(fitness, 300, 50, rng) == fitness.argmin()).all()
+    assert (tournament_indices(fitness, 299, 200, rng) != fitness.argmax()).all()
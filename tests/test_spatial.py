@@ -0,0 +1,64 @@
+import random
+
+import numpy as np
+
+from src.core.distance import DistanceMatrix, haversine
+from src.core.heuristics import nearest_neighbor_order
+from src.core.spatial import KDTree, SpatialIndex, unit_vectors
+from src.core.vrp import Node
+
+
+def _nodes(n=300, seed=5):
+    rng = random.Random(seed)
+    nodes = {0: Node(0, "Depot", "", -15.8, -47.9, 0, 1)}
+    for i in range(1, n + 1):
+        nodes[i] = Node(i, f"N{i}", "", rng.uniform(-30, 0), rng.uniform(-60, -35), 10, 1)
+    return nodes
+
+
+def test_knn_matches_brute_force_great_circle():
+    nodes = _nodes()
+    ids = list(range(1, 301))
+    index = SpatialIndex.from_nodes(nodes, ids)
+    near = index.neighbors(8)
+    km = index.neighbor_km(8)
+    for row in range(0, 300, 17):
+        a = nodes[ids[row]]
+        brute = sorted(
+            (haversine((a.lat, a.lon), (nodes[nid].lat, nodes[nid].lon)), pos)
+            for pos, nid in enumerate(ids)
+            if pos != row
+        )[:8]
+        assert near[row].tolist() == [pos for _, pos in brute]
+        assert np.allclose(km[row], [d for d, _ in brute])
+
+
+def test_tree_handles_tiny_inputs():
+    points = unit_vectors([0.0, 1.0], [0.0, 1.0])
+    dist, idx = KDTree(points).knn(5)
+    assert idx.tolist() == [[1], [0]]
+    assert dist.shape == (2, 1)
+    dist, idx = KDTree(points[:1]).knn(3)
+    assert idx.shape == (1, 0)
+
+
+def test_candidate_lists_and_table_use_node_ids():
+    nodes = _nodes(60)
+    ids = list(range(1, 61))
+    index = SpatialIndex.from_nodes(nodes, ids)
+    lists = index.candidate_lists(5)
+    table = index.candidate_table(5)
+    assert set(lists) == set(ids)
+    for nid, near in lists.items():
+        assert len(near) == 5 and nid not in near
+        assert table[nid].tolist() == near
+    assert index.node_ids[index.nearest_to(nodes[7].lat, nodes[7].lon)] == 7
+
+
+def test_spatial_nearest_neighbor_matches_matrix():
+    nodes = _nodes(120)
+    ids = list(range(1, 121))
+    matrix = DistanceMatrix.from_nodes(nodes)
+    assert nearest_neighbor_order(ids, nodes, nodes[0]) == nearest_neighbor_order(
+        ids, nodes, nodes[0], matrix
+    )